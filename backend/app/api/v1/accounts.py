@@ -6,9 +6,9 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import Optional, List
 
-from app.core.database import get_db
-from app.core.response import success_response, error_response
-from app.services.account_service import account_service
+from app.core.database import get_db_ro, get_db_rw
+from app.core.response import success_response, error_response, typed_response
+from app.services.account_service import account_service, MAX_LIMIT
 
 router = APIRouter(prefix="/accounts", tags=["账户管理"])
 
@@ -52,9 +52,10 @@ class AccountResponse(BaseModel):
 @router.get("", response_model=List[AccountResponse])
 async def list_accounts(
     is_enabled: Optional[bool] = Query(None, description="过滤启用状态"),
-    limit: int = Query(100, ge=1, le=1000, description="返回数量限制"),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = Query(None, ge=0, description="上一页最后一条记录的 ID（游标分页）"),
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取账户列表
@@ -62,12 +63,15 @@ async def list_accounts(
     - **is_enabled**: 过滤启用状态（可选）
     - **limit**: 返回数量限制
     - **offset**: 偏移量
+    - **after_id**: 上一页最后一条记录的 ID，指定后忽略 offset
     """
     accounts = account_service.list_accounts(
         db=db,
         is_enabled=is_enabled,
         limit=limit,
-        offset=offset
+        offset=offset,
+        after_id=after_id,
+        summary=True
     )
     
     # 转换时间为字符串
@@ -84,17 +88,17 @@ async def list_accounts(
             "updated_at": account.updated_at.isoformat() if account.updated_at else None
         })
     
-    return result
+    return typed_response(List[AccountResponse], result)
 
 
 @router.get("/{account_id}", response_model=AccountResponse)
-async def get_account(account_id: int, db: Session = Depends(get_db)):
+async def get_account(account_id: int, db: Session = Depends(get_db_ro)):
     """
     获取账户详情
     
     - **account_id**: 账户 ID
     """
-    account = account_service.get_account(db=db, account_id=account_id)
+    account = account_service.get_account(db=db, account_id=account_id, full=True)
     
     if not account:
         raise HTTPException(status_code=404, detail="账户不存在")
@@ -112,7 +116,7 @@ async def get_account(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("", response_model=AccountResponse, status_code=201)
-async def create_account(request: AccountCreate, db: Session = Depends(get_db)):
+async def create_account(request: AccountCreate, db: Session = Depends(get_db_rw)):
     """
     创建账户
     
@@ -153,7 +157,7 @@ async def create_account(request: AccountCreate, db: Session = Depends(get_db)):
 async def update_account(
     account_id: int,
     request: AccountUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """
     更新账户
@@ -193,7 +197,7 @@ async def update_account(
 
 
 @router.delete("/{account_id}", status_code=204)
-async def delete_account(account_id: int, db: Session = Depends(get_db)):
+async def delete_account(account_id: int, db: Session = Depends(get_db_rw)):
     """
     删除账户
     
@@ -208,7 +212,7 @@ async def delete_account(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{account_id}/enable", response_model=AccountResponse)
-async def enable_account(account_id: int, db: Session = Depends(get_db)):
+async def enable_account(account_id: int, db: Session = Depends(get_db_rw)):
     """
     启用账户
     
@@ -232,7 +236,7 @@ async def enable_account(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{account_id}/disable", response_model=AccountResponse)
-async def disable_account(account_id: int, db: Session = Depends(get_db)):
+async def disable_account(account_id: int, db: Session = Depends(get_db_rw)):
     """
     禁用账户
     
@@ -255,8 +259,34 @@ async def disable_account(account_id: int, db: Session = Depends(get_db)):
     }
 
 
+@router.post("/verify")
+async def verify_accounts(
+    account_ids: Optional[List[int]] = Query(None, description="要验证的账户 ID，不指定则验证所有启用的账户"),
+    db: Session = Depends(get_db_ro)
+):
+    """
+    批量验证账户
+    
+    并发测试多个账户的 AK/SK 是否有效
+    
+    - **account_ids**: 账户 ID 列表（可选）
+    """
+    if not account_ids:
+        account_ids = [account.id for account in account_service.iter_accounts(db=db, is_enabled=True)]
+    
+    results = await account_service.verify_accounts_bulk(db=db, account_ids=account_ids)
+    
+    return success_response(
+        data=[
+            {"account_id": account_id, "is_valid": is_valid, "message": message}
+            for account_id, (is_valid, message) in results.items()
+        ],
+        message="验证完成"
+    )
+
+
 @router.post("/{account_id}/verify")
-async def verify_account(account_id: int, db: Session = Depends(get_db)):
+async def verify_account(account_id: int, db: Session = Depends(get_db_ro)):
     """
     验证账户
     
@@ -264,7 +294,7 @@ async def verify_account(account_id: int, db: Session = Depends(get_db)):
     
     - **account_id**: 账户 ID
     """
-    is_valid, message = account_service.verify_account(db=db, account_id=account_id)
+    is_valid, message = await account_service.verify_account(db=db, account_id=account_id)
     
     return {
         "is_valid": is_valid,
@@ -273,7 +303,7 @@ async def verify_account(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{account_id}/test")
-async def test_account_connection(account_id: int, db: Session = Depends(get_db)):
+async def test_account_connection(account_id: int, db: Session = Depends(get_db_rw)):
     """
     测试账户连接
     
@@ -299,7 +329,7 @@ async def test_account_connection(account_id: int, db: Session = Depends(get_db)
         
         # 使用 client_manager 获取客户端（会自动解密）
         try:
-            from app.services.huawei_cloud.client_manager import client_manager
+            from app.services.huawei_cloud import client_manager
             client = client_manager.get_client(
                 account_id=account.id,
                 encrypted_ak=account.ak,
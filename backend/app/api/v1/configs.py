@@ -6,9 +6,9 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import Optional, List
 
-from app.core.database import get_db
-from app.core.response import success_response, error_response
-from app.services.config_service import config_service
+from app.core.database import get_db_ro, get_db_rw
+from app.core.response import success_response, error_response, typed_response
+from app.services.config_service import config_service, MAX_LIMIT
 
 router = APIRouter(prefix="/configs", tags=["配置管理"])
 
@@ -57,9 +57,10 @@ class ConfigResponse(BaseModel):
 @router.get("", response_model=List[ConfigResponse])
 async def list_configs(
     account_id: Optional[int] = Query(None, description="过滤账户 ID"),
-    limit: int = Query(100, ge=1, le=1000, description="返回数量限制"),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = Query(None, ge=0, description="上一页最后一条记录的 ID（游标分页）"),
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取配置列表
@@ -67,12 +68,14 @@ async def list_configs(
     - **account_id**: 过滤账户 ID（可选）
     - **limit**: 返回数量限制
     - **offset**: 偏移量
+    - **after_id**: 上一页最后一条记录的 ID，指定后忽略 offset
     """
     configs = config_service.list_configs(
         db=db,
         account_id=account_id,
         limit=limit,
-        offset=offset
+        offset=offset,
+        after_id=after_id
     )
     
     # 转换时间为字符串
@@ -91,11 +94,11 @@ async def list_configs(
             "updated_at": config.updated_at.isoformat() if config.updated_at else None
         })
     
-    return result
+    return typed_response(List[ConfigResponse], result)
 
 
 @router.get("/global", response_model=ConfigResponse)
-async def get_global_config(db: Session = Depends(get_db)):
+async def get_global_config(db: Session = Depends(get_db_ro)):
     """
     获取全局配置
     
@@ -123,7 +126,7 @@ async def get_global_config(db: Session = Depends(get_db)):
 @router.get("/effective", response_model=ConfigResponse)
 async def get_effective_config(
     account_id: Optional[int] = Query(None, description="账户 ID"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取有效配置
@@ -152,7 +155,7 @@ async def get_effective_config(
 
 
 @router.get("/{config_id}", response_model=ConfigResponse)
-async def get_config(config_id: int, db: Session = Depends(get_db)):
+async def get_config(config_id: int, db: Session = Depends(get_db_ro)):
     """
     获取配置详情
     
@@ -178,7 +181,7 @@ async def get_config(config_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("", response_model=ConfigResponse, status_code=201)
-async def create_config(request: ConfigCreate, db: Session = Depends(get_db)):
+async def create_config(request: ConfigCreate, db: Session = Depends(get_db_rw)):
     """
     创建配置
     
@@ -227,7 +230,7 @@ async def create_config(request: ConfigCreate, db: Session = Depends(get_db)):
 async def update_config(
     config_id: int,
     request: ConfigUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """
     更新配置
@@ -271,7 +274,7 @@ async def update_config(
 
 
 @router.delete("/{config_id}", status_code=204)
-async def delete_config(config_id: int, db: Session = Depends(get_db)):
+async def delete_config(config_id: int, db: Session = Depends(get_db_rw)):
     """
     删除配置
 
@@ -286,7 +289,7 @@ async def delete_config(config_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/reschedule/{config_id}", status_code=200)
-async def reschedule_monitor_jobs(config_id: int, db: Session = Depends(get_db)):
+async def reschedule_monitor_jobs(config_id: int, db: Session = Depends(get_db_rw)):
     """
     重新调度监控任务
 
@@ -303,7 +306,7 @@ async def reschedule_monitor_jobs(config_id: int, db: Session = Depends(get_db))
 
 
 @router.post("/reschedule-all", status_code=200)
-async def reschedule_all_monitor_jobs(db: Session = Depends(get_db)):
+async def reschedule_all_monitor_jobs(db: Session = Depends(get_db_rw)):
     """
     重新调度所有监控任务
 
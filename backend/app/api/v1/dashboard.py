@@ -8,12 +8,14 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from loguru import logger
 
-from app.core.database import get_db
+from app.core.database import get_db_ro
 from app.core.response import success_response
 from app.models.account import Account
 from app.models.config import Config
-from app.services.huawei_cloud.flexusl_service import FlexusLService
-from app.utils.encryption import get_encryption_service
+from app.services.huawei_cloud.flexusl_service import (
+    FlexusLService,
+    get_traffic_summaries_concurrently
+)
 import os
 from app.services.scheduler import monitor_scheduler
 from app.models.monitor_log import MonitorLog
@@ -22,7 +24,7 @@ router = APIRouter(prefix="/dashboard", tags=["仪表板"])
 
 
 @router.get("/stats")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: Session = Depends(get_db_ro)):
     """
     获取仪表板统计数据
     
@@ -48,30 +50,28 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
     alerts_count = 0
     
     accounts = db.query(Account).filter(Account.is_enabled == True).all()
-    encryption_service = get_encryption_service()
     
+    services = []
+    queried_accounts = []
     for account in accounts:
         try:
-            ak = encryption_service.decrypt(account.ak)
-            sk = encryption_service.decrypt(account.sk)
-            is_intl = getattr(account, 'is_international', True)
-            
-            service = FlexusLService(
-                ak=ak,
-                sk=sk,
-                region=account.region,
-                is_international=is_intl
-            )
-            
-            summary = service.get_all_traffic_summary()
-            servers_count += summary['instance_count']
-            total_traffic += summary['total_amount']
-            used_traffic += summary['used_amount']
-            remaining_traffic += summary['remaining_amount']
-            
+            services.append(FlexusLService.from_account(account))
+            queried_accounts.append(account)
         except Exception as e:
             logger.warning(f"账户 {account.name} 查询失败: {e}")
+    
+    # 各账户并发查询（受 HUAWEI_MAX_CONCURRENCY 限制），不阻塞事件循环
+    summaries = await get_traffic_summaries_concurrently(services)
+    
+    for account, summary in zip(queried_accounts, summaries):
+        if isinstance(summary, BaseException):
+            logger.warning(f"账户 {account.name} 查询失败: {summary}")
             continue
+        
+        servers_count += summary['instance_count']
+        total_traffic += summary['total_amount']
+        used_traffic += summary['used_amount']
+        remaining_traffic += summary['remaining_amount']
     
     # 计算流量使用率
     traffic_usage = (used_traffic / total_traffic * 100) if total_traffic > 0 else 0
@@ -92,7 +92,7 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
 @router.get("/accounts")
 async def get_dashboard_accounts(
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取仪表板账户列表
@@ -104,7 +104,7 @@ async def get_dashboard_accounts(
     ).limit(limit).all()
     
     result = []
-    encryption_service = get_encryption_service()
+    services = {}
     
     for account in accounts:
         account_data = {
@@ -119,38 +119,36 @@ async def get_dashboard_accounts(
             "created_at": account.created_at.isoformat() if account.created_at else None
         }
         
-        # 获取实时数据
         try:
-            ak = encryption_service.decrypt(account.ak)
-            sk = encryption_service.decrypt(account.sk)
-            is_intl = getattr(account, 'is_international', True)
-            
-            service = FlexusLService(
-                ak=ak,
-                sk=sk,
-                region=account.region,
-                is_international=is_intl
-            )
-            
-            summary = service.get_all_traffic_summary()
-            account_data['servers'] = summary['instance_count']
-            account_data['traffic_total'] = summary['total_amount']
-            account_data['traffic_remaining'] = summary['remaining_amount']
-            account_data['traffic_usage'] = summary['usage_percentage']
-            
+            services[len(result)] = FlexusLService.from_account(account)
         except Exception as e:
             logger.warning(f"账户 {account.name} 数据获取失败: {e}")
             account_data['status'] = 'error'
         
         result.append(account_data)
     
+    # 并发获取各账户实时数据
+    summaries = await get_traffic_summaries_concurrently(list(services.values()))
+    
+    for index, summary in zip(services, summaries):
+        account_data = result[index]
+        if isinstance(summary, BaseException):
+            logger.warning(f"账户 {account_data['name']} 数据获取失败: {summary}")
+            account_data['status'] = 'error'
+            continue
+        
+        account_data['servers'] = summary['instance_count']
+        account_data['traffic_total'] = summary['total_amount']
+        account_data['traffic_remaining'] = summary['remaining_amount']
+        account_data['traffic_usage'] = summary['usage_percentage']
+    
     return success_response(data=result)
 
 
 @router.get("/notifications")
 async def get_dashboard_notifications(
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取最近通知列表
@@ -165,7 +163,7 @@ async def get_dashboard_notifications(
 
 
 @router.get("/system-info")
-async def get_system_info(db: Session = Depends(get_db)):
+async def get_system_info(db: Session = Depends(get_db_ro)):
     """
     获取系统信息
     
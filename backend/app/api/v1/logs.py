@@ -9,7 +9,7 @@ from sqlalchemy import desc, or_, func
 from pydantic import BaseModel, Field
 from loguru import logger
 
-from app.core.database import get_db
+from app.core.database import get_db_ro, get_db_rw
 from app.core.response import success_response
 from app.models.monitor_log import MonitorLog
 from app.models.shutdown_log import ShutdownLog
@@ -52,7 +52,7 @@ async def get_all_logs(
     keyword: Optional[str] = Query(None, description="搜索关键词"),
     limit: int = Query(50, ge=1, le=500, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取所有日志（监控日志 + 关机日志 + 操作日志合并）
@@ -280,7 +280,7 @@ async def get_monitor_logs(
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)"),
     limit: int = Query(50, ge=1, le=500, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取监控日志
@@ -350,7 +350,7 @@ async def get_shutdown_logs(
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)"),
     limit: int = Query(50, ge=1, le=500, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取关机日志
@@ -420,7 +420,7 @@ async def get_operation_logs(
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)"),
     limit: int = Query(50, ge=1, le=500, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取操作日志
@@ -489,7 +489,7 @@ async def get_operation_logs(
 
 
 @router.get("/stats")
-async def get_log_stats(db: Session = Depends(get_db)):
+async def get_log_stats(db: Session = Depends(get_db_ro)):
     """
     获取日志统计信息
     """
@@ -549,7 +549,7 @@ async def get_log_stats(db: Session = Depends(get_db)):
 @router.post("/clean")
 async def clean_old_logs(
     days: int = Query(30, ge=1, le=365, description="保留天数"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """
     清理旧日志
@@ -9,7 +9,7 @@ from sqlalchemy import desc
 from pydantic import BaseModel, Field
 from loguru import logger
 
-from app.core.database import get_db
+from app.core.database import get_db_ro, get_db_rw
 from app.core.response import success_response, error_response
 from app.models.monitor_log import MonitorLog
 from app.models.account import Account
@@ -63,7 +63,7 @@ async def get_monitor_logs(
     is_below_threshold: Optional[bool] = Query(None, description="是否低于阈值"),
     limit: int = Query(50, ge=1, le=500, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取监控日志
@@ -118,7 +118,7 @@ async def get_monitor_logs(
 
 
 @router.get("/status")
-async def get_monitor_status(db: Session = Depends(get_db)):
+async def get_monitor_status(db: Session = Depends(get_db_ro)):
     """
     获取监控状态
     
@@ -141,7 +141,7 @@ async def get_monitor_status(db: Session = Depends(get_db)):
 @router.post("/start")
 async def start_monitor(
     request: Optional[StartMonitorRequest] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """
     启动监控
@@ -169,10 +169,12 @@ async def start_monitor(
     if not accounts:
         return error_response(message="没有可用的账户")
     
+    # 一次查询取出所有账户的有效配置
+    configs = config_service.list_effective_configs(db, [account.id for account in accounts])
+    
     for account in accounts:
         try:
-            # 获取账户的有效配置
-            config = config_service.get_effective_config(db, account.id)
+            config = configs[account.id]
             
             if not config:
                 logger.warning(f"账户 {account.name} 没有配置，跳过")
@@ -224,7 +226,7 @@ async def start_monitor(
 @router.post("/stop")
 async def stop_monitor(
     request: Optional[StopMonitorRequest] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """
     停止监控
@@ -257,7 +259,7 @@ async def stop_monitor(
 
 
 @router.post("/pause/{account_id}")
-async def pause_monitor(account_id: int, db: Session = Depends(get_db)):
+async def pause_monitor(account_id: int, db: Session = Depends(get_db_rw)):
     """
     暂停指定账户的监控任务
     
@@ -272,7 +274,7 @@ async def pause_monitor(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/resume/{account_id}")
-async def resume_monitor(account_id: int, db: Session = Depends(get_db)):
+async def resume_monitor(account_id: int, db: Session = Depends(get_db_rw)):
     """
     恢复指定账户的监控任务
     
@@ -287,7 +289,7 @@ async def resume_monitor(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/job/{account_id}")
-async def get_monitor_job(account_id: int, db: Session = Depends(get_db)):
+async def get_monitor_job(account_id: int, db: Session = Depends(get_db_ro)):
     """
     获取指定账户的监控任务信息
     
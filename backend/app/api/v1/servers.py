@@ -3,18 +3,22 @@
 
 查询 Flexus L 实例列表和流量信息
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import sys
+from types import MappingProxyType
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
 from loguru import logger
 
-from app.core.database import get_db
-from app.core.response import success_response
+from app.core.concurrency import run_huawei_call
+from app.core.database import get_db_ro, get_db_rw
+from app.core.response import success_response, conditional_response
 from app.services.account_service import AccountService
 from app.services.huawei_cloud.flexusl_service import FlexusLService, FlexusLException
 from app.services.operation_log_service import operation_log_service, OperationLogService
-from app.utils.encryption import get_encryption_service
 
 router = APIRouter(prefix="/servers", tags=["服务器管理"])
 account_service = AccountService()
@@ -28,8 +32,8 @@ class ServerActionRequest(BaseModel):
     action_type: str = "SOFT"  # 操作类型: SOFT/HARD
 
 
-# 区域名称映射
-REGION_NAMES = {
+# 区域名称映射（只读，键已驻留，与解析器中驻留的 region 字符串可走身份比较快速路径）
+REGION_NAMES = MappingProxyType({sys.intern(k): v for k, v in {
     'cn-north-1': '华北-北京一',
     'cn-north-4': '华北-北京四',
     'cn-north-9': '华北-乌兰察布一',
@@ -42,67 +46,62 @@ REGION_NAMES = {
     'ap-southeast-2': '亚太-曼谷',
     'ap-southeast-3': '亚太-雅加达',
     'af-south-1': '非洲-约翰内斯堡',
-}
+}.items()})
+
+
+def _list_account_servers(account) -> List[Dict[str, Any]]:
+    """查询单个账户的 Flexus L 实例并附加账户信息（同步调用，在线程池中执行）"""
+    service = FlexusLService.from_account(account)
+    
+    servers = []
+    for inst in service.list_instances():
+        server_dict = inst.to_dict()
+        server_dict['account_id'] = account.id
+        server_dict['account_name'] = account.name
+        server_dict['region_name'] = REGION_NAMES.get(inst.region, inst.region)
+        servers.append(server_dict)
+    return servers
 
 
 @router.get("")
-async def list_all_servers(db: Session = Depends(get_db)):
+async def list_all_servers(request: Request, db: Session = Depends(get_db_ro)):
     """
     获取所有账户的 Flexus L 实例列表
     
-    遍历所有启用的账户，查询其 Flexus L 实例
+    并发查询所有启用的账户的 Flexus L 实例（受 HUAWEI_MAX_CONCURRENCY 限制）
     """
     accounts = account_service.list_accounts(db=db, is_enabled=True)
     
     if not accounts:
         return success_response(data=[], message="没有启用的账户")
     
-    all_servers = []
-    encryption_service = get_encryption_service()
-    
-    for account in accounts:
+    async def fetch(account) -> List[Dict[str, Any]]:
         try:
-            ak = encryption_service.decrypt(account.ak)
-            sk = encryption_service.decrypt(account.sk)
-            is_intl = getattr(account, 'is_international', True)
-            
-            service = FlexusLService(
-                ak=ak,
-                sk=sk,
-                region=account.region,
-                is_international=is_intl
-            )
-            
-            instances = service.list_instances()
-            
-            for inst in instances:
-                server_dict = inst.to_dict()
-                server_dict['account_id'] = account.id
-                server_dict['account_name'] = account.name
-                server_dict['region_name'] = REGION_NAMES.get(inst.region, inst.region)
-                all_servers.append(server_dict)
-                
+            return await run_huawei_call(_list_account_servers, account)
         except Exception as e:
-            logger.warning(f"账户 {account.name} 查询失败: {e}")
-            continue
+            logger.warning("账户 {} 查询失败: {}", account.name, e)
+            return []
+    
+    results = await asyncio.gather(*(fetch(account) for account in accounts))
+    all_servers = [server for servers in results for server in servers]
     
-    return success_response(
+    return conditional_response(request, success_response(
         data=all_servers,
         message=f"查询成功，共 {len(all_servers)} 台实例"
-    )
+    ))
 
 
 @router.get("/{account_id}")
 async def list_servers_by_account(
     account_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取指定账户的 Flexus L 实例列表
     
     Flexus L 实例是全局查询，不需要选择区域
     """
-    logger.info(f"查询账户 Flexus L 实例: account_id={account_id}")
+    logger.info("查询账户 Flexus L 实例: account_id={}", account_id)
     
     # 获取账户信息
     account = account_service.get_account(db=db, account_id=account_id)
@@ -110,19 +109,7 @@ async def list_servers_by_account(
         raise HTTPException(status_code=404, detail="账户不存在")
     
     try:
-        # 解密 AK/SK
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        # 创建 FlexusL 服务
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
+        service = FlexusLService.from_account(account)
         
         # 查询实例列表
         instances = service.list_instances()
@@ -136,7 +123,7 @@ async def list_servers_by_account(
             server_dict['region_name'] = REGION_NAMES.get(inst.region, inst.region)
             server_list.append(server_dict)
         
-        logger.info(f"查询到 {len(server_list)} 台 Flexus L 实例")
+        logger.info("查询到 {} 台 Flexus L 实例", len(server_list))
         
         return success_response(
             data=server_list,
@@ -144,13 +131,13 @@ async def list_servers_by_account(
         )
         
     except FlexusLException as e:
-        logger.error(f"FlexusL 服务调用失败: {e}")
+        logger.error("FlexusL 服务调用失败: {}", e)
         return success_response(
             data=[],
             message=f"查询失败: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"查询实例列表失败: {e}")
+        logger.error("查询实例列表失败: {}", e)
         return success_response(
             data=[],
             message=f"查询失败: {str(e)}"
@@ -160,14 +147,14 @@ async def list_servers_by_account(
 @router.get("/{account_id}/traffic")
 async def get_account_traffic(
     account_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取指定账户的流量汇总信息
     
     返回账户下所有 Flexus L 实例的流量使用情况
     """
-    logger.info(f"查询账户流量汇总: account_id={account_id}")
+    logger.info("查询账户流量汇总: account_id={}", account_id)
     
     # 获取账户信息
     account = account_service.get_account(db=db, account_id=account_id)
@@ -175,19 +162,7 @@ async def get_account_traffic(
         raise HTTPException(status_code=404, detail="账户不存在")
     
     try:
-        # 解密 AK/SK
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        # 创建 FlexusL 服务
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
+        service = FlexusLService.from_account(account)
         
         # 获取流量汇总
         summary = service.get_all_traffic_summary()
@@ -197,8 +172,8 @@ async def get_account_traffic(
         summary['account_name'] = account.name
         
         logger.info(
-            f"流量汇总: {summary['instance_count']} 实例, "
-            f"剩余 {summary['remaining_amount']} GB"
+            "流量汇总: {} 实例, 剩余 {} GB",
+            summary['instance_count'], summary['remaining_amount']
         )
         
         return success_response(
@@ -207,13 +182,13 @@ async def get_account_traffic(
         )
         
     except FlexusLException as e:
-        logger.error(f"FlexusL 服务调用失败: {e}")
+        logger.error("FlexusL 服务调用失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"查询流量失败: {e}")
+        logger.error("查询流量失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
@@ -224,7 +199,7 @@ async def get_account_traffic(
 async def get_instance_traffic(
     account_id: int,
     instance_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取指定实例的流量使用情况
@@ -232,7 +207,7 @@ async def get_instance_traffic(
     - **account_id**: 账户 ID
     - **instance_id**: Flexus L 实例 ID
     """
-    logger.info(f"查询实例流量: account_id={account_id}, instance_id={instance_id}")
+    logger.info("查询实例流量: account_id={}, instance_id={}", account_id, instance_id)
     
     # 获取账户信息
     account = account_service.get_account(db=db, account_id=account_id)
@@ -240,19 +215,7 @@ async def get_instance_traffic(
         raise HTTPException(status_code=404, detail="账户不存在")
     
     try:
-        # 解密 AK/SK
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        # 创建 FlexusL 服务
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
+        service = FlexusLService.from_account(account)
         
         # 获取实例列表，找到指定实例
         instances = service.list_instances()
@@ -308,7 +271,7 @@ async def get_instance_traffic(
         )
         
     except FlexusLException as e:
-        logger.error(f"FlexusL 服务调用失败: {e}")
+        logger.error("FlexusL 服务调用失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
@@ -316,7 +279,7 @@ async def get_instance_traffic(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"查询实例流量失败: {e}")
+        logger.error("查询实例流量失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
@@ -326,7 +289,7 @@ async def get_instance_traffic(
 @router.post("/sync/{account_id}")
 async def sync_servers(
     account_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """同步指定账户的 Flexus L 实例信息"""
     return await list_servers_by_account(account_id=account_id, db=db)
@@ -337,7 +300,7 @@ async def get_server_real_status(
     account_id: int,
     server_id: str,
     region: str = Query(..., description="区域 ID，如 ap-southeast-2"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     查询云主机实时状态
@@ -357,7 +320,7 @@ async def get_server_real_status(
     - SUSPENDED: 挂起
     - ERROR: 错误
     """
-    logger.info(f"查询云主机实时状态: account_id={account_id}, server_id={server_id}, region={region}")
+    logger.info("查询云主机实时状态: account_id={}, server_id={}, region={}", account_id, server_id, region)
     
     # 获取账户信息
     account = account_service.get_account(db=db, account_id=account_id)
@@ -365,19 +328,7 @@ async def get_server_real_status(
         raise HTTPException(status_code=404, detail="账户不存在")
     
     try:
-        # 解密 AK/SK
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        # 创建 FlexusL 服务
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
+        service = FlexusLService.from_account(account)
         
         # 查询云主机实时状态
         server_status = service.get_server_status(server_id=server_id, region=region)
@@ -388,13 +339,13 @@ async def get_server_real_status(
         )
         
     except FlexusLException as e:
-        logger.error(f"查询云主机状态失败: {e}")
+        logger.error("查询云主机状态失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"查询云主机状态异常: {e}")
+        logger.error("查询云主机状态异常: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
@@ -406,7 +357,7 @@ async def get_job_status(
     account_id: int,
     job_id: str,
     region: str = Query(..., description="区域 ID，如 ap-southeast-2"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     查询任务执行状态
@@ -423,7 +374,7 @@ async def get_job_status(
     - RUNNING: 运行中
     - INIT: 初始化
     """
-    logger.info(f"查询 Job 状态: account_id={account_id}, job_id={job_id}, region={region}")
+    logger.info("查询 Job 状态: account_id={}, job_id={}, region={}", account_id, job_id, region)
     
     # 获取账户信息
     account = account_service.get_account(db=db, account_id=account_id)
@@ -431,19 +382,7 @@ async def get_job_status(
         raise HTTPException(status_code=404, detail="账户不存在")
     
     try:
-        # 解密 AK/SK
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        # 创建 FlexusL 服务
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
+        service = FlexusLService.from_account(account)
         
         # 查询 Job 状态
         job_status = service.get_job_status(job_id=job_id, region=region)
@@ -454,35 +393,52 @@ async def get_job_status(
         )
         
     except FlexusLException as e:
-        logger.error(f"查询 Job 状态失败: {e}")
+        logger.error("查询 Job 状态失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"查询 Job 状态异常: {e}")
+        logger.error("查询 Job 状态异常: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
         )
 
 
-@router.post("/{account_id}/server/start")
-async def start_server(
+# 服务器操作分发表
+# action -> (操作日志类型, 服务方法名, 操作类型参数名, 操作名称, 日志描述, 操作原因)
+_SERVER_ACTIONS = {
+    'start': (OperationLogService.OP_START, 'start_server', None, '启动', '启动云主机', '用户手动启动'),
+    'stop': (OperationLogService.OP_STOP, 'stop_server', 'stop_type', '关机', '关闭云主机', '用户手动关机'),
+    'reboot': (OperationLogService.OP_REBOOT, 'reboot_server', 'reboot_type', '重启', '重启云主机', '用户手动重启'),
+}
+
+
+async def _execute_server_action(
+    action: str,
     account_id: int,
     request: ServerActionRequest,
-    db: Session = Depends(get_db)
+    db: Session
 ):
     """
-    启动云主机
+    执行云主机操作（启动/关机/重启共用）
     
-    - **account_id**: 账户 ID
-    - **server_id**: 云主机 ID
-    - **region**: 区域 ID
-    
-    返回 job_id 用于查询任务状态
+    记录操作日志，调用 FlexusL 服务对应方法，并根据结果更新日志状态
     """
-    logger.info(f"启动云主机: account_id={account_id}, server_id={request.server_id}, region={request.region}")
+    op_type, method_name, type_param, label, desc, reason = _SERVER_ACTIONS[action]
+    
+    if type_param:
+        logger.info(
+            "{}: account_id={}, server_id={}, region={}, type={}",
+            desc, account_id, request.server_id, request.region, request.action_type
+        )
+    else:
+        # 启动操作没有操作类型参数
+        logger.info(
+            "{}: account_id={}, server_id={}, region={}",
+            desc, account_id, request.server_id, request.region
+        )
     
     account = account_service.get_account(db=db, account_id=account_id)
     if not account:
@@ -492,27 +448,23 @@ async def start_server(
     op_log = operation_log_service.create_operation_log(
         db=db,
         account_id=account_id,
-        operation_type=OperationLogService.OP_START,
+        operation_type=op_type,
         target_id=request.server_id,
         region=request.region,
-        reason="用户手动启动"
+        reason=reason,
+        extra_data={'action_type': request.action_type} if type_param else None
     )
     
     try:
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
+        service = FlexusLService.from_account(account)
         
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
+        kwargs = {type_param: request.action_type} if type_param else {}
+        result = getattr(service, method_name)(
+            server_id=request.server_id,
+            region=request.region,
+            **kwargs
         )
         
-        result = service.start_server(server_id=request.server_id, region=request.region)
-        
         if result.success:
             # 记录成功
             operation_log_service.mark_success(db=db, log_id=op_log.id, job_id=result.job_id)
@@ -521,33 +473,51 @@ async def start_server(
                     'job_id': result.job_id,
                     'server_id': request.server_id,
                     'region': request.region,
-                    'action': 'start'
+                    'action': action
                 },
-                message="启动请求已提交"
+                message=f"{label}请求已提交"
             )
         else:
             # 记录失败
             operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=result.message)
             return success_response(
                 data=None,
-                message=f"启动失败: {result.message}"
+                message=f"{label}失败: {result.message}"
             )
         
     except FlexusLException as e:
-        logger.error(f"启动云主机失败: {e}")
+        logger.error("{}失败: {}", desc, e)
         operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=str(e))
-        return success_response(data=None, message=f"启动失败: {str(e)}")
+        return success_response(data=None, message=f"{label}失败: {str(e)}")
     except Exception as e:
-        logger.error(f"启动云主机异常: {e}")
+        logger.error("{}异常: {}", desc, e)
         operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=str(e))
-        return success_response(data=None, message=f"启动失败: {str(e)}")
+        return success_response(data=None, message=f"{label}失败: {str(e)}")
+
+
+@router.post("/{account_id}/server/start")
+async def start_server(
+    account_id: int,
+    request: ServerActionRequest,
+    db: Session = Depends(get_db_rw)
+):
+    """
+    启动云主机
+    
+    - **account_id**: 账户 ID
+    - **server_id**: 云主机 ID
+    - **region**: 区域 ID
+    
+    返回 job_id 用于查询任务状态
+    """
+    return await _execute_server_action('start', account_id, request, db)
 
 
 @router.post("/{account_id}/server/stop")
 async def stop_server(
     account_id: int,
     request: ServerActionRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """
     关闭云主机
@@ -559,75 +529,14 @@ async def stop_server(
     
     返回 job_id 用于查询任务状态
     """
-    logger.info(f"关闭云主机: account_id={account_id}, server_id={request.server_id}, region={request.region}, type={request.action_type}")
-    
-    account = account_service.get_account(db=db, account_id=account_id)
-    if not account:
-        raise HTTPException(status_code=404, detail="账户不存在")
-    
-    # 创建操作日志
-    op_log = operation_log_service.create_operation_log(
-        db=db,
-        account_id=account_id,
-        operation_type=OperationLogService.OP_STOP,
-        target_id=request.server_id,
-        region=request.region,
-        reason="用户手动关机",
-        extra_data={'action_type': request.action_type}
-    )
-    
-    try:
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
-        
-        result = service.stop_server(
-            server_id=request.server_id,
-            region=request.region,
-            stop_type=request.action_type
-        )
-        
-        if result.success:
-            operation_log_service.mark_success(db=db, log_id=op_log.id, job_id=result.job_id)
-            return success_response(
-                data={
-                    'job_id': result.job_id,
-                    'server_id': request.server_id,
-                    'region': request.region,
-                    'action': 'stop'
-                },
-                message="关机请求已提交"
-            )
-        else:
-            operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=result.message)
-            return success_response(
-                data=None,
-                message=f"关机失败: {result.message}"
-            )
-        
-    except FlexusLException as e:
-        logger.error(f"关闭云主机失败: {e}")
-        operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=str(e))
-        return success_response(data=None, message=f"关机失败: {str(e)}")
-    except Exception as e:
-        logger.error(f"关闭云主机异常: {e}")
-        operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=str(e))
-        return success_response(data=None, message=f"关机失败: {str(e)}")
+    return await _execute_server_action('stop', account_id, request, db)
 
 
 @router.post("/{account_id}/server/reboot")
 async def reboot_server(
     account_id: int,
     request: ServerActionRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_rw)
 ):
     """
     重启云主机
@@ -639,65 +548,4 @@ async def reboot_server(
     
     返回 job_id 用于查询任务状态
     """
-    logger.info(f"重启云主机: account_id={account_id}, server_id={request.server_id}, region={request.region}, type={request.action_type}")
-    
-    account = account_service.get_account(db=db, account_id=account_id)
-    if not account:
-        raise HTTPException(status_code=404, detail="账户不存在")
-    
-    # 创建操作日志
-    op_log = operation_log_service.create_operation_log(
-        db=db,
-        account_id=account_id,
-        operation_type=OperationLogService.OP_REBOOT,
-        target_id=request.server_id,
-        region=request.region,
-        reason="用户手动重启",
-        extra_data={'action_type': request.action_type}
-    )
-    
-    try:
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
-        
-        result = service.reboot_server(
-            server_id=request.server_id,
-            region=request.region,
-            reboot_type=request.action_type
-        )
-        
-        if result.success:
-            operation_log_service.mark_success(db=db, log_id=op_log.id, job_id=result.job_id)
-            return success_response(
-                data={
-                    'job_id': result.job_id,
-                    'server_id': request.server_id,
-                    'region': request.region,
-                    'action': 'reboot'
-                },
-                message="重启请求已提交"
-            )
-        else:
-            operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=result.message)
-            return success_response(
-                data=None,
-                message=f"重启失败: {result.message}"
-            )
-        
-    except FlexusLException as e:
-        logger.error(f"重启云主机失败: {e}")
-        operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=str(e))
-        return success_response(data=None, message=f"重启失败: {str(e)}")
-    except Exception as e:
-        logger.error(f"重启云主机异常: {e}")
-        operation_log_service.mark_failed(db=db, log_id=op_log.id, error_message=str(e))
-        return success_response(data=None, message=f"重启失败: {str(e)}")
+    return await _execute_server_action('reboot', account_id, request, db)
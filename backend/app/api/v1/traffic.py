@@ -3,23 +3,34 @@
 
 查询 Flexus L 实例流量使用情况
 """
-from fastapi import APIRouter, Depends, HTTPException
+from functools import partial
+from operator import itemgetter
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from loguru import logger
 
-from app.core.database import get_db
-from app.core.response import success_response
+from app.core.database import get_db_ro
+from app.core.response import success_response, conditional_response
 from app.services.account_service import AccountService
-from app.services.huawei_cloud.flexusl_service import FlexusLService, FlexusLException
-from app.utils.encryption import get_encryption_service
+from app.services.huawei_cloud.flexusl_service import (
+    FlexusLService,
+    FlexusLException,
+    get_traffic_summaries_concurrently
+)
 
 router = APIRouter(prefix="/traffic", tags=["流量监控"])
 account_service = AccountService()
 
+# 一次取出账户流量汇总中需要累加的字段
+_get_summary_totals = itemgetter(
+    'instance_count', 'package_count', 'total_amount', 'used_amount', 'remaining_amount'
+)
+
 
 @router.get("/summary")
-async def get_all_traffic_summary(db: Session = Depends(get_db)):
+async def get_all_traffic_summary(request: Request, db: Session = Depends(get_db_ro)):
     """
     获取所有账户的流量汇总
     
@@ -44,7 +55,19 @@ async def get_all_traffic_summary(db: Session = Depends(get_db)):
             message="没有启用的账户"
         )
     
-    encryption_service = get_encryption_service()
+    # 创建服务失败（如凭证无法解密）的账户直接记为该异常
+    built = []
+    for account in accounts:
+        try:
+            built.append(FlexusLService.from_account(account))
+        except Exception as e:
+            built.append(e)
+    
+    # 并发查询各账户（受 HUAWEI_MAX_CONCURRENCY 限制），结果顺序与账户顺序一致
+    summaries = iter(await get_traffic_summaries_concurrently(
+        [item for item in built if isinstance(item, FlexusLService)]
+    ))
+    results = [item if isinstance(item, Exception) else next(summaries) for item in built]
     
     total_instances = 0
     total_packages = 0
@@ -53,82 +76,76 @@ async def get_all_traffic_summary(db: Session = Depends(get_db)):
     remaining_amount = 0.0
     account_summaries = []
     
-    for account in accounts:
-        try:
-            ak = encryption_service.decrypt(account.ak)
-            sk = encryption_service.decrypt(account.sk)
-            is_intl = getattr(account, 'is_international', True)
-            
-            service = FlexusLService(
-                ak=ak,
-                sk=sk,
-                region=account.region,
-                is_international=is_intl
-            )
-            
-            summary = service.get_all_traffic_summary()
-            
-            # 累加统计
-            total_instances += summary['instance_count']
-            total_packages += summary['package_count']
-            total_amount += summary['total_amount']
-            used_amount += summary['used_amount']
-            remaining_amount += summary['remaining_amount']
-            
-            # 添加账户摘要
+    for account, summary in zip(accounts, results):
+        if isinstance(summary, BaseException):
+            logger.warning("账户 {} 流量查询失败: {}", account.name, summary)
             account_summaries.append({
                 "account_id": account.id,
                 "account_name": account.name,
-                "instance_count": summary['instance_count'],
-                "package_count": summary['package_count'],
-                "total_amount": summary['total_amount'],
-                "used_amount": summary['used_amount'],
-                "remaining_amount": summary['remaining_amount'],
-                "usage_percentage": summary['usage_percentage']
-            })
-            
-        except Exception as e:
-            logger.warning(f"账户 {account.name} 流量查询失败: {e}")
-            account_summaries.append({
-                "account_id": account.id,
-                "account_name": account.name,
-                "error": str(e)
+                "error": str(summary)
             })
             continue
+        
+        ic, pc, ta, ua, ra = _get_summary_totals(summary)
+        
+        # 添加账户摘要
+        account_summaries.append({
+            "account_id": account.id,
+            "account_name": account.name,
+            "instance_count": ic,
+            "package_count": pc,
+            "total_amount": ta,
+            "used_amount": ua,
+            "remaining_amount": ra,
+            "usage_percentage": summary['usage_percentage']
+        })
+        
+        # 累加统计
+        total_instances += ic
+        total_packages += pc
+        total_amount += ta
+        used_amount += ua
+        remaining_amount += ra
     
     # 计算总体使用率
     usage_percentage = (used_amount / total_amount * 100) if total_amount > 0 else 0
     
+    total_rounded, used_rounded, remaining_rounded, usage_rounded = map(
+        partial(round, ndigits=2),
+        (total_amount, used_amount, remaining_amount, usage_percentage)
+    )
+    
     result = {
         "total_accounts": len(accounts),
         "total_instances": total_instances,
         "total_packages": total_packages,
-        "total_amount": round(total_amount, 2),
-        "used_amount": round(used_amount, 2),
-        "remaining_amount": round(remaining_amount, 2),
-        "usage_percentage": round(usage_percentage, 2),
+        "total_amount": total_rounded,
+        "used_amount": used_rounded,
+        "remaining_amount": remaining_rounded,
+        "usage_percentage": usage_rounded,
         "accounts": account_summaries
     }
     
+    # 使用 loguru 的延迟格式化，日志级别被过滤时不做数值格式化
     logger.info(
-        f"流量汇总: {total_instances} 实例, "
-        f"总量 {total_amount:.2f} GB, 剩余 {remaining_amount:.2f} GB"
+        "流量汇总: {} 实例, 总量 {:.2f} GB, 剩余 {:.2f} GB",
+        total_instances, total_amount, remaining_amount
     )
     
-    return success_response(data=result, message="查询成功")
+    return conditional_response(request, success_response(data=result, message="查询成功"))
 
 
 @router.get("/{account_id}")
 async def get_account_traffic_detail(
     account_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     获取指定账户的流量详情
     
     返回账户下每个实例的流量包详情
     """
-    logger.info(f"查询账户流量详情: account_id={account_id}")
+    logger.info("查询账户流量详情: account_id={}", account_id)
     
     # 获取账户信息
     account = account_service.get_account(db=db, account_id=account_id)
@@ -136,19 +153,7 @@ async def get_account_traffic_detail(
         raise HTTPException(status_code=404, detail="账户不存在")
     
     try:
-        # 解密 AK/SK
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        # 创建 FlexusL 服务
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
+        service = FlexusLService.from_account(account)
         
         # 获取流量汇总（包含实例和流量包详情）
         summary = service.get_all_traffic_summary()
@@ -170,13 +175,13 @@ async def get_account_traffic_detail(
         return success_response(data=result, message="查询成功")
         
     except FlexusLException as e:
-        logger.error(f"FlexusL 服务调用失败: {e}")
+        logger.error("FlexusL 服务调用失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"查询流量详情失败: {e}")
+        logger.error("查询流量详情失败: {}", e)
         return success_response(
             data=None,
             message=f"查询失败: {str(e)}"
@@ -187,7 +192,7 @@ async def get_account_traffic_detail(
 async def check_traffic_threshold(
     account_id: int,
     threshold_gb: float = 100.0,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     检查账户流量是否低于阈值
@@ -198,7 +203,7 @@ async def check_traffic_threshold(
         account_id: 账户 ID
         threshold_gb: 剩余流量阈值（GB），低于此值触发告警
     """
-    logger.info(f"检查账户流量阈值: account_id={account_id}, threshold={threshold_gb}GB")
+    logger.info("检查账户流量阈值: account_id={}, threshold={}GB", account_id, threshold_gb)
     
     # 获取账户信息
     account = account_service.get_account(db=db, account_id=account_id)
@@ -206,19 +211,7 @@ async def check_traffic_threshold(
         raise HTTPException(status_code=404, detail="账户不存在")
     
     try:
-        # 解密 AK/SK
-        encryption_service = get_encryption_service()
-        ak = encryption_service.decrypt(account.ak)
-        sk = encryption_service.decrypt(account.sk)
-        is_intl = getattr(account, 'is_international', True)
-        
-        # 创建 FlexusL 服务
-        service = FlexusLService(
-            ak=ak,
-            sk=sk,
-            region=account.region,
-            is_international=is_intl
-        )
+        service = FlexusLService.from_account(account)
         
         # 获取流量汇总
         summary = service.get_all_traffic_summary()
@@ -240,20 +233,20 @@ async def check_traffic_threshold(
         
         if is_below_threshold:
             logger.warning(
-                f"账户 {account.name} 流量告警: "
-                f"剩余 {remaining:.2f} GB < 阈值 {threshold_gb} GB"
+                "账户 {} 流量告警: 剩余 {:.2f} GB < 阈值 {} GB",
+                account.name, remaining, threshold_gb
             )
         
         return success_response(data=result, message="检查完成")
         
     except FlexusLException as e:
-        logger.error(f"FlexusL 服务调用失败: {e}")
+        logger.error("FlexusL 服务调用失败: {}", e)
         return success_response(
             data={"status": "error", "message": str(e)},
             message=f"检查失败: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"检查流量阈值失败: {e}")
+        logger.error("检查流量阈值失败: {}", e)
         return success_response(
             data={"status": "error", "message": str(e)},
             message=f"检查失败: {str(e)}"
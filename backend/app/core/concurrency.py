@@ -0,0 +1,23 @@
+"""
+并发控制
+"""
+import asyncio
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar('T')
+
+# 限制同时进行的华为云 API 调用数量，避免多账户并发时触发限流或耗尽 HTTP 连接池
+HUAWEI_SEMAPHORE = asyncio.Semaphore(settings.HUAWEI_MAX_CONCURRENCY or 8)
+
+
+async def run_huawei_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    在线程池中执行同步的华为云调用
+    
+    调用受 HUAWEI_SEMAPHORE 约束，多账户 asyncio.gather 扇出时同一时刻
+    最多 HUAWEI_MAX_CONCURRENCY 个请求在途，且不会阻塞事件循环
+    """
+    async with HUAWEI_SEMAPHORE:
+        return await asyncio.to_thread(func, *args, **kwargs)
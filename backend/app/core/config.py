@@ -1,17 +1,23 @@
 """
 应用配置
 """
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
 class Settings(BaseSettings):
     """应用配置"""
     
+    # 配置对象只读，可在线程间安全共享
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
+    
     # 应用信息
     APP_NAME: str = "华为云服务器流量监控系统"
     APP_VERSION: str = "0.1.0"
     APP_DESCRIPTION: str = "实时监控华为云服务器流量，自动关机并发送飞书通知"
+    DEBUG: bool = False  # 调试模式：未捕获异常记录完整堆栈
     
     # API 配置
     API_V1_PREFIX: str = "/api/v1"
@@ -19,10 +25,10 @@ class Settings(BaseSettings):
     API_PORT: int = 8000
     
     # CORS 配置
-    CORS_ORIGINS: list = ["*"]  # 生产环境需要配置具体域名
+    CORS_ORIGINS: list = Field(default_factory=lambda: ["*"])  # 生产环境需要配置具体域名
     CORS_ALLOW_CREDENTIALS: bool = True
-    CORS_ALLOW_METHODS: list = ["*"]
-    CORS_ALLOW_HEADERS: list = ["*"]
+    CORS_ALLOW_METHODS: list = Field(default_factory=lambda: ["*"])
+    CORS_ALLOW_HEADERS: list = Field(default_factory=lambda: ["*"])
     
     # 数据库配置
     DATABASE_URL: str = "sqlite:///./data/monitor.db"
@@ -48,14 +54,21 @@ class Settings(BaseSettings):
     # 监控配置
     DEFAULT_CHECK_INTERVAL: int = 5  # 分钟
     DEFAULT_TRAFFIC_THRESHOLD: float = 10.0  # GB
+    HUAWEI_MAX_CONCURRENCY: int = 8  # 多账户查询时华为云 API 最大并发数
     
     # 飞书配置
     FEISHU_WEBHOOK_URL: Optional[str] = None
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取配置实例
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    只在首次调用时解析环境变量和 .env 文件，之后复用同一实例
+    """
+    return Settings()
 
 
 # 创建配置实例
-settings = Settings()
+settings = get_settings()
@@ -1,28 +1,118 @@
 """
 数据库配置
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateIndex
+import importlib
+import itertools
 import os
+from contextvars import ContextVar
+from typing import Optional
+
+from loguru import logger
 
 # 数据库 URL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/monitor.db")
 
-# 控制是否在控制台输出 SQL 语句（用于开发环境调试）
-# 在生产环境请将 环境变量 DATABASE_ECHO=false
-_db_echo = os.getenv("DATABASE_ECHO", "True")
+# 控制是否在控制台输出 SQL 语句（仅用于开发环境调试）
+# 默认关闭；开发时可设置环境变量 DATABASE_ECHO=true 开启
+_db_echo = os.getenv("DATABASE_ECHO", "false")
 DB_ECHO = str(_db_echo).lower() in ("1", "true", "yes")
 
-# 创建数据库引擎
-engine = create_engine(
+_is_sqlite = "sqlite" in DATABASE_URL
+_db_path = make_url(DATABASE_URL).database if _is_sqlite else None
+# 文件型 SQLite 才拆分读写连接池（内存库无法以只读 URI 共享）
+_split_ro = bool(_db_path) and _db_path != ":memory:"
+
+# 编译后 SQL 的 LRU 缓存容量（默认 500），容纳 ORM 查询、lambda 语句和批量写入的全部变体，
+# 避免缓存淘汰后按主键获取等短查询重新编译
+_QUERY_CACHE_SIZE = 1200
+
+# 读写引擎
+# SQLite 同一时刻只允许一个写者：常驻 1 个写连接，少量溢出供调度任务长时间持有会话
+engine_rw = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    echo=DB_ECHO
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    poolclass=QueuePool,
+    pool_size=1 if _is_sqlite else 10,
+    max_overflow=4 if _is_sqlite else 20,
+    pool_timeout=30,
+    # 本地 SQLite 文件连接不会被服务端断开，无需定期回收和借出前 ping；
+    # 网络数据库在服务端空闲超时之前回收，并在借出前探活
+    pool_recycle=-1 if _is_sqlite else 1800,
+    pool_pre_ping=not _is_sqlite,
+    query_cache_size=_QUERY_CACHE_SIZE,
+    echo=DB_ECHO,
+    echo_pool=False
 )
 
+# 只读引擎：WAL 模式下读连接不受写锁影响，连接数与 CPU 核数一致
+if _split_ro:
+    engine_ro = create_engine(
+        f"sqlite:///file:{_db_path}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=os.cpu_count() or 4,
+        max_overflow=10,
+        pool_timeout=30,
+        query_cache_size=_QUERY_CACHE_SIZE,
+        echo=DB_ECHO,
+        echo_pool=False
+    )
+else:
+    engine_ro = engine_rw
+
+# 兼容旧代码：engine 指向读写引擎
+engine = engine_rw
+
+
+def _set_sqlite_pragmas(dbapi_conn, readonly: bool):
+    """
+    为新建的 SQLite 连接设置 PRAGMA
+    
+    WAL 模式下读写互不阻塞，synchronous=NORMAL 减少每次提交的 fsync；
+    连接由连接池复用，每个连接只执行一次。只读连接无法切换日志模式，跳过 WAL 设置
+    """
+    if not _is_sqlite:
+        return
+    cursor = dbapi_conn.cursor()
+    if not readonly:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+@event.listens_for(engine_rw, "connect")
+def _on_rw_connect(dbapi_conn, _connection_record):
+    _set_sqlite_pragmas(dbapi_conn, readonly=False)
+
+
+if engine_ro is not engine_rw:
+    @event.listens_for(engine_ro, "connect")
+    def _on_ro_connect(dbapi_conn, _connection_record):
+        _set_sqlite_pragmas(dbapi_conn, readonly=True)
+
+
 # 创建会话工厂
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False：提交后不使对象属性失效，序列化响应时无需重新 SELECT
+SessionLocalRW = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine_rw)
+SessionLocalRO = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine_ro)
+SessionLocal = SessionLocalRW
+
+# 请求级会话：同一请求内复用同一个会话，由 DBSessionMiddleware 在请求结束时统一关闭
+_request_scope: ContextVar[Optional[int]] = ContextVar("db_request_scope", default=None)
+_request_ids = itertools.count(1)
+ScopedSessionRW = scoped_session(SessionLocalRW, scopefunc=_request_scope.get)
+ScopedSessionRO = scoped_session(SessionLocalRO, scopefunc=_request_scope.get)
 
 # 创建模型基类
 Base = declarative_base()
@@ -40,17 +130,77 @@ def get_db():
         db.close()
 
 
+async def get_db_rw():
+    """
+    获取读写数据库会话
+    用于需要写入的接口（POST/PUT/DELETE）
+    
+    返回当前请求的作用域会话，不经过线程池，会话在请求结束时由中间件关闭。
+    同一请求内的多次服务调用共用这一个会话和连接；服务方法各自提交自己的写操作
+    （后台任务也直接调用这些方法），请求期间不长时间持有 SQLite 写锁
+    """
+    return ScopedSessionRW()
+
+
+async def get_db_ro():
+    """
+    获取只读数据库会话
+    用于只读的查询接口（GET），不与写操作争用连接
+    """
+    return ScopedSessionRO()
+
+
+def begin_request_scope():
+    """开始一个请求级会话作用域，返回用于 end_request_scope 的令牌"""
+    return _request_scope.set(next(_request_ids))
+
+
+def end_request_scope(token) -> None:
+    """关闭当前请求作用域内创建的会话，并恢复上一个作用域"""
+    try:
+        ScopedSessionRW.remove()
+        ScopedSessionRO.remove()
+    finally:
+        _request_scope.reset(token)
+
+
+# 需要注册到 Base 的模型模块（app.models 下）
+_MODEL_MODULES = (
+    "account", "server", "config", "monitor_log",
+    "shutdown_log", "notification_log", "operation_log",
+)
+
+
 def init_db():
     """
     初始化数据库
     创建所有表
     """
     # 导入所有模型，确保它们被注册到 Base
-    from app.models import account, server, config, monitor_log, shutdown_log, notification_log, operation_log
+    for module_name in _MODEL_MODULES:
+        importlib.import_module(f"app.models.{module_name}")
     
     # 创建数据目录
     os.makedirs("./data", exist_ok=True)
     
     # 创建所有表
     Base.metadata.create_all(bind=engine)
-    print("✅ 数据库初始化完成")
+    
+    # create_all 不会为已存在的表补建索引，逐个补建。
+    # checkfirst 依赖索引反射，识别不了表达式/部分索引（如 uq_configs_global），
+    # 这里直接用 CREATE INDEX IF NOT EXISTS，由数据库按索引名判断
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+            except IntegrityError as e:
+                # 旧数据违反新增的唯一索引时不阻止启动，清理重复数据后重启即可补建
+                logger.warning("创建唯一索引失败，存在重复数据: index={}, error={}", index.name, e.orig)
+    
+    # 更新 SQLite 统计信息，让查询规划器选用新索引
+    if _is_sqlite:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    
+    logger.info("数据库初始化完成: tables={}", len(Base.metadata.tables))
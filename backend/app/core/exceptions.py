@@ -2,9 +2,12 @@
 自定义异常处理
 """
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from loguru import logger
+from starlette.requests import ClientDisconnect
+
+from app.core.config import settings
 
 
 class APIException(Exception):
@@ -47,8 +50,8 @@ class InternalServerException(APIException):
 
 async def api_exception_handler(request: Request, exc: APIException):
     """API 异常处理器"""
-    logger.error(f"API异常: {exc.message}")
-    return JSONResponse(
+    logger.error("API异常: {}", exc.message)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -60,9 +63,14 @@ async def api_exception_handler(request: Request, exc: APIException):
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """请求验证异常处理器"""
-    errors = exc.errors()
-    logger.warning(f"请求验证失败: {errors}")
-    return JSONResponse(
+    # 只返回错误类型、位置和说明，不回显请求输入（input）、上下文（ctx）和文档链接（url），
+    # 避免大请求体被复制进响应和日志
+    errors = [
+        {"type": err.get("type"), "loc": err.get("loc"), "msg": err.get("msg")}
+        for err in exc.errors()
+    ]
+    logger.warning("请求验证失败: {}", errors)
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -74,8 +82,14 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 async def general_exception_handler(request: Request, exc: Exception):
     """通用异常处理器"""
-    logger.exception(f"未捕获的异常: {str(exc)}")
-    return JSONResponse(
+    if isinstance(exc, ClientDisconnect):
+        # 客户端断开不属于程序错误，不记录堆栈；
+        # 请求取消（CancelledError）不是 Exception 子类，不会进入这里，由框架直接向上抛出
+        logger.debug("请求已中断: {} {}", request.method, request.url.path)
+    else:
+        # 仅在调试模式下记录完整堆栈，避免异常频发时反复遍历栈帧
+        logger.opt(exception=exc if settings.DEBUG else None).error("未捕获的异常: {}", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
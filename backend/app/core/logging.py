@@ -6,11 +6,19 @@ import sys
 import os
 from app.core.config import settings
 
+# 日志系统是否已初始化（模块被重复导入或多次调用时只配置一次，避免重复注册输出）
+_initialized = False
+
 
 def setup_logging():
     """
     配置日志系统
     """
+    global _initialized
+    if _initialized:
+        return logger
+    _initialized = True
+    
     # 移除默认的日志处理器
     logger.remove()
     
@@ -26,6 +34,8 @@ def setup_logging():
     )
     
     # 文件输出 - 所有日志
+    # enqueue=True：写文件和轮转压缩交给后台线程，不阻塞事件循环；
+    # 文件日志不记录变量值与完整回溯，减少异常时的栈帧遍历开销
     logger.add(
         f"{settings.LOG_DIR}/app.log",
         level=settings.LOG_LEVEL,
@@ -34,6 +44,9 @@ def setup_logging():
         retention=settings.LOG_RETENTION,
         compression="zip",
         encoding="utf-8",
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
     )
     
     # 文件输出 - 错误日志
@@ -45,6 +58,9 @@ def setup_logging():
         retention=settings.LOG_RETENTION,
         compression="zip",
         encoding="utf-8",
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
     )
     
     logger.info("日志系统初始化完成")
@@ -0,0 +1,65 @@
+"""
+ASGI 中间件
+"""
+import time
+
+from loguru import logger
+
+from app.core.database import begin_request_scope, end_request_scope
+
+
+class TimingMiddleware:
+    """
+    请求日志中间件（纯 ASGI 实现）
+    
+    记录请求方法、路径、状态码和处理耗时，并在响应头中添加 X-Process-Time。
+    不经过 BaseHTTPMiddleware，避免为每个请求额外创建任务和 Request/Response 对象
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", str(process_time).encode("latin-1")))
+                message["headers"] = headers
+
+                logger.info(
+                    "{} {} status_code={} duration={:.3f}s",
+                    scope["method"], scope["path"], message["status"], process_time
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class DBSessionMiddleware:
+    """
+    请求级数据库会话中间件（纯 ASGI 实现）
+    
+    为每个 HTTP 请求开启独立的会话作用域，请求内通过 get_db_ro/get_db_rw
+    获取的会话在响应发送完毕后统一关闭，连接及时归还连接池
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = begin_request_scope()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_request_scope(token)
@@ -1,8 +1,14 @@
 """
 统一响应模型
 """
+import hashlib
+from functools import lru_cache
 from typing import Any, Optional, Generic, TypeVar
-from pydantic import BaseModel
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response as HTTPResponse
 
 T = TypeVar('T')
 
@@ -79,3 +85,78 @@ def list_response(
         "page": page,
         "page_size": page_size
     }
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    判断 If-None-Match 是否命中 ETag
+    
+    按 RFC 9110 解析：值为逗号分隔的列表，使用弱比较（忽略 W/ 前缀），* 匹配任意 ETag
+    """
+    if not if_none_match:
+        return False
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, content: Any) -> HTTPResponse:
+    """
+    带 ETag 的 JSON 响应
+    
+    ETag 由序列化后的响应体计算，请求头 If-None-Match 命中时
+    直接返回 304，客户端复用本地缓存，无需再次传输响应体。
+    Cache-Control: no-cache 要求浏览器每次都向服务端验证，
+    开关机后刷新能立即看到新状态
+    
+    Args:
+        request: 当前请求
+        content: 响应内容（通常为 success_response 的返回值）
+    """
+    response = ORJSONResponse(content=jsonable_encoder(content))
+    # 弱 ETag：GZipMiddleware 压缩前后的响应体共用同一个 ETag
+    etag = f'W/"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+    }
+    
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return HTTPResponse(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return response
+
+
+@lru_cache(maxsize=None)
+def _adapter(tp: Any) -> TypeAdapter:
+    """按类型缓存 TypeAdapter，避免每次请求重新构建校验器"""
+    return TypeAdapter(tp)
+
+
+def typed_response(tp: Any, content: Any, status_code: int = 200) -> HTTPResponse:
+    """
+    按响应模型校验并直接序列化为 JSON 响应
+    
+    使用缓存的 TypeAdapter 在 pydantic-core 中一次完成校验和 JSON 编码，
+    跳过 FastAPI 默认的 response_model 序列化和标准库 json 编码
+    
+    Args:
+        tp: 响应类型，如 List[AccountResponse]
+        content: 响应内容
+        status_code: HTTP 状态码
+    """
+    adapter = _adapter(tp)
+    return HTTPResponse(
+        content=adapter.dump_json(adapter.validate_python(content)),
+        status_code=status_code,
+        media_type="application/json"
+    )
@@ -0,0 +1,24 @@
+"""
+静态文件服务
+"""
+import os
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    前端构建产物静态文件服务
+    
+    Vite 构建输出到 assets/ 下的 JS/CSS 文件名包含内容哈希，内容变化即换名，
+    因此为其添加长期缓存头，浏览器在有效期内不再发起请求
+    """
+
+    ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if os.path.relpath(full_path, self.directory).startswith("assets" + os.sep):
+            response.headers["Cache-Control"] = self.ASSET_CACHE_CONTROL
+        return response
@@ -1,17 +1,18 @@
 """
 华为云服务器流量监控系统 - 主应用入口
 """
-from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
-import time
+from pathlib import Path
+import ssl
 
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.middleware import DBSessionMiddleware, TimingMiddleware
 from app.core.exceptions import (
     APIException,
     api_exception_handler,
@@ -20,11 +21,28 @@ from app.core.exceptions import (
 )
 from app.core.response import success_response
 from app.api.v1 import api_router
-from fastapi.staticfiles import StaticFiles
+from app.core.static import CachedStaticFiles
+from app.services.feishu.notification_service import shutdown_notify_pool
+from app.services.feishu.webhook_client import close_shared_session
+from app.services.huawei_cloud.flexusl_service import close_flexusl_session
 
 # 初始化日志
 logger = setup_logging()
 
+# 前端入口页面在启动时读入内存，根路径请求不再访问磁盘
+_INDEX_PATH = Path("static") / "index.html"
+_INDEX_BYTES = _INDEX_PATH.read_bytes() if _INDEX_PATH.is_file() else None
+
+# 前端未构建时根路径返回的服务信息，内容固定，只构建一次
+_ROOT_PAYLOAD = success_response(
+    data={
+        "name": settings.APP_NAME,
+        "version": settings.APP_VERSION,
+        "status": "running"
+    },
+    message="服务运行中"
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,8 +50,10 @@ async def lifespan(app: FastAPI):
     应用生命周期管理
     """
     # 启动时执行
-    logger.info(f"启动应用: {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"API 文档: http://{settings.API_HOST}:{settings.API_PORT}/docs")
+    logger.info("启动应用: {} v{}", settings.APP_NAME, settings.APP_VERSION)
+    logger.info("API 文档: http://{}:{}/docs", settings.API_HOST, settings.API_PORT)
+    # 华为云请求签名使用的 SHA-256 由该 OpenSSL 提供
+    logger.info("OpenSSL: {}", ssl.OPENSSL_VERSION)
     
     # 初始化监控调度器和任务
     try:
@@ -51,16 +71,14 @@ async def lifespan(app: FastAPI):
         try:
             stats = initialize_all_monitor_jobs(db)
             logger.info(
-                f"监控任务初始化完成: "
-                f"success={stats['success']}, "
-                f"skipped={stats['skipped']}, "
-                f"failed={stats['failed']}"
+                "监控任务初始化完成: success={}, skipped={}, failed={}",
+                stats['success'], stats['skipped'], stats['failed']
             )
         finally:
             db.close()
             
     except Exception as e:
-        logger.error(f"初始化监控调度器失败: {e}")
+        logger.error("初始化监控调度器失败: {}", e)
     
     yield
     
@@ -73,7 +91,17 @@ async def lifespan(app: FastAPI):
         shutdown_all_monitor_jobs()
         logger.info("监控调度器已关闭")
     except Exception as e:
-        logger.error(f"关闭监控调度器失败: {e}")
+        logger.error("关闭监控调度器失败: {}", e)
+    
+    # 等待后台通知发送完毕，再释放飞书通知的共享连接
+    shutdown_notify_pool()
+    close_shared_session()
+    
+    # 释放 Flexus L 查询的共享连接
+    close_flexusl_session()
+    
+    # 等待后台日志线程写完队列中的日志
+    await logger.complete()
 
 
 # 创建 FastAPI 应用
@@ -85,9 +113,25 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
+# 中间件
+# 后添加的位于外层、先执行，实际执行顺序：CORS → 请求日志 → GZip → 数据库会话 → 路由
+
+# 请求级数据库会话中间件
+app.add_middleware(DBSessionMiddleware)
+
+# GZip 压缩中间件
+# 小于 2KB 的响应（健康检查、单条记录等）压缩收益很小，不再压缩
+app.add_middleware(GZipMiddleware, minimum_size=2048)
+
+# 请求日志中间件
+# 位于 GZip 外层：计时包含压缩耗时
+app.add_middleware(TimingMiddleware)
+
 # CORS 中间件
+# 放在最外层：预检请求（OPTIONS）直接返回，不经过后续中间件
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -96,34 +140,6 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
-# GZip 压缩中间件
-app.add_middleware(GZipMiddleware, minimum_size=1000)
-
-
-# 请求日志中间件
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """记录请求日志"""
-    start_time = time.time()
-    
-    # 处理请求
-    response = await call_next(request)
-    
-    # 计算处理时间
-    process_time = time.time() - start_time
-    
-    # 记录日志
-    logger.info(
-        f"{request.method} {request.url.path} "
-        f"status_code={response.status_code} "
-        f"duration={process_time:.3f}s"
-    )
-    
-    # 添加响应头
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    return response
-
 
 # 异常处理器
 app.add_exception_handler(APIException, api_exception_handler)
@@ -135,23 +151,11 @@ app.add_exception_handler(Exception, general_exception_handler)
 @app.get("/", tags=["系统"])
 async def root():
     """根路径 — 若前端静态文件存在则返回 index.html，否则返回健康信息"""
-    index_path = "static/index.html"
-    try:
-        # 直接判断构建产物是否存在（避免依赖未声明的 settings.APP_ENV）
-        if __import__("os").path.exists(index_path):
-            return FileResponse(index_path, media_type="text/html")
-    except Exception:
-        # 回退到 JSON 响应
-        pass
+    if _INDEX_BYTES is not None:
+        # 入口页面每次向服务端确认，保证发布新版本后立即加载新的资源文件
+        return HTMLResponse(content=_INDEX_BYTES, headers={"Cache-Control": "no-cache"})
 
-    return success_response(
-        data={
-            "name": settings.APP_NAME,
-            "version": settings.APP_VERSION,
-            "status": "running"
-        },
-        message="服务运行中"
-    )
+    return _ROOT_PAYLOAD
 
 
 # 健康检查
@@ -168,26 +172,26 @@ async def health_check():
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 # 将静态文件挂载放在路由注册之后，避免拦截 API 的 POST/PUT 等非 GET 请求
 # 在挂载前确保 `static` 目录存在（开发时若不存在则自动创建），避免 RuntimeError
-import os
-from pathlib import Path
-
 static_dir = Path("static")
 if not static_dir.exists():
     try:
         # 在开发或本地运行时，自动创建以避免挂载失败
         static_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"静态目录不存在，已创建: {static_dir.resolve()}")
+        logger.info("静态目录不存在，已创建: {}", static_dir.resolve())
     except Exception as _e:
-        logger.warning(f"无法创建静态目录 {static_dir}: {_e}")
+        logger.warning("无法创建静态目录 {}: {}", static_dir, _e)
 
-app.mount("/", StaticFiles(directory=str(static_dir), html=True), name="static")
+app.mount("/", CachedStaticFiles(directory=str(static_dir), html=True), name="static")
 
 
 if __name__ == "__main__":
     import uvicorn
+    # uvloop / httptools 由 uvicorn[standard] 提供
     uvicorn.run(
         app,
         host=settings.API_HOST,
         port=settings.API_PORT,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     )
@@ -1,9 +1,8 @@
 """
 账户模型 - 存储华为云账户信息
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.core.database import Base
 
 
@@ -25,14 +24,20 @@ class Account(Base):
     is_enabled = Column(Boolean, default=True, comment="是否启用")
     description = Column(String(500), comment="账户描述")
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
 
     # 关系
-    servers = relationship("Server", back_populates="account", cascade="all, delete-orphan")
-    configs = relationship("Config", back_populates="account", cascade="all, delete-orphan")
-    monitor_logs = relationship("MonitorLog", back_populates="account")
-    shutdown_logs = relationship("ShutdownLog", back_populates="account")
+    # 集合关系禁止隐式懒加载（lazy="raise"），需要时在查询处显式 selectinload，
+    # 避免列表遍历时产生 N+1 查询；日志集合删除账户时不加载（passive_deletes）
+    servers = relationship(
+        "Server", back_populates="account", cascade="all, delete-orphan", lazy="raise"
+    )
+    configs = relationship(
+        "Config", back_populates="account", cascade="all, delete-orphan", lazy="raise"
+    )
+    monitor_logs = relationship("MonitorLog", back_populates="account", lazy="raise", passive_deletes=True)
+    shutdown_logs = relationship("ShutdownLog", back_populates="account", lazy="raise", passive_deletes=True)
 
     def __repr__(self):
         return f"<Account(id={self.id}, name='{self.name}', region='{self.region}')>"
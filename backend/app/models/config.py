@@ -1,15 +1,27 @@
 """
 配置模型 - 存储监控配置
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.core.database import Base
 
 
 class Config(Base):
     """监控配置模型"""
     __tablename__ = "configs"
+    __table_args__ = (
+        # 每个账户最多一条配置，同时作为按账户查询配置的索引
+        Index("uq_configs_account_id", "account_id", unique=True),
+        # 全局配置（account_id 为空）最多一条；普通唯一索引中 NULL 互不冲突，需单独约束。
+        # 表达式/部分索引无法通过反射检查是否存在，init_db 以 CREATE INDEX IF NOT EXISTS 补建
+        Index(
+            "uq_configs_global",
+            text("(account_id IS NULL)"),
+            unique=True,
+            sqlite_where=text("account_id IS NULL"),
+            postgresql_where=text("account_id IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True, comment="主键ID")
     account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=True, comment="关联账户ID（为空表示全局配置）")
@@ -27,8 +39,8 @@ class Config(Base):
     shutdown_delay = Column(Integer, default=0, comment="关机延迟（分钟）")
     retry_times = Column(Integer, default=3, comment="失败重试次数")
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
 
     # 关系
     account = relationship("Account", back_populates="configs")
@@ -1,15 +1,19 @@
 """
 监控日志模型 - 记录流量监控信息
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Index, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.core.database import Base
 
 
 class MonitorLog(Base):
     """监控日志模型"""
     __tablename__ = "monitor_logs"
+    __table_args__ = (
+        # 按服务器/账户查询最近的监控记录
+        Index("ix_monitor_logs_server_check", "server_id", "check_time"),
+        Index("ix_monitor_logs_account_check", "account_id", "check_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, comment="主键ID")
     account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False, comment="账户ID")
@@ -26,10 +30,10 @@ class MonitorLog(Base):
     is_below_threshold = Column(Boolean, default=False, comment="是否低于阈值")
     
     # 监控信息
-    check_time = Column(DateTime, default=datetime.utcnow, comment="检查时间")
+    check_time = Column(DateTime, default=func.now(), comment="检查时间")
     message = Column(String(500), comment="日志消息")
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
 
     # 关系
     account = relationship("Account", back_populates="monitor_logs")
@@ -37,3 +41,8 @@ class MonitorLog(Base):
 
     def __repr__(self):
         return f"<MonitorLog(id={self.id}, remaining={self.traffic_remaining}GB, below_threshold={self.is_below_threshold})>"
+
+
+# 批量写入监控日志使用的 INSERT 语句，模块加载时构建一次，
+# 编译结果由引擎的 compiled_cache 缓存复用
+MONITOR_LOG_INSERT = MonitorLog.__table__.insert()
@@ -1,14 +1,17 @@
 """
 通知日志模型 - 记录飞书通知发送记录
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, func
 from app.core.database import Base
 
 
 class NotificationLog(Base):
     """通知日志模型"""
     __tablename__ = "notification_logs"
+    __table_args__ = (
+        # 按通知类型、发送状态和时间筛选
+        Index("ix_notification_logs_type_status_created", "notification_type", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, comment="主键ID")
     
@@ -26,8 +29,8 @@ class NotificationLog(Base):
     # 重试信息
     retry_count = Column(Integer, default=0, comment="重试次数")
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
 
     def __repr__(self):
         return f"<NotificationLog(id={self.id}, type='{self.notification_type}', status='{self.status}')>"
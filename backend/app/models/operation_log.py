@@ -1,15 +1,20 @@
 """
 服务器操作日志模型 - 记录所有服务器操作（开机、关机、重启等）
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.core.database import Base
 
 
 class OperationLog(Base):
     """服务器操作日志模型"""
     __tablename__ = "operation_logs"
+    __table_args__ = (
+        # 按账户和时间范围查询操作记录
+        Index("ix_operation_logs_account_created", "account_id", "created_at"),
+    )
+    # 状态更新后 updated_at 随 UPDATE ... RETURNING 取回，提交后无需 refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True, comment="主键ID")
     account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False, comment="账户ID")
@@ -31,11 +36,11 @@ class OperationLog(Base):
     extra_data = Column(Text, comment="额外数据（JSON格式）")
     
     # 时间信息
-    start_time = Column(DateTime, default=datetime.utcnow, comment="操作开始时间")
+    start_time = Column(DateTime, default=func.now(), comment="操作开始时间")
     end_time = Column(DateTime, comment="操作结束时间")
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
 
     # 关系
     account = relationship("Account")
@@ -1,9 +1,8 @@
 """
 服务器模型 - 存储服务器信息
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.core.database import Base
 
 
@@ -24,13 +23,14 @@ class Server(Base):
     traffic_used = Column(Float, comment="已用流量（GB）")
     last_check_time = Column(DateTime, comment="最后检查时间")
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
 
     # 关系
     account = relationship("Account", back_populates="servers")
-    monitor_logs = relationship("MonitorLog", back_populates="server")
-    shutdown_logs = relationship("ShutdownLog", back_populates="server")
+    # 日志集合禁止隐式懒加载，需要时在查询处显式 selectinload
+    monitor_logs = relationship("MonitorLog", back_populates="server", lazy="raise", passive_deletes=True)
+    shutdown_logs = relationship("ShutdownLog", back_populates="server", lazy="raise", passive_deletes=True)
 
     def __repr__(self):
         return f"<Server(id={self.id}, name='{self.name}', server_id='{self.server_id}')>"
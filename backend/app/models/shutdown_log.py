@@ -1,15 +1,20 @@
 """
 关机日志模型 - 记录服务器关机操作
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.core.database import Base
 
 
 class ShutdownLog(Base):
     """关机日志模型"""
     __tablename__ = "shutdown_logs"
+    __table_args__ = (
+        # 按账户和时间范围查询关机记录
+        Index("ix_shutdown_logs_account_created", "account_id", "created_at"),
+    )
+    # 状态更新后 updated_at 随 UPDATE ... RETURNING 取回，提交后无需 refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True, comment="主键ID")
     account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False, comment="账户ID")
@@ -25,8 +30,8 @@ class ShutdownLog(Base):
     error_message = Column(Text, comment="错误信息")
     shutdown_time = Column(DateTime, comment="实际关机时间")
     
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间")
+    created_at = Column(DateTime, default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
 
     # 关系
     account = relationship("Account", back_populates="shutdown_logs")
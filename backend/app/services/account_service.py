@@ -3,13 +3,71 @@
 
 实现账户的 CRUD 操作、验证和加密存储
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import asyncio
+from functools import lru_cache
+from typing import Iterator, List, Optional
+from sqlalchemy import delete, insert, select, update, lambda_stmt
+from sqlalchemy.orm import Session, load_only
 from loguru import logger
 
+from app.core.concurrency import run_huawei_call
 from app.models.account import Account
+from app.models.monitor_log import MonitorLog
+from app.models.operation_log import OperationLog
+from app.models.shutdown_log import ShutdownLog
 from app.utils.encryption import encryption_service
+from app.services.config_service import forget_account_config
 from app.services.huawei_cloud import client_manager
+from app.services.huawei_cloud._http import create_session
+from app.services.huawei_cloud.flexusl_service import forget_account
+from app.services.huawei_cloud.iam_service import IAMService
+
+# 调用华为云 API 时需要的账户字段
+_CREDENTIAL_COLUMNS = (
+    Account.id,
+    Account.name,
+    Account.ak,
+    Account.sk,
+    Account.region,
+    Account.is_international,
+    Account.updated_at,
+)
+
+# 账户列表展示需要的字段（不含 AK/SK 密文）
+_SUMMARY_COLUMNS = (
+    Account.id,
+    Account.name,
+    Account.region,
+    Account.is_enabled,
+    Account.is_international,
+    Account.description,
+    Account.created_at,
+    Account.updated_at,
+)
+
+# 删除账户时需要显式删除的日志表（servers、configs 由 ORM 级联删除；
+# 日志表引用 servers，需在 ORM 删除服务器之前删除）
+_ACCOUNT_LOG_MODELS = (MonitorLog, ShutdownLog, OperationLog)
+
+# 单次列表查询返回数量上限，避免过大的 limit 一次性加载全部行
+MAX_LIMIT = 500
+
+
+@lru_cache(maxsize=256)
+def _decrypt_cached(encrypted_ak: str, encrypted_sk: str) -> tuple[str, str]:
+    """按密文缓存解密后的 AK/SK，密文不变时不再重复解密"""
+    return encryption_service.decrypt_ak_sk(encrypted_ak, encrypted_sk)
+
+
+encryption_service.register_reload_hook(_decrypt_cached.cache_clear)
+
+
+def _check_credentials(encrypted_ak: str, encrypted_sk: str) -> None:
+    """用账户凭证发起一次签名请求（IAM 项目列表），凭证无效时抛出异常"""
+    ak, sk = _decrypt_cached(encrypted_ak, encrypted_sk)
+    # 验证不常发生，会话用完即关闭，不保留连接
+    with create_session() as session:
+        IAMService(ak, sk, session=session).list_projects()
 
 
 class AccountService:
@@ -40,13 +98,13 @@ class AccountService:
         Returns:
             创建的账户
         """
-        logger.info(f"创建账户: name={name}, region={region}, is_international={is_international}")
+        logger.info("创建账户: name={}, region={}, is_international={}", name, region, is_international)
         
         # 加密 AK/SK
         encrypted_ak, encrypted_sk = encryption_service.encrypt_ak_sk(ak, sk)
         
-        # 创建账户
-        account = Account(
+        # INSERT ... RETURNING 直接取回新行（含 id 和默认值），无需提交后 refresh
+        stmt = insert(Account).values(
             name=name,
             ak=encrypted_ak,
             sk=encrypted_sk,
@@ -54,34 +112,39 @@ class AccountService:
             is_international=is_international,
             is_enabled=True,
             description=description
-        )
+        ).returning(Account)
         
-        db.add(account)
+        account = db.execute(stmt).scalar_one()
         db.commit()
-        db.refresh(account)
         
-        logger.info(f"账户创建成功: id={account.id}, name={name}")
+        logger.info("账户创建成功: id={}, name={}", account.id, name)
         
         return account
     
     @staticmethod
-    def get_account(db: Session, account_id: int) -> Optional[Account]:
+    def get_account(db: Session, account_id: int, full: bool = False) -> Optional[Account]:
         """
         获取账户
         
+        默认只加载调用华为云 API 所需的字段（名称、凭证、区域等），
+        其余字段在首次访问时才会加载
+        
         Args:
             db: 数据库会话
             account_id: 账户 ID
+            full: 是否加载全部字段（账户详情展示时使用）
             
         Returns:
             账户信息，不存在返回 None
         """
-        account = db.query(Account).filter(Account.id == account_id).first()
+        # Session.get 优先命中会话的 identity map，同一请求内重复获取不再查询数据库
+        options = None if full else [load_only(*_CREDENTIAL_COLUMNS)]
+        account = db.get(Account, account_id, options=options)
         
         if account:
-            logger.info(f"获取账户: id={account_id}, name={account.name}")
+            logger.info("获取账户: id={}, name={}", account_id, account.name)
         else:
-            logger.warning(f"账户不存在: id={account_id}")
+            logger.warning("账户不存在: id={}", account_id)
         
         return account
     
@@ -90,7 +153,9 @@ class AccountService:
         db: Session,
         is_enabled: Optional[bool] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        summary: bool = False
     ) -> List[Account]:
         """
         获取账户列表
@@ -99,23 +164,90 @@ class AccountService:
             db: 数据库会话
             is_enabled: 过滤启用状态（可选）
             limit: 返回数量限制
-            offset: 偏移量
+            offset: 偏移量（after_id 为空时使用，兼容旧的分页方式）
+            after_id: 上一页最后一条记录的 ID，指定时按 ID 游标分页
+            summary: 是否只加载列表展示字段（不加载 AK/SK 密文）
             
         Returns:
             账户列表
         """
-        query = db.query(Account)
+        limit = min(limit, MAX_LIMIT)
+        
+        # lambda_stmt 按 lambda 代码位置缓存语句结构，重复调用跳过 SQL 编译
+        stmt = lambda_stmt(lambda: select(Account))
+        
+        if summary:
+            stmt += lambda s: s.options(load_only(*_SUMMARY_COLUMNS))
         
         if is_enabled is not None:
-            query = query.filter(Account.is_enabled == is_enabled)
+            stmt += lambda s: s.where(Account.is_enabled == is_enabled)
         
-        query = query.limit(limit).offset(offset)
-        accounts = query.all()
+        if after_id is not None:
+            # 游标分页：走主键索引直接定位，不再扫描并丢弃前 offset 行
+            stmt += lambda s: s.where(Account.id > after_id)
+        elif offset:
+            stmt += lambda s: s.offset(offset)
         
-        logger.info(f"查询账户列表: count={len(accounts)}, is_enabled={is_enabled}")
+        stmt += lambda s: s.order_by(Account.id).limit(limit)
+        accounts = list(db.execute(stmt).scalars())
+        
+        logger.info("查询账户列表: count={}, is_enabled={}", len(accounts), is_enabled)
         
         return accounts
     
+    @staticmethod
+    def _update_fields(db: Session, account_id: int, values: dict) -> Optional[Account]:
+        """
+        用单条 UPDATE ... RETURNING 更新账户字段
+        
+        更新后的整行随 UPDATE 一并返回，省去先查询、提交后再 refresh 的往返
+        
+        Args:
+            db: 数据库会话
+            account_id: 账户 ID
+            values: 要更新的字段
+            
+        Returns:
+            更新后的账户，不存在返回 None
+        """
+        if not values:
+            return db.get(Account, account_id)
+        
+        stmt = (
+            update(Account)
+            .where(Account.id == account_id)
+            .values(**values)
+            .returning(Account)
+        )
+        account = db.execute(stmt).scalar_one_or_none()
+        db.commit()
+        
+        return account
+    
+    @staticmethod
+    def iter_accounts(
+        db: Session,
+        is_enabled: Optional[bool] = None
+    ) -> Iterator[Account]:
+        """
+        逐批遍历全部账户
+        
+        按 100 行一批从游标读取，内存占用与账户总数无关
+        
+        Args:
+            db: 数据库会话
+            is_enabled: 过滤启用状态（可选）
+            
+        Yields:
+            账户
+        """
+        stmt = select(Account).order_by(Account.id)
+        
+        if is_enabled is not None:
+            stmt = stmt.where(Account.is_enabled == is_enabled)
+        
+        yield from db.execute(stmt.execution_options(yield_per=100)).scalars()
+    
     @staticmethod
     def update_account(
         db: Session,
@@ -143,40 +275,41 @@ class AccountService:
         Returns:
             更新后的账户，不存在返回 None
         """
-        account = db.query(Account).filter(Account.id == account_id).first()
-        
-        if not account:
-            logger.warning(f"账户不存在: id={account_id}")
-            return None
+        # 只收集实际变更的字段，用一条 UPDATE 完成更新，不再先查询再修改
+        values = {}
         
-        # 更新字段
         if name is not None:
-            account.name = name
+            values['name'] = name
         
         if ak is not None and sk is not None:
             # 重新加密 AK/SK
-            encrypted_ak, encrypted_sk = encryption_service.encrypt_ak_sk(ak, sk)
-            account.ak = encrypted_ak
-            account.sk = encrypted_sk
-            
-            # 清除客户端缓存
-            client_manager.remove_client(account_id)
+            values['ak'], values['sk'] = encryption_service.encrypt_ak_sk(ak, sk)
         
         if region is not None:
-            account.region = region
-            # 清除客户端缓存
-            client_manager.remove_client(account_id)
+            values['region'] = region
         
         if is_international is not None:
-            account.is_international = is_international
+            values['is_international'] = is_international
         
         if description is not None:
-            account.description = description
+            values['description'] = description
         
-        db.commit()
-        db.refresh(account)
+        account = AccountService._update_fields(db, account_id, values)
         
-        logger.info(f"账户更新成功: id={account_id}")
+        if not account:
+            logger.warning("账户不存在: id={}", account_id)
+            return None
+        
+        if 'ak' in values:
+            # 凭证变化，丢弃旧凭证的解密缓存和 domain_id 缓存
+            _decrypt_cached.cache_clear()
+            forget_account(account_id)
+        
+        if 'ak' in values or 'region' in values:
+            # 凭证或区域变化，清除客户端缓存
+            client_manager.remove_client(account_id)
+        
+        logger.info("账户更新成功: id={}", account_id)
         
         return account
     
@@ -192,19 +325,26 @@ class AccountService:
         Returns:
             是否删除成功
         """
-        account = db.query(Account).filter(Account.id == account_id).first()
+        account = db.get(Account, account_id)
         
         if not account:
-            logger.warning(f"账户不存在: id={account_id}")
+            logger.warning("账户不存在: id={}", account_id)
             return False
         
-        # 清除客户端缓存
-        client_manager.remove_client(account_id)
-        
+        # 日志集合声明了 passive_deletes，ORM 不会加载和删除日志行；SQLite 未开启外键约束时
+        # ON DELETE CASCADE 不生效，这里显式删除日志记录，避免留下孤儿行
+        for model in _ACCOUNT_LOG_MODELS:
+            db.execute(delete(model).where(model.account_id == account_id))
         db.delete(account)
         db.commit()
         
-        logger.info(f"账户删除成功: id={account_id}, name={account.name}")
+        # 提交成功后再清除客户端、凭证解密和有效配置缓存，提交失败时缓存仍与数据库一致
+        client_manager.remove_client(account_id)
+        _decrypt_cached.cache_clear()
+        forget_account(account_id)
+        forget_account_config(account_id)
+        
+        logger.info("账户删除成功: id={}, name={}", account_id, account.name)
         
         return True
     
@@ -220,17 +360,13 @@ class AccountService:
         Returns:
             更新后的账户，不存在返回 None
         """
-        account = db.query(Account).filter(Account.id == account_id).first()
+        account = AccountService._update_fields(db, account_id, {'is_enabled': True})
         
         if not account:
-            logger.warning(f"账户不存在: id={account_id}")
+            logger.warning("账户不存在: id={}", account_id)
             return None
         
-        account.is_enabled = True
-        db.commit()
-        db.refresh(account)
-        
-        logger.info(f"账户已启用: id={account_id}, name={account.name}")
+        logger.info("账户已启用: id={}, name={}", account_id, account.name)
         
         return account
     
@@ -246,32 +382,29 @@ class AccountService:
         Returns:
             更新后的账户，不存在返回 None
         """
-        account = db.query(Account).filter(Account.id == account_id).first()
+        account = AccountService._update_fields(db, account_id, {'is_enabled': False})
         
         if not account:
-            logger.warning(f"账户不存在: id={account_id}")
+            logger.warning("账户不存在: id={}", account_id)
             return None
         
-        account.is_enabled = False
-        
         # 清除客户端缓存
         client_manager.remove_client(account_id)
         
-        db.commit()
-        db.refresh(account)
-        
-        logger.info(f"账户已禁用: id={account_id}, name={account.name}")
+        logger.info("账户已禁用: id={}, name={}", account_id, account.name)
         
         return account
     
     @staticmethod
-    def verify_account(
+    async def verify_account(
         db: Session,
         account_id: int
     ) -> tuple[bool, str]:
         """
         验证账户（测试 AK/SK 是否有效）
         
+        在线程池中用账户凭证发起一次签名请求（IAM 项目列表），与批量验证一致
+        
         Args:
             db: 数据库会话
             account_id: 账户 ID
@@ -279,32 +412,65 @@ class AccountService:
         Returns:
             (是否验证成功, 验证消息)
         """
-        logger.info(f"验证账户: id={account_id}")
+        logger.info("验证账户: id={}", account_id)
         
-        account = db.query(Account).filter(Account.id == account_id).first()
+        account = db.get(Account, account_id)
         
         if not account:
             return False, "账户不存在"
         
         try:
-            # 获取华为云客户端
-            client = client_manager.get_client(
-                account_id=account.id,
-                encrypted_ak=account.ak,
-                encrypted_sk=account.sk,
-                region=account.region
-            )
-            
-            # 尝试调用一个简单的 API 验证凭证
-            # 这里可以调用列表服务器等接口
-            logger.info(f"账户验证成功: id={account_id}")
+            await run_huawei_call(_check_credentials, account.ak, account.sk)
+            logger.info("账户验证成功: id={}", account_id)
             
             return True, "账户验证成功"
             
         except Exception as e:
-            logger.error(f"账户验证失败: id={account_id}, error={e}")
+            logger.error("账户验证失败: id={}, error={}", account_id, e)
             return False, f"账户验证失败: {str(e)}"
     
+    @staticmethod
+    async def verify_accounts_bulk(
+        db: Session,
+        account_ids: List[int]
+    ) -> dict[int, tuple[bool, str]]:
+        """
+        批量验证账户
+        
+        一次查询取出所有账户，再在线程池中并发对每个账户发起一次签名请求
+        （IAM 项目列表），总耗时接近最慢的一个账户而不是所有账户之和
+        
+        Args:
+            db: 数据库会话
+            account_ids: 账户 ID 列表
+            
+        Returns:
+            账户 ID -> (是否验证成功, 验证消息)
+        """
+        logger.info("批量验证账户: count={}", len(account_ids))
+        
+        accounts = db.execute(select(Account).where(Account.id.in_(account_ids))).scalars().all()
+        results: dict[int, tuple[bool, str]] = {
+            account_id: (False, "账户不存在") for account_id in account_ids
+        }
+        
+        outcomes = await asyncio.gather(
+            *(
+                run_huawei_call(_check_credentials, account.ak, account.sk)
+                for account in accounts
+            ),
+            return_exceptions=True
+        )
+        
+        for account, outcome in zip(accounts, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("账户验证失败: id={}, error={}", account.id, outcome)
+                results[account.id] = (False, f"账户验证失败: {str(outcome)}")
+            else:
+                results[account.id] = (True, "账户验证成功")
+        
+        return results
+    
     @staticmethod
     def get_decrypted_credentials(
         db: Session,
@@ -320,16 +486,16 @@ class AccountService:
         Returns:
             (ak, sk) 元组，账户不存在返回 None
         """
-        account = db.query(Account).filter(Account.id == account_id).first()
+        account = db.get(Account, account_id)
         
         if not account:
             return None
         
         try:
-            ak, sk = encryption_service.decrypt_ak_sk(account.ak, account.sk)
+            ak, sk = _decrypt_cached(account.ak, account.sk)
             return ak, sk
         except Exception as e:
-            logger.error(f"解密凭证失败: account_id={account_id}, error={e}")
+            logger.error("解密凭证失败: account_id={}, error={}", account_id, e)
             return None
 
 
@@ -1,19 +1,54 @@
 """
 配置管理服务
 """
+import threading
+import time
+from functools import lru_cache
 from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, or_, select, update, lambda_stmt
+from sqlalchemy.exc import IntegrityError
+from loguru import logger
 
 from app.models.config import Config
 from app.utils.encryption import encryption_service
 
+# 有效配置缓存：account_id -> (过期时间, Config 或 None)
+# 监控任务每个周期都会读取有效配置，短 TTL 缓存可省去重复查询；配置变更时整体清空
+_EFFECTIVE_CACHE_TTL = 30.0
+_effective_cache: dict[Optional[int], tuple[float, Optional[Config]]] = {}
+_effective_cache_lock = threading.Lock()
+
+# 单次列表查询返回数量上限
+MAX_LIMIT = 500
+
+
+def _clear_effective_cache() -> None:
+    """清空有效配置缓存"""
+    with _effective_cache_lock:
+        _effective_cache.clear()
+
+
+def forget_account_config(account_id: int) -> None:
+    """清除账户的有效配置缓存（账户删除时调用）"""
+    with _effective_cache_lock:
+        _effective_cache.pop(account_id, None)
+
+
+@lru_cache(maxsize=64)
+def _decrypt_webhook_cached(encrypted_url: str) -> str:
+    """按密文缓存解密后的 Webhook URL"""
+    return encryption_service.decrypt(encrypted_url)
+
+
+encryption_service.register_reload_hook(_decrypt_webhook_cached.cache_clear)
+
 
 class ConfigService:
     """配置管理服务"""
     
+    @staticmethod
     def get_config(
-        self,
         db: Session,
         config_id: int
     ) -> Optional[Config]:
@@ -27,9 +62,10 @@ class ConfigService:
         Returns:
             Config 对象或 None
         """
-        return db.query(Config).filter(Config.id == config_id).first()
+        return db.get(Config, config_id)
     
-    def get_global_config(self, db: Session) -> Optional[Config]:
+    @staticmethod
+    def get_global_config(db: Session) -> Optional[Config]:
         """
         获取全局配置（account_id 为 NULL）
         
@@ -39,10 +75,12 @@ class ConfigService:
         Returns:
             Config 对象或 None
         """
-        return db.query(Config).filter(Config.account_id.is_(None)).first()
+        # lambda_stmt 按 lambda 代码位置缓存语句结构，重复调用跳过 SQL 编译
+        stmt = lambda_stmt(lambda: select(Config).where(Config.account_id.is_(None)).limit(1))
+        return db.execute(stmt).scalars().first()
     
+    @staticmethod
     def get_account_config(
-        self,
         db: Session,
         account_id: int
     ) -> Optional[Config]:
@@ -56,14 +94,16 @@ class ConfigService:
         Returns:
             Config 对象或 None
         """
-        return db.query(Config).filter(Config.account_id == account_id).first()
+        stmt = lambda_stmt(lambda: select(Config).where(Config.account_id == account_id).limit(1))
+        return db.execute(stmt).scalars().first()
     
+    @staticmethod
     def list_configs(
-        self,
         db: Session,
         account_id: Optional[int] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        after_id: Optional[int] = None
     ) -> list[Config]:
         """
         获取配置列表
@@ -72,20 +112,30 @@ class ConfigService:
             db: 数据库会话
             account_id: 过滤账户 ID（可选）
             limit: 返回数量限制
-            offset: 偏移量
+            offset: 偏移量（after_id 为空时使用，兼容旧的分页方式）
+            after_id: 上一页最后一条记录的 ID，指定时按 ID 游标分页
             
         Returns:
             Config 列表
         """
-        query = db.query(Config)
+        limit = min(limit, MAX_LIMIT)
+        
+        stmt = lambda_stmt(lambda: select(Config))
         
         if account_id is not None:
-            query = query.filter(Config.account_id == account_id)
+            stmt += lambda s: s.where(Config.account_id == account_id)
+        
+        if after_id is not None:
+            # 游标分页：走主键索引直接定位，不再扫描并丢弃前 offset 行
+            stmt += lambda s: s.where(Config.id > after_id)
+        elif offset:
+            stmt += lambda s: s.offset(offset)
         
-        return query.offset(offset).limit(limit).all()
+        stmt += lambda s: s.order_by(Config.id).limit(limit)
+        return list(db.execute(stmt).scalars())
     
+    @staticmethod
     def create_config(
-        self,
         db: Session,
         account_id: Optional[int] = None,
         check_interval: int = 5,
@@ -116,21 +166,13 @@ class ConfigService:
         Raises:
             ValueError: 如果配置已存在
         """
-        # 检查是否已存在配置
-        if account_id is None:
-            existing = self.get_global_config(db)
-        else:
-            existing = self.get_account_config(db, account_id)
-        
-        if existing:
-            raise ValueError(f"配置已存在: {'全局配置' if account_id is None else f'账户 {account_id} 的配置'}")
-        
         # 加密飞书 Webhook URL
         encrypted_webhook = None
         if feishu_webhook_url:
             encrypted_webhook = encryption_service.encrypt(feishu_webhook_url)
         
-        config = Config(
+        # 重复配置由唯一索引拦截，INSERT ... RETURNING 直接取回新行，无需预查询和 refresh
+        stmt = insert(Config).values(
             account_id=account_id,
             check_interval=check_interval,
             traffic_threshold=traffic_threshold,
@@ -139,11 +181,16 @@ class ConfigService:
             notification_enabled=notification_enabled,
             shutdown_delay=shutdown_delay,
             retry_times=retry_times
-        )
+        ).returning(Config)
         
-        db.add(config)
-        db.commit()
-        db.refresh(config)
+        try:
+            config = db.execute(stmt).scalar_one()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise ValueError(f"配置已存在: {'全局配置' if account_id is None else f'账户 {account_id} 的配置'}") from e
+        
+        _clear_effective_cache()
 
         # 配置创建后，重新调度相关的监控任务
         try:
@@ -151,13 +198,12 @@ class ConfigService:
             reschedule_monitor_job_for_config(db, config.id)
         except Exception as e:
             # 记录错误但不影响配置创建
-            import logging
-            logging.getLogger(__name__).error(f"重新调度监控任务失败: config_id={config.id}, error={e}")
+            logger.error("重新调度监控任务失败: config_id={}, error={}", config.id, e)
 
         return config
     
+    @staticmethod
     def update_config(
-        self,
         db: Session,
         config_id: int,
         check_interval: Optional[int] = None,
@@ -185,29 +231,40 @@ class ConfigService:
         Returns:
             更新后的 Config 对象或 None
         """
-        config = self.get_config(db, config_id)
-        
-        if not config:
-            return None
-        
-        # 更新字段
+        # 只收集实际变更的字段，用一条 UPDATE ... RETURNING 完成更新并取回整行
+        values = {}
         if check_interval is not None:
-            config.check_interval = check_interval
+            values['check_interval'] = check_interval
         if traffic_threshold is not None:
-            config.traffic_threshold = traffic_threshold
+            values['traffic_threshold'] = traffic_threshold
         if auto_shutdown_enabled is not None:
-            config.auto_shutdown_enabled = auto_shutdown_enabled
+            values['auto_shutdown_enabled'] = auto_shutdown_enabled
         if feishu_webhook_url is not None:
-            config.feishu_webhook_url = encryption_service.encrypt(feishu_webhook_url)
+            values['feishu_webhook_url'] = encryption_service.encrypt(feishu_webhook_url)
         if notification_enabled is not None:
-            config.notification_enabled = notification_enabled
+            values['notification_enabled'] = notification_enabled
         if shutdown_delay is not None:
-            config.shutdown_delay = shutdown_delay
+            values['shutdown_delay'] = shutdown_delay
         if retry_times is not None:
-            config.retry_times = retry_times
+            values['retry_times'] = retry_times
 
-        db.commit()
-        db.refresh(config)
+        if values:
+            stmt = (
+                update(Config)
+                .where(Config.id == config_id)
+                .values(**values)
+                .returning(Config)
+            )
+            config = db.execute(stmt).scalar_one_or_none()
+            db.commit()
+            _clear_effective_cache()
+            if 'feishu_webhook_url' in values:
+                _decrypt_webhook_cached.cache_clear()
+        else:
+            config = ConfigService.get_config(db, config_id)
+
+        if not config:
+            return None
 
         # 配置更新后，重新调度相关的监控任务
         try:
@@ -215,12 +272,12 @@ class ConfigService:
             reschedule_monitor_job_for_config(db, config_id)
         except Exception as e:
             # 记录错误但不影响配置更新
-            import logging
-            logging.getLogger(__name__).error(f"重新调度监控任务失败: config_id={config_id}, error={e}")
+            logger.error("重新调度监控任务失败: config_id={}, error={}", config_id, e)
 
         return config
     
-    def delete_config(self, db: Session, config_id: int) -> bool:
+    @staticmethod
+    def delete_config(db: Session, config_id: int) -> bool:
         """
         删除配置
         
@@ -231,18 +288,20 @@ class ConfigService:
         Returns:
             是否成功删除
         """
-        config = self.get_config(db, config_id)
+        config = ConfigService.get_config(db, config_id)
         
         if not config:
             return False
         
         db.delete(config)
         db.commit()
+        _clear_effective_cache()
+        _decrypt_webhook_cached.cache_clear()
         
         return True
     
+    @staticmethod
     def get_effective_config(
-        self,
         db: Session,
         account_id: Optional[int] = None
     ) -> Optional[Config]:
@@ -256,16 +315,63 @@ class ConfigService:
         Returns:
             有效的 Config 对象或 None
         """
-        # 如果指定了账户 ID，先查找账户配置
-        if account_id is not None:
-            account_config = self.get_account_config(db, account_id)
-            if account_config:
-                return account_config
+        now = time.monotonic()
+        with _effective_cache_lock:
+            cached = _effective_cache.get(account_id)
+        
+        if cached is not None and cached[0] > now:
+            config = cached[1]
+            # 缓存对象可能属于其他会话，合并到当前会话（load=False 不查询数据库）
+            return db.merge(config, load=False) if config is not None else None
+        
+        if account_id is None:
+            config = ConfigService.get_global_config(db)
+        else:
+            # 一次查询同时取账户配置和全局配置，账户配置排在前面（IS NULL 为假时排序值为 0）
+            stmt = lambda_stmt(
+                lambda: select(Config)
+                .where(or_(Config.account_id == account_id, Config.account_id.is_(None)))
+                .order_by(Config.account_id.is_(None))
+                .limit(1)
+            )
+            config = db.execute(stmt).scalars().first()
+        
+        with _effective_cache_lock:
+            _effective_cache[account_id] = (now + _EFFECTIVE_CACHE_TTL, config)
+        
+        return config
+    
+    @staticmethod
+    def list_effective_configs(
+        db: Session,
+        account_ids: list[int]
+    ) -> dict[int, Optional[Config]]:
+        """
+        批量获取多个账户的有效配置
+        
+        一次查询取出这些账户的配置和全局配置，再逐个账户按优先级解析，
+        避免遍历账户时每个账户单独查询
+        
+        Args:
+            db: 数据库会话
+            account_ids: 账户 ID 列表
+            
+        Returns:
+            账户 ID -> 有效 Config 对象（没有可用配置时为 None）
+        """
+        if not account_ids:
+            return {}
+        
+        stmt = select(Config).where(
+            or_(Config.account_id.in_(account_ids), Config.account_id.is_(None))
+        )
+        by_account = {config.account_id: config for config in db.execute(stmt).scalars()}
+        global_config = by_account.pop(None, None)
         
-        # 使用全局配置
-        return self.get_global_config(db)
+        return {aid: by_account.get(aid, global_config) for aid in account_ids}
     
-    def get_decrypted_webhook_url(self, config: Config) -> Optional[str]:
+    @staticmethod
+    def get_decrypted_webhook_url(config: Config) -> Optional[str]:
         """
         获取解密后的飞书 Webhook URL
         
@@ -279,7 +385,7 @@ class ConfigService:
             return None
         
         try:
-            return encryption_service.decrypt(config.feishu_webhook_url)
+            return _decrypt_webhook_cached(config.feishu_webhook_url)
         except Exception:
             return None
 
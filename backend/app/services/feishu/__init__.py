@@ -12,7 +12,8 @@ from app.services.feishu.notification_service import (
     TrafficWarningTemplate,
     ShutdownNotificationTemplate,
     ShutdownSuccessTemplate,
-    ShutdownFailureTemplate
+    ShutdownFailureTemplate,
+    BatchShutdownTemplate
 )
 
 __all__ = [
@@ -25,4 +26,5 @@ __all__ = [
     'ShutdownNotificationTemplate',
     'ShutdownSuccessTemplate',
     'ShutdownFailureTemplate',
+    'BatchShutdownTemplate',
 ]
@@ -3,11 +3,185 @@
 
 实现关机通知、流量告警等通知模板和发送功能
 """
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from time import localtime, monotonic, strftime, time
 from loguru import logger
 from app.services.feishu.webhook_client import FeishuWebhookClient
 
+# 通知中的时间格式；time.strftime 直接格式化本地时间，不构造 datetime 对象
+_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 后台发送通知的线程池，所有通知服务实例共用，首次提交时创建
+_NOTIFY_POOL_WORKERS = 8
+_notify_pool: Optional[ThreadPoolExecutor] = None
+_notify_pool_lock = threading.Lock()
+
+# 重复告警抑制：同一 Webhook、同一账户、使用率相同（取整）的告警在窗口内只发送一次。
+# 监控任务每个周期都会新建通知服务，因此记录放在模块级共享
+_DEDUPE_TTL = 600.0
+_DEDUPE_TEMPLATES = frozenset({'traffic_warning'})
+# 值为 (发送时间, 发送结果)；发送中的占位记录结果为 None
+_sent_alerts: Dict[Tuple[str, str, Any, int], Tuple[float, Optional[Dict[str, Any]]]] = {}
+_sent_alerts_lock = threading.Lock()
+
+# 流量告警级别：(使用率下限, 颜色, 级别)，按使用率从高到低排列
+_WARNING_LEVELS = (
+    (90, "red", "🔴 严重告警"),
+    (80, "orange", "🟠 高级告警"),
+    (70, "yellow", "🟡 中级告警"),
+)
+_DEFAULT_WARNING_LEVEL = ("blue", "🔵 提醒")
+
+# 批量关机通知每张卡片最多包含的服务器数量
+_BATCH_SIZE = 20
+
+# 关机通知中最多列出的服务器数量
+_MAX_LISTED_SERVERS = 10
+
+# 卡片中固定不变的部分在模块加载时构建，各次渲染共用同一对象
+# （渲染结果只用于序列化发送，不会被修改）
+_CARD_CONFIG = {"wide_screen_mode": True}
+
+# 单台服务器实例信息段落的开头
+_SERVER_DETAILS_HEADER = "\n\n---\n\n**实例信息**:\n• **%s** (%s)\n"
+
+
+def _get_notify_pool() -> ThreadPoolExecutor:
+    """获取后台通知线程池（首次使用时创建）"""
+    global _notify_pool
+    if _notify_pool is None:
+        with _notify_pool_lock:
+            if _notify_pool is None:
+                _notify_pool = ThreadPoolExecutor(
+                    max_workers=_NOTIFY_POOL_WORKERS,
+                    thread_name_prefix="feishu-notify"
+                )
+    return _notify_pool
+
+
+def shutdown_notify_pool() -> None:
+    """等待已提交的通知发送完毕并关闭线程池（应用关闭时调用）"""
+    global _notify_pool
+    with _notify_pool_lock:
+        if _notify_pool is not None:
+            _notify_pool.shutdown(wait=True)
+            _notify_pool = None
+
+
+@lru_cache(maxsize=32)
+def _card_header(title: str, color: str) -> Dict[str, Any]:
+    """按标题和颜色缓存卡片标题栏"""
+    return {
+        "title": {
+            "tag": "plain_text",
+            "content": title
+        },
+        "template": color
+    }
+
+
+def _build_card(title: str, color: str, content: str) -> Dict[str, Any]:
+    """
+    构建单段 Markdown 内容的卡片，只有正文需要每次新建
+    
+    Args:
+        title: 卡片标题
+        color: 标题颜色
+        content: 卡片正文（lark_md）
+        
+    Returns:
+        卡片配置
+    """
+    return {
+        "config": _CARD_CONFIG,
+        "header": _card_header(title, color),
+        "elements": [
+            {
+                "tag": "div",
+                "text": {
+                    "tag": "lark_md",
+                    "content": content
+                }
+            }
+        ]
+    }
+
+
+def _format_server_details(server: Optional[Dict[str, Any]]) -> str:
+    """
+    格式化单台服务器的实例信息段落（关机成功/失败通知共用）
+    
+    Args:
+        server: 服务器信息 {"name", "ip", "remaining", "threshold"}，可为 None
+        
+    Returns:
+        实例信息文本，未传入服务器时为空字符串
+    """
+    if not server:
+        return ""
+    
+    details = _SERVER_DETAILS_HEADER % (server.get("name", "未命名"), server.get("ip", "N/A"))
+    remaining = server.get("remaining")
+    if remaining is not None:
+        details += "• 剩余流量: %.2f GB\n" % float(remaining)
+    threshold = server.get("threshold")
+    if threshold is not None:
+        details += "• 阈值: %.2f GB\n" % float(threshold)
+    return details
+
+
+def _build_elements_card(title: str, color: str, elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    构建由多个元素组成的卡片
+    
+    Args:
+        title: 卡片标题
+        color: 标题颜色
+        elements: 卡片元素列表
+        
+    Returns:
+        卡片配置
+    """
+    return {
+        "config": _CARD_CONFIG,
+        "header": _card_header(title, color),
+        "elements": elements
+    }
+
+
+def _lark_md_column(content: str) -> Dict[str, Any]:
+    """构建等宽分栏中的一列"""
+    return {
+        "tag": "column",
+        "width": "weighted",
+        "weight": 1,
+        "vertical_align": "top",
+        "elements": [{"tag": "div", "text": {"tag": "lark_md", "content": content}}]
+    }
+
+
+def _format_batch_server(item: Dict[str, Any]) -> str:
+    """批量关机通知中单台服务器的名称、IP 和流量"""
+    text = "**%s** (%s)" % (item.get("name", "未命名"), item.get("ip", "N/A"))
+    remaining = item.get("remaining")
+    if remaining is not None:
+        text += "\n剩余流量: %.2f GB" % float(remaining)
+    threshold = item.get("threshold")
+    if threshold is not None:
+        text += "\n阈值: %.2f GB" % float(threshold)
+    return text
+
+
+def _format_batch_result(item: Dict[str, Any]) -> str:
+    """批量关机通知中单台服务器的关机结果"""
+    if item.get("success"):
+        return "✅ 已关机\n任务 ID: `%s`" % (item.get("job_id") or "N/A")
+    return "❌ 关机失败\n%s" % (item.get("error_message") or "未知错误")
+
 
 class NotificationTemplate:
     """通知模板基类"""
@@ -28,6 +202,22 @@ class NotificationTemplate:
 class TrafficWarningTemplate(NotificationTemplate):
     """流量告警通知模板"""
     
+    # 正文格式串只在导入时解析一次，渲染时用 % 一次性填充
+    _CONTENT = """**告警级别**: %(level)s
+**账户名称**: %(account_name)s
+**所属区域**: %(region)s
+**服务器数量**: %(server_count)s 台
+
+---
+
+**剩余流量**: %(remaining_traffic_gb).2f GB
+**流量阈值**: %(threshold_gb).2f GB
+**使用百分比**: %(usage_percentage).1f%%
+
+---
+
+**告警时间**: %(timestamp)s"""
+    
     def render(
         self,
         account_name: str,
@@ -36,6 +226,7 @@ class TrafficWarningTemplate(NotificationTemplate):
         usage_percentage: float,
         server_count: int = 0,
         region: str = "",
+        timestamp: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -48,73 +239,62 @@ class TrafficWarningTemplate(NotificationTemplate):
             usage_percentage: 使用百分比
             server_count: 服务器数量
             region: 区域
+            timestamp: 显示的时间（默认当前时间）
             
         Returns:
             卡片配置
         """
-        # 根据使用率确定颜色
-        if usage_percentage >= 90:
-            color = "red"
-            level = "🔴 严重告警"
-        elif usage_percentage >= 80:
-            color = "orange"
-            level = "🟠 高级告警"
-        elif usage_percentage >= 70:
-            color = "yellow"
-            level = "🟡 中级告警"
+        # 根据使用率确定颜色（按阈值从高到低匹配）
+        for min_percentage, color, level in _WARNING_LEVELS:
+            if usage_percentage >= min_percentage:
+                break
         else:
-            color = "blue"
-            level = "🔵 提醒"
+            color, level = _DEFAULT_WARNING_LEVEL
         
         # 构建内容
-        content = f"""**告警级别**: {level}
-**账户名称**: {account_name}
-**所属区域**: {region or '未知'}
-**服务器数量**: {server_count} 台
+        content = self._CONTENT % {
+            "level": level,
+            "account_name": account_name,
+            "region": region or '未知',
+            "server_count": server_count,
+            "remaining_traffic_gb": remaining_traffic_gb,
+            "threshold_gb": threshold_gb,
+            "usage_percentage": usage_percentage,
+            "timestamp": timestamp or strftime(_TIME_FORMAT),
+        }
+        
+        return _build_card("⚠️ 流量使用告警", color, content)
 
----
 
-**剩余流量**: {remaining_traffic_gb:.2f} GB
-**流量阈值**: {threshold_gb:.2f} GB
-**使用百分比**: {usage_percentage:.1f}%
+class ShutdownNotificationTemplate(NotificationTemplate):
+    """关机通知模板"""
+    
+    _CONTENT = """**账户名称**: %(account_name)s
+**所属区域**: %(region)s
+**关机原因**: %(reason)s
+**服务器数量**: %(total_count)s 台
 
 ---
 
-**告警时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"""
-        
-        return {
-            "config": {
-                "wide_screen_mode": True
-            },
-            "header": {
-                "title": {
-                    "tag": "plain_text",
-                    "content": "⚠️ 流量使用告警"
-                },
-                "template": color
-            },
-            "elements": [
-                {
-                    "tag": "div",
-                    "text": {
-                        "tag": "lark_md",
-                        "content": content
-                    }
-                }
-            ]
-        }
+**关机服务器列表**:
+%(server_info)s
 
+---
 
-class ShutdownNotificationTemplate(NotificationTemplate):
-    """关机通知模板"""
+**任务 ID**: `%(job_id)s`
+**操作时间**: %(timestamp)s
+
+ℹ️ 系统已自动关闭上述服务器以节省流量"""
     
     def render(
         self,
         account_name: str,
-        server_list: List[Dict[str, str]],
+        server_list: Iterable[Dict[str, str]],
         reason: str = "流量不足",
         job_id: str = "",
         region: str = "",
+        total_count: Optional[int] = None,
+        timestamp: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -122,67 +302,54 @@ class ShutdownNotificationTemplate(NotificationTemplate):
         
         Args:
             account_name: 账户名称
-            server_list: 服务器列表 [{"name": "服务器名", "id": "服务器ID", "ip": "IP地址"}, ...]
+            server_list: 服务器列表 [{"name": "服务器名", "id": "服务器ID", "ip": "IP地址"}, ...]，
+                只读取前 10 台，传入生成器时需同时提供 total_count
             reason: 关机原因
             job_id: 任务 ID
             region: 区域
+            total_count: 服务器总数（不提供时取 len(server_list)）
+            timestamp: 显示的时间（默认当前时间）
             
         Returns:
             卡片配置
         """
-        # 构建服务器列表
-        server_info = "\n".join([
+        if total_count is None:
+            total_count = len(server_list)
+        
+        # 构建服务器列表（最多显示 10 台，不复制原列表）
+        server_info = "\n".join(
             f"• **{server.get('name', '未命名')}** ({server.get('id', 'N/A')})"
-            for server in server_list[:10]  # 最多显示 10 台
-        ])
+            for server in islice(server_list, _MAX_LISTED_SERVERS)
+        )
         
-        if len(server_list) > 10:
-            server_info += f"\n... 还有 {len(server_list) - 10} 台服务器"
+        if total_count > _MAX_LISTED_SERVERS:
+            server_info += f"\n... 还有 {total_count - _MAX_LISTED_SERVERS} 台服务器"
         
         # 构建内容
-        content = f"""**账户名称**: {account_name}
-**所属区域**: {region or '未知'}
-**关机原因**: {reason}
-**服务器数量**: {len(server_list)} 台
-
----
-
-**关机服务器列表**:
-{server_info}
-
----
-
-**任务 ID**: `{job_id}`
-**操作时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-ℹ️ 系统已自动关闭上述服务器以节省流量"""
-        
-        return {
-            "config": {
-                "wide_screen_mode": True
-            },
-            "header": {
-                "title": {
-                    "tag": "plain_text",
-                    "content": "🔌 服务器自动关机通知"
-                },
-                "template": "red"
-            },
-            "elements": [
-                {
-                    "tag": "div",
-                    "text": {
-                        "tag": "lark_md",
-                        "content": content
-                    }
-                }
-            ]
+        content = self._CONTENT % {
+            "account_name": account_name,
+            "region": region or '未知',
+            "reason": reason,
+            "total_count": total_count,
+            "server_info": server_info,
+            "job_id": job_id,
+            "timestamp": timestamp or strftime(_TIME_FORMAT),
         }
+        
+        return _build_card("🔌 服务器自动关机通知", "red", content)
 
 
 class ShutdownSuccessTemplate(NotificationTemplate):
     """关机成功通知模板"""
     
+    _CONTENT = """**账户名称**: %(account_name)s
+**关机数量**: %(server_count)s 台
+**任务 ID**: `%(job_id)s`
+**执行时长**: %(duration_seconds).1f 秒
+**完成时间**: %(timestamp)s%(server_details)s
+
+✅ 关机操作已完成"""
+    
     def render(
         self,
         account_name: str,
@@ -190,6 +357,7 @@ class ShutdownSuccessTemplate(NotificationTemplate):
         job_id: str,
         duration_seconds: float = 0,
         server: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -200,58 +368,45 @@ class ShutdownSuccessTemplate(NotificationTemplate):
             server_count: 服务器数量
             job_id: 任务 ID
             duration_seconds: 执行时长（秒）
+            server: 单台服务器信息（可选）
+            timestamp: 显示的时间（默认当前时间）
             
         Returns:
             卡片配置
         """
         # 若传入单台服务器信息，展示实例详情
-        server_details = ""
-        if server:
-            name = server.get("name", "未命名")
-            ip = server.get("ip", "N/A")
-            remaining = server.get("remaining", None)
-            threshold = server.get("threshold", None)
-            server_details = "\n\n---\n\n**实例信息**:\n"
-            server_details += f"• **{name}** ({ip})\n"
-            if remaining is not None:
-                server_details += f"• 剩余流量: {float(remaining):.2f} GB\n"
-            if threshold is not None:
-                server_details += f"• 阈值: {float(threshold):.2f} GB\n"
-
-        content = f"""**账户名称**: {account_name}
-**关机数量**: {server_count} 台
-**任务 ID**: `{job_id}`
-**执行时长**: {duration_seconds:.1f} 秒
-**完成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{server_details}
-
-✅ 关机操作已完成"""
-        
-        return {
-            "config": {
-                "wide_screen_mode": True
-            },
-            "header": {
-                "title": {
-                    "tag": "plain_text",
-                    "content": "✅ 关机任务完成"
-                },
-                "template": "green"
-            },
-            "elements": [
-                {
-                    "tag": "div",
-                    "text": {
-                        "tag": "lark_md",
-                        "content": content
-                    }
-                }
-            ]
+        server_details = _format_server_details(server)
+
+        content = self._CONTENT % {
+            "account_name": account_name,
+            "server_count": server_count,
+            "job_id": job_id,
+            "duration_seconds": duration_seconds,
+            "timestamp": timestamp or strftime(_TIME_FORMAT),
+            "server_details": server_details,
         }
+        
+        return _build_card("✅ 关机任务完成", "green", content)
 
 
 class ShutdownDelayTemplate(NotificationTemplate):
     """关机延迟通知模板"""
     
+    _CONTENT = """**账户名称**: %(account_name)s
+**所属区域**: %(region)s
+
+---
+
+**剩余流量**: %(remaining_traffic_gb).2f GB
+**流量阈值**: %(threshold_gb).2f GB
+**延迟时间**: %(delay_minutes)s 分钟
+**预计关机时间**: %(scheduled_time)s
+
+---
+
+⏰ 流量低于阈值，系统将在 %(delay_minutes)s 分钟后执行自动关机
+💡 在延迟期间内流量恢复正常将自动取消关机"""
+    
     def render(
         self,
         account_name: str,
@@ -274,49 +429,36 @@ class ShutdownDelayTemplate(NotificationTemplate):
         Returns:
             卡片配置
         """
-        from datetime import timedelta
-        scheduled_time = datetime.now() + timedelta(minutes=delay_minutes)
+        scheduled_time = localtime(time() + delay_minutes * 60)
         
-        content = f"""**账户名称**: {account_name}
-**所属区域**: {region or '未知'}
+        content = self._CONTENT % {
+            "account_name": account_name,
+            "region": region or '未知',
+            "remaining_traffic_gb": remaining_traffic_gb,
+            "threshold_gb": threshold_gb,
+            "delay_minutes": delay_minutes,
+            "scheduled_time": strftime(_TIME_FORMAT, scheduled_time),
+        }
+        
+        return _build_card("⏰ 关机延迟通知", "orange", content)
 
----
 
-**剩余流量**: {remaining_traffic_gb:.2f} GB
-**流量阈值**: {threshold_gb:.2f} GB
-**延迟时间**: {delay_minutes} 分钟
-**预计关机时间**: {scheduled_time.strftime('%Y-%m-%d %H:%M:%S')}
+class ShutdownFailureTemplate(NotificationTemplate):
+    """关机失败通知模板"""
+    
+    _CONTENT = """**账户名称**: %(account_name)s
+**关机数量**: %(server_count)s 台
+**任务 ID**: `%(job_id)s`
+**失败时间**: %(timestamp)s%(server_details)s
 
 ---
 
-⏰ 流量低于阈值，系统将在 {delay_minutes} 分钟后执行自动关机
-💡 在延迟期间内流量恢复正常将自动取消关机"""
-        
-        return {
-            "config": {
-                "wide_screen_mode": True
-            },
-            "header": {
-                "title": {
-                    "tag": "plain_text",
-                    "content": "⏰ 关机延迟通知"
-                },
-                "template": "orange"
-            },
-            "elements": [
-                {
-                    "tag": "div",
-                    "text": {
-                        "tag": "lark_md",
-                        "content": content
-                    }
-                }
-            ]
-        }
-
+**错误信息**:
+```
+%(error_message)s
+```
 
-class ShutdownFailureTemplate(NotificationTemplate):
-    """关机失败通知模板"""
+❌ 关机任务执行失败，请检查错误信息"""
     
     def render(
         self,
@@ -325,6 +467,7 @@ class ShutdownFailureTemplate(NotificationTemplate):
         job_id: str,
         error_message: str,
         server: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -335,80 +478,155 @@ class ShutdownFailureTemplate(NotificationTemplate):
             server_count: 服务器数量
             job_id: 任务 ID
             error_message: 错误信息
+            server: 单台服务器信息（可选）
+            timestamp: 显示的时间（默认当前时间）
             
         Returns:
             卡片配置
         """
-        server_details = ""
-        if server:
-            name = server.get("name", "未命名")
-            ip = server.get("ip", "N/A")
-            remaining = server.get("remaining", None)
-            threshold = server.get("threshold", None)
-            server_details = "\n\n---\n\n**实例信息**:\n"
-            server_details += f"• **{name}** ({ip})\n"
-            if remaining is not None:
-                server_details += f"• 剩余流量: {float(remaining):.2f} GB\n"
-            if threshold is not None:
-                server_details += f"• 阈值: {float(threshold):.2f} GB\n"
-
-        content = f"""**账户名称**: {account_name}
-**关机数量**: {server_count} 台
-**任务 ID**: `{job_id}`
-**失败时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{server_details}
+        server_details = _format_server_details(server)
+
+        content = self._CONTENT % {
+            "account_name": account_name,
+            "server_count": server_count,
+            "job_id": job_id,
+            "timestamp": timestamp or strftime(_TIME_FORMAT),
+            "server_details": server_details,
+            "error_message": error_message,
+        }
+        
+        return _build_card("❌ 关机任务失败", "red", content)
 
----
 
-**错误信息**:
-```
-{error_message}
-```
-
-❌ 关机任务执行失败，请检查错误信息"""
+class BatchShutdownTemplate(NotificationTemplate):
+    """批量关机结果通知模板（多台服务器合并为一张卡片）"""
+    
+    _SUMMARY = """**账户名称**: %(account_name)s
+**关机成功**: %(success_count)s 台
+**关机失败**: %(failure_count)s 台
+**完成时间**: %(timestamp)s"""
+    
+    def render(
+        self,
+        account_name: str,
+        items: List[Dict[str, Any]],
+        timestamp: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        渲染批量关机结果通知，每台服务器占一行分栏
         
-        return {
-            "config": {
-                "wide_screen_mode": True
-            },
-            "header": {
-                "title": {
-                    "tag": "plain_text",
-                    "content": "❌ 关机任务失败"
-                },
-                "template": "red"
-            },
-            "elements": [
-                {
-                    "tag": "div",
-                    "text": {
-                        "tag": "lark_md",
-                        "content": content
-                    }
-                }
-            ]
+        Args:
+            account_name: 账户名称
+            items: 各服务器的关机结果 [{"name", "ip", "success", "job_id",
+                "error_message", "remaining", "threshold"}, ...]
+            timestamp: 显示的时间（默认当前时间）
+            
+        Returns:
+            卡片配置
+        """
+        failure_count = sum(1 for item in items if not item.get("success"))
+        summary = self._SUMMARY % {
+            "account_name": account_name,
+            "success_count": len(items) - failure_count,
+            "failure_count": failure_count,
+            "timestamp": timestamp or strftime(_TIME_FORMAT),
         }
+        
+        elements = [
+            {"tag": "div", "text": {"tag": "lark_md", "content": summary}},
+            {"tag": "hr"},
+        ]
+        for item in items:
+            elements.append({
+                "tag": "column_set",
+                "flex_mode": "none",
+                "background_style": "default",
+                "columns": [
+                    _lark_md_column(_format_batch_server(item)),
+                    _lark_md_column(_format_batch_result(item)),
+                ]
+            })
+        
+        if failure_count:
+            return _build_elements_card("⚠️ 批量关机结果", "red" if failure_count == len(items) else "orange", elements)
+        return _build_elements_card("✅ 关机任务完成", "green", elements)
 
 
 class FeishuNotificationService:
     """飞书通知服务"""
     
-    def __init__(self, webhook_client: FeishuWebhookClient):
+    def __init__(self, webhook_client: FeishuWebhookClient, dedupe_ttl: float = _DEDUPE_TTL):
         """
         初始化通知服务
         
         Args:
             webhook_client: 飞书 Webhook 客户端
+            dedupe_ttl: 重复告警抑制窗口（秒），0 表示不抑制
         """
         self.client = webhook_client
-        self.templates = {
-            'traffic_warning': TrafficWarningTemplate(),
-            'shutdown_notification': ShutdownNotificationTemplate(),
-            'shutdown_delay': ShutdownDelayTemplate(),
-            'shutdown_success': ShutdownSuccessTemplate(),
-            'shutdown_failure': ShutdownFailureTemplate(),
+        self.dedupe_ttl = dedupe_ttl
+        # 模板在首次使用时才实例化，只发送部分类型通知的服务不创建其余模板
+        self._template_factories = {
+            'traffic_warning': TrafficWarningTemplate,
+            'shutdown_notification': ShutdownNotificationTemplate,
+            'shutdown_delay': ShutdownDelayTemplate,
+            'shutdown_success': ShutdownSuccessTemplate,
+            'shutdown_failure': ShutdownFailureTemplate,
+            'shutdown_batch': BatchShutdownTemplate,
         }
+        self.templates: Dict[str, NotificationTemplate] = {}
         logger.info("初始化飞书通知服务")
     
+    def register_template(self, template_name: str, template: NotificationTemplate) -> None:
+        """
+        注册（或替换）通知模板
+        
+        Args:
+            template_name: 模板名称
+            template: 模板实例
+        """
+        self.templates[template_name] = template
+    
+    def get_template(self, template_name: str) -> NotificationTemplate:
+        """
+        获取模板，首次使用时按工厂表创建并缓存
+        
+        Args:
+            template_name: 模板名称
+            
+        Returns:
+            模板实例
+            
+        Raises:
+            ValueError: 模板不存在
+        """
+        template = self.templates.get(template_name)
+        if template is not None:
+            return template
+        
+        factory = self._template_factories.get(template_name)
+        if factory is None:
+            raise ValueError(f"模板不存在: {template_name}")
+        
+        return self.templates.setdefault(template_name, factory())
+    
+    def _render(self, template_name: str, template_vars: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        渲染模板
+        
+        Args:
+            template_name: 模板名称
+            template_vars: 模板变量
+            
+        Returns:
+            卡片配置
+            
+        Raises:
+            ValueError: 模板不存在
+        """
+        return self.get_template(template_name).render(**template_vars)
+    
     def send_notification(
         self,
         template_name: str,
@@ -427,23 +645,71 @@ class FeishuNotificationService:
         Raises:
             ValueError: 模板不存在
         """
-        # 获取模板
-        template = self.templates.get(template_name)
-        if not template:
-            raise ValueError(f"模板不存在: {template_name}")
-        
-        logger.info(f"发送通知: template={template_name}")
+        dedupe_key = None
+        reservation = None
+        if self.dedupe_ttl > 0 and template_name in _DEDUPE_TEMPLATES:
+            dedupe_key = (
+                self.client.webhook_url,
+                template_name,
+                template_vars.get("account_name"),
+                round(template_vars.get("usage_percentage", 0))
+            )
+            now = monotonic()
+            with _sent_alerts_lock:
+                sent = _sent_alerts.get(dedupe_key)
+                if sent is None or now - sent[0] >= self.dedupe_ttl:
+                    # 发送前先占位：同时提交的相同告警只有一个真正发送
+                    reservation = (now, None)
+                    _sent_alerts[dedupe_key] = reservation
+            if reservation is None:
+                # 窗口内已发送（或正在发送）相同告警，跳过渲染和发送，返回上次的发送结果
+                logger.info("跳过重复通知: template={}, account={}", template_name, dedupe_key[2])
+                return sent[1] or {}
         
-        # 渲染模板
-        card = template.render(**template_vars)
-        
-        # 发送卡片
-        result = self.client.send_card(card)
+        try:
+            # 渲染模板
+            card = self._render(template_name, template_vars)
+            
+            logger.info(f"发送通知: template={template_name}")
+            
+            # 发送卡片
+            result = self.client.send_card(card)
+        except Exception:
+            if reservation is not None:
+                # 发送失败时撤销占位，下个周期仍会重发
+                with _sent_alerts_lock:
+                    if _sent_alerts.get(dedupe_key) is reservation:
+                        del _sent_alerts[dedupe_key]
+            raise
         
         logger.info(f"通知发送成功: template={template_name}")
         
+        if reservation is not None:
+            # 记录发送结果；顺带清理过期记录
+            now = monotonic()
+            with _sent_alerts_lock:
+                for key in [k for k, (sent_at, _) in _sent_alerts.items() if now - sent_at >= self.dedupe_ttl]:
+                    del _sent_alerts[key]
+                _sent_alerts[dedupe_key] = (now, result)
+        
         return result
     
+    def submit(self, template_name: str, **template_vars) -> Future:
+        """
+        在后台线程池中发送通知，立即返回
+        
+        调用方无需等待飞书响应；需要结果时调用返回值的 result()，
+        发送失败的异常也通过 result() 抛出
+        
+        Args:
+            template_name: 模板名称
+            **template_vars: 模板变量
+            
+        Returns:
+            发送结果的 Future
+        """
+        return _get_notify_pool().submit(self.send_notification, template_name, **template_vars)
+    
     def send_traffic_warning(
         self,
         account_name: str,
@@ -590,3 +856,32 @@ class FeishuNotificationService:
             error_message=error_message,
             **kwargs
         )
+    
+    def send_shutdown_batch(
+        self,
+        account_name: str,
+        items: List[Dict[str, Any]],
+        batch_size: int = _BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        发送批量关机结果通知
+        
+        多台服务器的关机结果合并为一张卡片，每张最多 batch_size 台，
+        代替逐台发送关机成功/失败通知
+        
+        Args:
+            account_name: 账户名称
+            items: 各服务器的关机结果（字段见 BatchShutdownTemplate）
+            batch_size: 每张卡片包含的服务器数量
+            
+        Returns:
+            各张卡片的发送结果
+        """
+        return [
+            self.send_notification(
+                'shutdown_batch',
+                account_name=account_name,
+                items=items[start:start + batch_size]
+            )
+            for start in range(0, len(items), batch_size)
+        ]
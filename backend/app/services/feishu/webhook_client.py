@@ -3,12 +3,77 @@
 
 API 文档: https://open.feishu.cn/document/ukTMukTMukTM/ucTM5YjL3ETO24yNxkjN
 """
+import orjson
+import random
 import requests
+import threading
 import time
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 from enum import Enum
 from loguru import logger
 
+# 可重试的飞书错误码：只有请求频率超限（11232）。
+# 其余业务错误（9499 请求参数错误、19024 关键词校验失败等）重试也不会成功，直接失败
+_RETRIABLE_CODES = frozenset({11232})
+
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+# 飞书 Webhook 的正常响应只有几十字节，超过该大小的响应体（如网关错误页）不再解析
+_MAX_RESPONSE_BYTES = 4096
+
+# 健康检查使用的无效消息体，以及飞书因消息体无效而拒绝时返回的错误码（9499 Bad Request）：
+# 只有这个错误码说明 Webhook 可达且 Token 有效；19001（Token 无效）、19002（参数错误）、
+# 19021（签名校验失败）等均视为不可用
+_HEALTH_CHECK_PAYLOAD = orjson.dumps({"msg_type": "text", "content": {}})
+_HEALTH_CHECK_BAD_PAYLOAD_CODE = 9499
+
+# 所有客户端共用的 HTTP 会话：保持到 open.feishu.cn 的长连接，
+# 连续发送通知时不再为每条消息重新建立 TCP 连接和 TLS 握手
+_shared_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_shared_session() -> requests.Session:
+    """获取共享 HTTP 会话（首次使用时创建）"""
+    global _shared_session
+    if _shared_session is None:
+        with _session_lock:
+            if _shared_session is None:
+                session = requests.Session()
+                # 重试由客户端自行控制，连接池不做重试
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+                _shared_session = session
+    return _shared_session
+
+
+def close_shared_session() -> None:
+    """关闭共享 HTTP 会话，释放连接（应用关闭时调用）"""
+    global _shared_session
+    with _session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
+
+def _read_limited(response: requests.Response) -> Optional[bytes]:
+    """
+    读取流式响应体，最多 _MAX_RESPONSE_BYTES 字节
+    
+    Content-Length 超限时不读取响应体；未声明长度时多读一个字节判断是否超限
+    
+    Returns:
+        响应体，超过大小上限时返回 None
+    """
+    content_length = response.headers.get("Content-Length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > _MAX_RESPONSE_BYTES:
+        return None
+    
+    body = response.raw.read(_MAX_RESPONSE_BYTES + 1, decode_content=True)
+    if len(body) > _MAX_RESPONSE_BYTES:
+        return None
+    return body
+
 
 class FeishuException(Exception):
     """飞书 API 异常"""
@@ -31,7 +96,8 @@ class FeishuWebhookClient:
         webhook_url: str,
         retry_times: int = 3,
         retry_delay: float = 1.0,
-        timeout: int = 10
+        timeout: int = 10,
+        max_retry_delay: float = 30.0
     ):
         """
         初始化飞书 Webhook 客户端
@@ -39,8 +105,9 @@ class FeishuWebhookClient:
         Args:
             webhook_url: Webhook URL
             retry_times: 重试次数
-            retry_delay: 重试延迟（秒）
+            retry_delay: 重试基础延迟（秒），按指数退避增长
             timeout: 请求超时时间（秒）
+            max_retry_delay: 单次重试延迟上限（秒）
         """
         if not webhook_url:
             raise ValueError("webhook_url 不能为空")
@@ -49,6 +116,8 @@ class FeishuWebhookClient:
         self.retry_times = retry_times
         self.retry_delay = retry_delay
         self.timeout = timeout
+        self.max_retry_delay = max_retry_delay
+        self._session = _get_shared_session()
         
         logger.info(
             f"初始化飞书 Webhook 客户端: "
@@ -82,46 +151,87 @@ class FeishuWebhookClient:
         logger.info(f"发送飞书消息: type={msg_type.value}")
         logger.debug(f"Payload: {payload}")
         
-        # 重试机制
+        return self._post_with_retry(payload)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        计算第 attempt 次失败后的等待时间
+        
+        指数退避加全抖动：在 [0, retry_delay * 2^attempt] 内随机取值并受上限约束，
+        避免多个调用方在限流时同步重试
+        """
+        return min(self.max_retry_delay, random.uniform(0, self.retry_delay * (2 ** attempt)))
+    
+    def _post_with_retry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        发送请求，网络错误、HTTP 429/5xx 和频率超限错误码按指数退避重试
+        
+        Args:
+            payload: 请求体
+            
+        Returns:
+            响应结果
+            
+        Raises:
+            FeishuException: 发送失败
+        """
         last_error = None
         for attempt in range(self.retry_times):
             try:
-                # 发送请求
-                response = requests.post(
+                # 用 orjson 序列化请求体，代替 requests 内部的标准库 json；
+                # 流式接收响应，只读取有限大小的响应体
+                with self._session.post(
                     self.webhook_url,
-                    json=payload,
-                    timeout=self.timeout
-                )
-                
-                # 解析响应
-                result = response.json()
+                    data=orjson.dumps(payload),
+                    headers=_JSON_HEADERS,
+                    timeout=self.timeout,
+                    stream=True
+                ) as response:
+                    status_code = response.status_code
+                    body = None if status_code == 429 or status_code >= 500 else _read_limited(response)
                 
-                # 检查响应状态
-                if result.get('code') == 0:
-                    logger.info("飞书消息发送成功")
-                    return result
+                if status_code == 429:
+                    last_error = FeishuException("请求频率超限 (HTTP 429)")
+                elif status_code >= 500:
+                    last_error = FeishuException(f"服务端错误 (HTTP {status_code})")
+                elif body is None:
+                    # 超大响应通常是网关错误页，按可重试处理
+                    last_error = FeishuException("响应过大")
                 else:
+                    # 解析响应
+                    result = orjson.loads(body)
+                    code = result.get('code')
+                    
+                    # 检查响应状态
+                    if code == 0:
+                        logger.info("飞书消息发送成功")
+                        return result
+                    
                     error_msg = result.get('msg', '未知错误')
-                    logger.error(
-                        f"飞书消息发送失败: code={result.get('code')}, "
-                        f"msg={error_msg}"
-                    )
-                    raise FeishuException(f"发送失败: {error_msg}")
+                    logger.error("飞书消息发送失败: code={}, msg={}", code, error_msg)
+                    last_error = FeishuException(f"发送失败: {error_msg}")
+                    
+                    if code not in _RETRIABLE_CODES:
+                        raise last_error
                 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+                # 网络错误或响应不是合法 JSON（如网关错误页），均可重试
                 last_error = e
-                logger.warning(
-                    f"飞书消息发送失败 (尝试 {attempt + 1}/{self.retry_times}): {e}"
-                )
-                
-                # 如果还有重试机会，等待后重试
-                if attempt < self.retry_times - 1:
-                    time.sleep(self.retry_delay)
-                    continue
-                
+            
+            except FeishuException:
+                raise
+            
             except Exception as e:
-                logger.error(f"飞书消息发送异常: {e}")
+                logger.error("飞书消息发送异常: {}", e)
                 raise FeishuException(f"发送异常: {e}")
+            
+            logger.warning(
+                "飞书消息发送失败 (尝试 {}/{}): {}", attempt + 1, self.retry_times, last_error
+            )
+            
+            # 如果还有重试机会，退避后重试
+            if attempt < self.retry_times - 1:
+                time.sleep(self._backoff_delay(attempt))
         
         # 所有重试都失败
         raise FeishuException(f"发送失败（已重试 {self.retry_times} 次）: {last_error}")
@@ -190,38 +300,7 @@ class FeishuWebhookClient:
         logger.debug(f"Card payload: {payload}")
         
         # 直接发送，不通过 send_message
-        last_error = None
-        for attempt in range(self.retry_times):
-            try:
-                response = requests.post(
-                    self.webhook_url,
-                    json=payload,
-                    timeout=self.timeout
-                )
-                
-                result = response.json()
-                
-                if result.get('code') == 0:
-                    logger.info("飞书消息发送成功")
-                    return result
-                else:
-                    error_msg = result.get('msg', '未知错误')
-                    logger.error(f"飞书消息发送失败: code={result.get('code')}, msg={error_msg}")
-                    raise FeishuException(f"发送失败: {error_msg}")
-                    
-            except requests.exceptions.RequestException as e:
-                last_error = e
-                logger.warning(f"飞书消息发送失败 (尝试 {attempt + 1}/{self.retry_times}): {e}")
-                
-                if attempt < self.retry_times - 1:
-                    time.sleep(self.retry_delay)
-                    continue
-                    
-            except Exception as e:
-                logger.error(f"飞书消息发送异常: {e}")
-                raise FeishuException(f"发送异常: {e}")
-        
-        raise FeishuException(f"发送失败（已重试 {self.retry_times} 次）: {last_error}")
+        return self._post_with_retry(payload)
     
     def create_text_card(
         self,
@@ -353,13 +432,36 @@ class FeishuWebhookClient:
         """
         健康检查
         
+        发送一条内容为空的文本消息，飞书会以 Bad Request 拒绝而不会投递到群里；
+        收到该错误码说明 Webhook 可达，避免每次探测都发出真实消息
+        
         Returns:
             是否可用
         """
         try:
-            # 发送测试消息
-            self.send_text("飞书 Webhook 健康检查")
-            return True
+            with self._session.post(
+                self.webhook_url,
+                data=_HEALTH_CHECK_PAYLOAD,
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                body = None if response.status_code >= 500 else _read_limited(response)
+            
+            if response.status_code >= 500:
+                logger.error("健康检查失败: HTTP {}", response.status_code)
+                return False
+            if body is None:
+                logger.error("健康检查失败: 响应过大")
+                return False
+            
+            result = orjson.loads(body)
+            code = result.get('code')
+            if code == 0 or code == _HEALTH_CHECK_BAD_PAYLOAD_CODE:
+                return True
+            
+            logger.error("健康检查失败: code={}, msg={}", code, result.get('msg'))
+            return False
         except Exception as e:
-            logger.error(f"健康检查失败: {e}")
+            logger.error("健康检查失败: {}", e)
             return False
@@ -1,37 +1,50 @@
 """
 华为云服务模块
+
+各客户端和服务在首次访问时才导入对应子模块（PEP 562），
+只用到其中一部分的进程不必加载全部依赖
 """
-from app.services.huawei_cloud.client import HuaweiCloudClient, HuaweiCloudAPIException
-from app.services.huawei_cloud.bss_client import HuaweiCloudBSSClient, HuaweiCloudBSSException
-from app.services.huawei_cloud.client_manager import client_manager, HuaweiCloudClientManager
-from app.services.huawei_cloud.traffic_service import TrafficService, TrafficPackage
-from app.services.huawei_cloud.ecs_service import ECSService, ECSServer
-from app.services.huawei_cloud.iam_service import IAMService
-from app.services.huawei_cloud.flexusl_service import (
-    FlexusLService,
-    FlexusLInstance,
-    TrafficPackageInfo,
-    ServerActionResult,
-    JobStatus,
-    FlexusLException
-)
+import importlib
+
+# 导出名称 -> 所在子模块
+# 客户端管理器所在子模块以下划线开头，避免与导出的 client_manager 实例同名：
+# 子模块导入后会被绑定为包属性，同名时会覆盖惰性导出的实例
+_LAZY = {
+    'client_manager': 'app.services.huawei_cloud._client_manager',
+    'HuaweiCloudClientManager': 'app.services.huawei_cloud._client_manager',
+    'HuaweiCloudClient': 'app.services.huawei_cloud.client',
+    'HuaweiCloudAPIException': 'app.services.huawei_cloud.client',
+    'HuaweiCloudBSSClient': 'app.services.huawei_cloud.bss_client',
+    'HuaweiCloudBSSException': 'app.services.huawei_cloud.bss_client',
+    'TrafficService': 'app.services.huawei_cloud.traffic_service',
+    'TrafficPackage': 'app.services.huawei_cloud.traffic_service',
+    'ECSService': 'app.services.huawei_cloud.ecs_service',
+    'ECSServer': 'app.services.huawei_cloud.ecs_service',
+    'IAMService': 'app.services.huawei_cloud.iam_service',
+    'FlexusLService': 'app.services.huawei_cloud.flexusl_service',
+    'FlexusLInstance': 'app.services.huawei_cloud.flexusl_service',
+    'TrafficPackageInfo': 'app.services.huawei_cloud.flexusl_service',
+    'ServerActionResult': 'app.services.huawei_cloud.flexusl_service',
+    'JobStatus': 'app.services.huawei_cloud.flexusl_service',
+    'FlexusLException': 'app.services.huawei_cloud.flexusl_service',
+    'get_traffic_summaries_concurrently': 'app.services.huawei_cloud.flexusl_service',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(module_name)
+    # 把该子模块导出的名称一并绑定到包上，之后的访问不再经过这里
+    for attr, attr_module in _LAZY.items():
+        if attr_module == module_name:
+            globals()[attr] = getattr(module, attr)
+    return globals()[name]
+
 
-__all__ = [
-    'HuaweiCloudClient',
-    'HuaweiCloudAPIException',
-    'HuaweiCloudBSSClient',
-    'HuaweiCloudBSSException',
-    'client_manager',
-    'HuaweiCloudClientManager',
-    'TrafficService',
-    'TrafficPackage',
-    'ECSService',
-    'ECSServer',
-    'IAMService',
-    'FlexusLService',
-    'FlexusLInstance',
-    'TrafficPackageInfo',
-    'ServerActionResult',
-    'JobStatus',
-    'FlexusLException',
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
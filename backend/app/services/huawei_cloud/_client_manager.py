@@ -2,6 +2,7 @@
 华为云客户端管理器
 支持多账户管理
 """
+import threading
 from typing import Dict, Optional
 from loguru import logger
 from app.services.huawei_cloud.client import HuaweiCloudClient
@@ -14,6 +15,8 @@ class HuaweiCloudClientManager:
     def __init__(self):
         """初始化客户端管理器"""
         self._clients: Dict[int, HuaweiCloudClient] = {}
+        # 创建客户端时加锁，避免监控任务并发启动时重复解密 AK/SK、重复创建客户端
+        self._lock = threading.Lock()
         logger.info("初始化华为云客户端管理器")
     
     def get_client(
@@ -35,11 +38,28 @@ class HuaweiCloudClientManager:
         Returns:
             华为云客户端实例
         """
-        # 如果客户端已存在，直接返回
-        if account_id in self._clients:
-            logger.debug(f"使用缓存的华为云客户端: account_id={account_id}")
-            return self._clients[account_id]
+        # 如果客户端已存在，直接返回（命中缓存时不加锁）
+        client = self._clients.get(account_id)
+        if client is not None:
+            logger.debug("使用缓存的华为云客户端: account_id={}", account_id)
+            return client
         
+        with self._lock:
+            # 加锁后再检查一次，其他线程可能已创建好
+            client = self._clients.get(account_id)
+            if client is not None:
+                return client
+            
+            return self._create_client(account_id, encrypted_ak, encrypted_sk, region)
+    
+    def _create_client(
+        self,
+        account_id: int,
+        encrypted_ak: str,
+        encrypted_sk: str,
+        region: str
+    ) -> HuaweiCloudClient:
+        """解密 AK/SK 并创建、缓存客户端（调用方需持有锁）"""
         # 解密 AK/SK
         try:
             ak, sk = encryption_service.decrypt_ak_sk(encrypted_ak, encrypted_sk)
@@ -77,16 +97,18 @@ class HuaweiCloudClientManager:
         Returns:
             是否成功
         """
-        if account_id in self._clients:
-            del self._clients[account_id]
-            logger.info(f"移除华为云客户端缓存: account_id={account_id}")
-            return True
-        return False
+        with self._lock:
+            removed = self._clients.pop(account_id, None) is not None
+        
+        if removed:
+            logger.info("移除华为云客户端缓存: account_id={}", account_id)
+        return removed
     
     def clear_clients(self):
         """清空所有客户端缓存"""
-        count = len(self._clients)
-        self._clients.clear()
+        with self._lock:
+            count = len(self._clients)
+            self._clients.clear()
         logger.info(f"清空所有华为云客户端缓存: count={count}")
     
     def get_client_count(self) -> int:
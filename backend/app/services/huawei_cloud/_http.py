@@ -0,0 +1,44 @@
+"""
+华为云 API 的 HTTP 会话配置
+
+ECS 和 BSS 客户端共用
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 连接池：多个调度线程并发请求同一端点时不因连接池耗尽而等待或反复新建连接
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 64
+
+# 传输层重试：限流和服务端错误按指数退避重试，429/503 优先按 Retry-After 等待。
+# 重试在连接池内部完成，不再经过调用方的异常处理和日志；重试用尽后返回最后的响应，
+# 由调用方按 HTTP 错误处理。
+# 只重试幂等方法：POST 在这里用于开关机等操作，重复提交可能重复执行
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+
+def create_session() -> requests.Session:
+    """
+    创建带连接池和重试配置的 HTTP 会话
+    
+    Returns:
+        requests 会话
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=_RETRY)
+    )
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'User-Agent': 'huawei-cloud-monitor/1.0'
+    })
+    return session
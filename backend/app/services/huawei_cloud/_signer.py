@@ -0,0 +1,156 @@
+"""
+华为云 API 请求签名（SDK-HMAC-SHA256）
+
+ECS 和 BSS 客户端共用的签名实现
+"""
+import hashlib
+import hmac
+from functools import lru_cache
+from time import gmtime, strftime, time
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+# hashlib.sha256 由 OpenSSL 实现；绑定到模块级名称，签名时省去属性查找
+_SHA256 = hashlib.sha256
+
+# 参与签名的请求头
+SIGNED_HEADERS = "content-type;host;x-sdk-date"
+
+# 空请求体的哈希（GET 请求都没有请求体），只在导入时计算一次
+_EMPTY_BODY_SHA256 = _SHA256(b"").hexdigest()
+
+# 最近一次生成的 X-Sdk-Date：(UTC 秒, 格式化结果)，同一秒内的签名直接复用
+_last_timestamp: Tuple[int, str] = (0, "")
+
+
+def _sdk_timestamp() -> str:
+    """当前 UTC 时间的 X-Sdk-Date 格式（直接用 time.gmtime 格式化，不构造 datetime）"""
+    global _last_timestamp
+    now = int(time())
+    cached = _last_timestamp
+    if cached[0] == now:
+        return cached[1]
+    
+    timestamp = strftime('%Y%m%dT%H%M%SZ', gmtime(now))
+    # 元组整体赋值，多线程下读到的秒数与格式化结果始终一致
+    _last_timestamp = (now, timestamp)
+    return timestamp
+
+
+@lru_cache(maxsize=32)
+def _canonical_headers_prefix(host: str) -> str:
+    """规范请求头中固定不变的部分（每个端点只构建一次），之后只需拼接时间戳"""
+    return f"content-type:application/json\nhost:{host}\nx-sdk-date:"
+
+
+@lru_cache(maxsize=256)
+def _canon_uri(uri: str) -> str:
+    """
+    规范化 URI（按 URI 缓存，请求路径只有少数几种）
+    
+    对路径中每个部分单独进行 URL 编码，华为云要求保留 '/' 不编码，
+    并确保以 / 结尾（华为云签名规范要求）
+    """
+    canonical_uri = '/'.join(
+        quote(segment, safe='')
+        for segment in uri.split('/')
+    )
+    if not canonical_uri.endswith('/'):
+        canonical_uri += '/'
+    return canonical_uri
+
+
+@lru_cache(maxsize=256)
+def _canon_query(sorted_params: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    规范化查询字符串（按排序后的参数缓存，轮询请求的参数基本不变）
+    
+    参数值需先转为字符串，避免 1 与 True 这类相等但格式化不同的值共用缓存
+    """
+    return "&".join(
+        f"{quote(k, safe='')}={quote(v, safe='')}"
+        for k, v in sorted_params
+    )
+
+
+def sign(
+    ak: str,
+    sk_bytes: bytes,
+    host: str,
+    method: str,
+    uri: str,
+    query_params: Optional[Dict[str, str]] = None,
+    body_bytes: bytes = b"",
+    headers: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    生成请求签名
+    
+    Args:
+        ak: Access Key
+        sk_bytes: UTF-8 编码的 Secret Key
+        host: 端点主机名
+        method: HTTP 方法
+        uri: 请求 URI
+        query_params: 查询参数
+        body_bytes: UTF-8 编码的请求体
+        headers: 需要一并返回的其他请求头
+    
+    Returns:
+        签名后的请求头
+    """
+    # 规范化 URI
+    canonical_uri = _canon_uri(uri)
+    
+    # 规范化查询字符串
+    canonical_query_string = ""
+    if query_params:
+        canonical_query_string = _canon_query(
+            tuple(sorted((k, str(v)) for k, v in query_params.items()))
+        )
+    
+    # 获取当前时间戳
+    timestamp = _sdk_timestamp()
+    
+    # 构建规范请求头
+    canonical_headers = f"{_canonical_headers_prefix(host)}{timestamp}\n"
+    
+    # 计算请求体哈希
+    hashed_request_payload = _SHA256(body_bytes).hexdigest() if body_bytes else _EMPTY_BODY_SHA256
+    
+    # 构建规范请求
+    canonical_request = (
+        f"{method}\n"
+        f"{canonical_uri}\n"
+        f"{canonical_query_string}\n"
+        f"{canonical_headers}\n"
+        f"{SIGNED_HEADERS}\n"
+        f"{hashed_request_payload}"
+    )
+    
+    # 计算签名
+    string_to_sign = (
+        f"SDK-HMAC-SHA256\n"
+        f"{timestamp}\n"
+        f"{_SHA256(canonical_request.encode('utf-8')).hexdigest()}"
+    )
+    
+    # hmac.digest 一次 C 调用完成计算，不创建 HMAC 对象
+    signature = hmac.digest(sk_bytes, string_to_sign.encode('utf-8'), 'sha256').hex()
+    
+    # 返回签名请求头
+    auth_headers = {
+        'X-Sdk-Date': timestamp,
+        'Host': host,
+        'Authorization': (
+            f'SDK-HMAC-SHA256 '
+            f'Access={ak}, '
+            f'SignedHeaders={SIGNED_HEADERS}, '
+            f'Signature={signature}'
+        )
+    }
+    
+    if headers:
+        auth_headers.update(headers)
+    
+    return auth_headers
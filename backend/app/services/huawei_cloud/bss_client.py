@@ -2,15 +2,15 @@
 华为云 BSS (Business Support System) API 客户端
 用于调用计费相关的 API，如流量包查询
 """
-import hashlib
-import hmac
-import json
-from datetime import datetime
 from typing import Dict, Optional, Any
+import orjson
 import requests
-from urllib.parse import quote
+from urllib.parse import urlsplit
 from loguru import logger
 
+from app.services.huawei_cloud._http import create_session
+from app.services.huawei_cloud._signer import sign
+
 
 class HuaweiCloudBSSClient:
     """华为云 BSS API 客户端"""
@@ -32,13 +32,11 @@ class HuaweiCloudBSSClient:
         """
         self.ak = access_key
         self.sk = secret_key
+        self._sk_bytes = secret_key.encode('utf-8')
         self.is_international = is_international
         self.endpoint = self.ENDPOINTS['intl'] if is_international else self.ENDPOINTS['cn']
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'huawei-cloud-monitor/1.0'
-        })
+        self._host = urlsplit(self.endpoint).netloc
+        self.session = create_session()
         
         logger.info(f"初始化 BSS 客户端: endpoint={self.endpoint}")
     
@@ -48,7 +46,7 @@ class HuaweiCloudBSSClient:
         uri: str,
         query_params: Optional[Dict[str, str]] = None,
         headers: Optional[Dict[str, str]] = None,
-        body: str = ""
+        body_bytes: bytes = b""
     ) -> Dict[str, str]:
         """
         生成请求签名 (SDK-HMAC-SHA256)
@@ -58,84 +56,21 @@ class HuaweiCloudBSSClient:
             uri: 请求 URI
             query_params: 查询参数
             headers: 请求头
-            body: 请求体
+            body_bytes: 序列化后的请求体
             
         Returns:
             签名后的请求头
         """
-        # 规范化 URI：对路径中每个部分单独进行 URL 编码
-        # 华为云要求保留 '/' 不编码，但对每个路径段进行编码
-        canonical_uri = '/'.join(
-            quote(segment, safe='')
-            for segment in uri.split('/')
-        )
-        # 确保以 / 结尾（华为云签名规范要求）
-        if not canonical_uri.endswith('/'):
-            canonical_uri += '/'
-        
-        # 规范化查询字符串
-        canonical_query_string = ""
-        if query_params:
-            sorted_params = sorted(query_params.items())
-            canonical_query_string = "&".join(
-                f"{quote(k, safe='')}={quote(str(v), safe='')}"
-                for k, v in sorted_params
-            )
-        
-        # 规范化请求头
-        signed_headers_str = "content-type;host;x-sdk-date"
-        
-        # 获取当前时间戳
-        timestamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-        
-        # 提取主机名
-        host = self.endpoint.replace('https://', '').replace('http://', '')
-        
-        # 构建规范请求头
-        canonical_headers = f"content-type:application/json\nhost:{host}\nx-sdk-date:{timestamp}\n"
-        
-        # 计算请求体哈希
-        hashed_request_payload = hashlib.sha256(body.encode('utf-8')).hexdigest()
-        
-        # 构建规范请求
-        canonical_request = (
-            f"{method}\n"
-            f"{canonical_uri}\n"
-            f"{canonical_query_string}\n"
-            f"{canonical_headers}\n"
-            f"{signed_headers_str}\n"
-            f"{hashed_request_payload}"
-        )
-        
-        # 计算签名
-        string_to_sign = (
-            f"SDK-HMAC-SHA256\n"
-            f"{timestamp}\n"
-            f"{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}"
+        return sign(
+            self.ak,
+            self._sk_bytes,
+            self._host,
+            method,
+            uri,
+            query_params=query_params,
+            body_bytes=body_bytes,
+            headers=headers
         )
-        
-        signature = hmac.new(
-            self.sk.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        # 返回签名请求头
-        auth_headers = {
-            'X-Sdk-Date': timestamp,
-            'Host': host,
-            'Authorization': (
-                f'SDK-HMAC-SHA256 '
-                f'Access={self.ak}, '
-                f'SignedHeaders={signed_headers_str}, '
-                f'Signature={signature}'
-            )
-        }
-        
-        if headers:
-            auth_headers.update(headers)
-        
-        return auth_headers
     
     def _request(
         self,
@@ -164,26 +99,26 @@ class HuaweiCloudBSSClient:
         # 构建完整 URL
         url = f"{self.endpoint}{uri}"
         
-        # 请求体序列化
-        body_str = json.dumps(body) if body else ""
+        # 请求体只序列化一次，签名与发送共用同一份字节
+        body_bytes = orjson.dumps(body) if body else b""
         
         # 生成签名
         headers = self._sign_request(
             method=method,
             uri=uri,
             query_params=query_params,
-            body=body_str
+            body_bytes=body_bytes
         )
         
         try:
             logger.info(f"发送 BSS API 请求: {method} {url}")
-            logger.debug(f"请求体: {body_str}")
+            logger.debug("请求体: {}", body_bytes)
             
             response = self.session.request(
                 method=method,
                 url=url,
                 params=query_params,
-                data=body_str if body_str else None,
+                data=body_bytes or None,
                 headers=headers,
                 timeout=timeout
             )
@@ -194,16 +129,17 @@ class HuaweiCloudBSSClient:
             if response.status_code >= 400:
                 error_msg = f"BSS API 请求失败: HTTP {response.status_code}"
                 try:
-                    error_detail = response.json()
+                    error_detail = orjson.loads(response.content)
                     error_msg += f", 详情: {error_detail}"
                 except:
                     error_msg += f", 响应: {response.text}"
                 logger.error(error_msg)
                 raise HuaweiCloudBSSException(error_msg)
             
-            # 解析响应
-            if response.text:
-                return response.json()
+            # 解析响应：orjson 直接解析原始字节，不经过 requests 的编码探测
+            content = response.content
+            if content:
+                return orjson.loads(content)
             return {}
             
         except requests.exceptions.Timeout:
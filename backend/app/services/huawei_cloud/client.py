@@ -1,14 +1,15 @@
 """
 华为云 API 客户端基类
 """
-import hashlib
-import hmac
-from datetime import datetime
 from typing import Dict, Optional, Any
+import orjson
 import requests
-from urllib.parse import quote
+from urllib.parse import urlsplit
 from loguru import logger
 
+from app.services.huawei_cloud._http import create_session
+from app.services.huawei_cloud._signer import sign
+
 
 class HuaweiCloudClient:
     """华为云 API 客户端基类"""
@@ -37,13 +38,11 @@ class HuaweiCloudClient:
         """
         self.ak = access_key
         self.sk = secret_key
+        self._sk_bytes = secret_key.encode('utf-8')
         self.region = region
         self.endpoint = self.ENDPOINTS.get(region, self.ENDPOINTS['cn-north-4'])
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'huawei-cloud-monitor/1.0'
-        })
+        self._host = urlsplit(self.endpoint).netloc
+        self.session = create_session()
         
         logger.info(f"初始化华为云客户端: region={region}, endpoint={self.endpoint}")
     
@@ -53,7 +52,7 @@ class HuaweiCloudClient:
         uri: str,
         query_params: Optional[Dict[str, str]] = None,
         headers: Optional[Dict[str, str]] = None,
-        body: str = ""
+        body_bytes: bytes = b""
     ) -> Dict[str, str]:
         """
         生成请求签名
@@ -63,84 +62,21 @@ class HuaweiCloudClient:
             uri: 请求 URI
             query_params: 查询参数
             headers: 请求头
-            body: 请求体
+            body_bytes: 序列化后的请求体
             
         Returns:
             签名后的请求头
         """
-        # 规范化 URI：对路径中每个部分单独进行 URL 编码
-        # 华为云要求保留 '/' 不编码，但对每个路径段进行编码
-        canonical_uri = '/'.join(
-            quote(segment, safe='')
-            for segment in uri.split('/')
-        )
-        # 确保以 / 结尾（华为云签名规范要求）
-        if not canonical_uri.endswith('/'):
-            canonical_uri += '/'
-        
-        # 规范化查询字符串
-        canonical_query_string = ""
-        if query_params:
-            sorted_params = sorted(query_params.items())
-            canonical_query_string = "&".join(
-                f"{quote(k, safe='')}={quote(str(v), safe='')}"
-                for k, v in sorted_params
-            )
-        
-        # 规范化请求头
-        signed_headers_str = "content-type;host;x-sdk-date"
-        
-        # 获取当前时间戳
-        timestamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-        
-        # 提取主机名
-        host = self.endpoint.replace('https://', '').replace('http://', '')
-        
-        # 构建规范请求头
-        canonical_headers = f"content-type:application/json\nhost:{host}\nx-sdk-date:{timestamp}\n"
-        
-        # 计算请求体哈希
-        hashed_request_payload = hashlib.sha256(body.encode('utf-8')).hexdigest()
-        
-        # 构建规范请求
-        canonical_request = (
-            f"{method}\n"
-            f"{canonical_uri}\n"
-            f"{canonical_query_string}\n"
-            f"{canonical_headers}\n"
-            f"{signed_headers_str}\n"
-            f"{hashed_request_payload}"
-        )
-        
-        # 计算签名
-        string_to_sign = (
-            f"SDK-HMAC-SHA256\n"
-            f"{timestamp}\n"
-            f"{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}"
+        return sign(
+            self.ak,
+            self._sk_bytes,
+            self._host,
+            method,
+            uri,
+            query_params=query_params,
+            body_bytes=body_bytes,
+            headers=headers
         )
-        
-        signature = hmac.new(
-            self.sk.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        # 返回签名请求头
-        auth_headers = {
-            'X-Sdk-Date': timestamp,
-            'Host': host,
-            'Authorization': (
-                f'SDK-HMAC-SHA256 '
-                f'Access={self.ak}, '
-                f'SignedHeaders={signed_headers_str}, '
-                f'Signature={signature}'
-            )
-        }
-        
-        if headers:
-            auth_headers.update(headers)
-        
-        return auth_headers
     
     def _request(
         self,
@@ -169,16 +105,15 @@ class HuaweiCloudClient:
         # 构建完整 URL
         url = f"{self.endpoint}{uri}"
         
-        # 请求体序列化
-        import json
-        body_str = json.dumps(body) if body else ""
+        # 请求体只序列化一次，签名与发送共用同一份字节
+        body_bytes = orjson.dumps(body) if body else b""
         
         # 生成签名
         headers = self._sign_request(
             method=method,
             uri=uri,
             query_params=query_params,
-            body=body_str
+            body_bytes=body_bytes
         )
         
         try:
@@ -188,35 +123,35 @@ class HuaweiCloudClient:
                 method=method,
                 url=url,
                 params=query_params,
-                data=body_str if body_str else None,
+                data=body_bytes or None,
                 headers=headers,
                 timeout=timeout
             )
             
             logger.info(f"华为云 API 响应: status={response.status_code}")
             
-            # 检查响应状态
+            # 检查响应状态（可重试的错误已由会话的 Retry 处理，到这里的都是最终结果）
             response.raise_for_status()
             
-            # 解析响应
-            if response.text:
-                return response.json()
+            # 解析响应：orjson 直接解析原始字节，不经过 requests 的编码探测
+            content = response.content
+            if content:
+                return orjson.loads(content)
             return {}
             
         except requests.exceptions.Timeout:
-            logger.error(f"华为云 API 请求超时: {url}")
+            logger.error("华为云 API 请求超时: {}", url)
             raise HuaweiCloudAPIException("请求超时")
         except requests.exceptions.HTTPError as e:
             error_msg = f"华为云 API 请求失败: {e}"
             try:
-                error_detail = e.response.json()
-                error_msg += f", 详情: {error_detail}"
-            except:
+                error_msg += f", 详情: {orjson.loads(e.response.content)}"
+            except ValueError:
                 pass
             logger.error(error_msg)
-            raise HuaweiCloudAPIException(error_msg)
+            raise HuaweiCloudAPIException(error_msg, status_code=e.response.status_code)
         except Exception as e:
-            logger.error(f"华为云 API 请求异常: {e}")
+            logger.error("华为云 API 请求异常: {}", e)
             raise HuaweiCloudAPIException(f"请求异常: {e}")
     
     def get(
@@ -260,4 +195,12 @@ class HuaweiCloudClient:
 
 class HuaweiCloudAPIException(Exception):
     """华为云 API 异常"""
-    pass
+    
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        """
+        Args:
+            message: 错误信息
+            status_code: HTTP 状态码（仅 HTTP 错误时提供）
+        """
+        super().__init__(message)
+        self.status_code = status_code
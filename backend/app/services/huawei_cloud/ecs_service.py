@@ -3,6 +3,7 @@
 
 API 文档: https://support.huaweicloud.com/api-ecs/zh-cn_topic_0094148850.html
 """
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from loguru import logger
 from app.services.huawei_cloud.client import HuaweiCloudClient, HuaweiCloudAPIException
@@ -11,6 +12,13 @@ from app.services.huawei_cloud.client import HuaweiCloudClient, HuaweiCloudAPIEx
 class ECSServer:
     """ECS 服务器信息模型"""
     
+    # 固定属性集合，实例不再各自携带 __dict__，账户下服务器较多时内存占用更小
+    __slots__ = (
+        'id', 'name', 'status', 'flavor_id', 'image_id', 'private_ips', 'public_ips',
+        'charging_mode', 'availability_zone', 'created', 'volumes', 'task_state',
+        'power_state', 'vm_state', 'enterprise_project_id',
+    )
+    
     def __init__(self, data: Dict[str, Any]):
         """
         从 API 响应数据初始化
@@ -32,18 +40,16 @@ class ECSServer:
         
         # 网络信息
         addresses = data.get('addresses', {})
-        self.private_ips = []
-        self.public_ips = []
+        self.private_ips = private_ips = []
+        self.public_ips = public_ips = []
         
-        for network_name, ip_list in addresses.items():
+        # 按 IP 类型直接分派到对应列表，每个 IP 只查一次类型、一次地址
+        buckets = {'fixed': private_ips, 'floating': public_ips}
+        for ip_list in addresses.values():
             for ip_info in ip_list:
-                ip_addr = ip_info.get('addr', '')
-                ip_type = ip_info.get('OS-EXT-IPS:type', '')
-                
-                if ip_type == 'fixed':
-                    self.private_ips.append(ip_addr)
-                elif ip_type == 'floating':
-                    self.public_ips.append(ip_addr)
+                bucket = buckets.get(ip_info.get('OS-EXT-IPS:type'))
+                if bucket is not None:
+                    bucket.append(ip_info.get('addr', ''))
         
         # 元数据
         metadata = data.get('metadata', {})
@@ -66,9 +72,10 @@ class ECSServer:
         # 企业项目 ID
         self.enterprise_project_id = data.get('enterprise_project_id', '')
         
+        # 参数交给 loguru 延迟格式化，未启用 DEBUG 级别时不构造日志字符串
         logger.debug(
-            f"解析服务器: id={self.id}, name={self.name}, "
-            f"status={self.status}, private_ips={self.private_ips}"
+            "解析服务器: id={}, name={}, status={}, private_ips={}",
+            self.id, self.name, self.status, private_ips
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -111,6 +118,7 @@ class ECSService:
     
     # API 端点配置
     SERVER_LIST_ENDPOINT = '/v1/{project_id}/cloudservers/detail'
+    SERVER_DETAIL_ENDPOINT = '/v1/{project_id}/cloudservers/{server_id}'
     
     def __init__(self, client: HuaweiCloudClient, project_id: str):
         """
@@ -212,13 +220,14 @@ class ECSService:
         # 获取服务器列表
         server_list = response.get('servers', [])
         
+        # 逐台解析是纯 Python 的字典访问，循环内绑定局部名称，省去每台服务器的全局/属性查找
+        parse = ECSServer
+        append = servers.append
         for server_data in server_list:
             try:
-                server = ECSServer(server_data)
-                servers.append(server)
+                append(parse(server_data))
             except Exception as e:
-                logger.warning(f"解析服务器数据失败: {e}, data={server_data}")
-                continue
+                logger.warning("解析服务器数据失败: {}, data={}", e, server_data)
         
         return servers
     
@@ -234,16 +243,24 @@ class ECSService:
         """
         logger.info(f"查询服务器详情: server_id={server_id}")
         
-        # 使用 IP 参数可能无法精确匹配，这里使用列表查询后过滤
-        servers = self.list_servers()
+        # 调用单台服务器详情接口，不再拉取整个列表
+        uri = self.SERVER_DETAIL_ENDPOINT.format(project_id=self.project_id, server_id=server_id)
+        try:
+            response = self.client.get(uri=uri)
+        except HuaweiCloudAPIException as e:
+            if e.status_code == 404:
+                logger.warning(f"未找到服务器: server_id={server_id}")
+                return None
+            raise
         
-        for server in servers:
-            if server.id == server_id:
-                logger.info(f"找到服务器: {server}")
-                return server
+        server_data = response.get('server')
+        if not server_data:
+            logger.warning(f"未找到服务器: server_id={server_id}")
+            return None
         
-        logger.warning(f"未找到服务器: server_id={server_id}")
-        return None
+        server = ECSServer(server_data)
+        logger.info(f"找到服务器: {server}")
+        return server
     
     def get_servers_by_status(self, status: str) -> List[ECSServer]:
         """
@@ -266,8 +283,8 @@ class ECSService:
         Returns:
             正在运行的服务器列表
         """
-        servers = self.get_servers_by_status('ACTIVE')
-        return [s for s in servers if s.is_running()]
+        # 状态已由服务端过滤；ECS 的 ACTIVE 状态即对应 vm_state=active，无需再逐台检查
+        return self.get_servers_by_status('ACTIVE')
     
     def get_stopped_servers(self) -> List[ECSServer]:
         """
@@ -276,8 +293,8 @@ class ECSService:
         Returns:
             已关机的服务器列表
         """
-        servers = self.get_servers_by_status('SHUTOFF')
-        return [s for s in servers if s.is_stopped()]
+        # SHUTOFF 状态即对应 vm_state=stopped
+        return self.get_servers_by_status('SHUTOFF')
     
     def get_server_summary(self) -> Dict[str, Any]:
         """
@@ -291,10 +308,7 @@ class ECSService:
         servers = self.list_servers()
         
         # 按状态分组统计
-        status_count = {}
-        for server in servers:
-            status = server.status
-            status_count[status] = status_count.get(status, 0) + 1
+        status_count = dict(Counter(server.status for server in servers))
         
         summary = {
             'total_count': len(servers),
@@ -8,21 +8,74 @@ API 流程:
 2. 使用 Config 服务 (配置审计) 列举 Flexus L 实例
 3. 使用 BSS 服务查询流量包使用情况
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
 from loguru import logger
 import requests
-import hashlib
-import hmac
+import sys
 import json
-from datetime import datetime
-from urllib.parse import quote
+import orjson
+from urllib.parse import urlsplit
 
+from app.core.concurrency import run_huawei_call
+from ._http import create_session
+from ._signer import sign
 from .iam_service import IAMService
+from app.utils.encryption import encryption_service
 from .bss_client import HuaweiCloudBSSClient, HuaweiCloudBSSException
 
 
-@dataclass
+# Config / ECS 请求共用的 HTTP 会话：请求头逐次签名，且拒绝保存任何 Cookie，
+# 会话不携带账户状态；各账户、各次查询共享连接池，不必每创建一个服务就重新建立 TLS 连接
+_shared_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_shared_session() -> requests.Session:
+    """获取共享 HTTP 会话（首次使用时创建）"""
+    global _shared_session
+    if _shared_session is None:
+        with _session_lock:
+            if _shared_session is None:
+                session = create_session()
+                # 空的允许域名列表即拒绝所有 Cookie，避免一个账户的响应 Cookie 被带到其它账户的请求中
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _shared_session = session
+    return _shared_session
+
+
+# 实例列表缓存：(AK, Config 端点, limit) -> (过期时间, 实例列表)
+# 接口每次请求都会新建 FlexusLService，缓存放在模块级才能跨请求复用；
+# 流量用量不缓存，关机前的复查必须拿到最新数据
+_INSTANCES_CACHE_TTL = 60.0
+_INSTANCES_CACHE_SIZE = 64
+_instances_cache: Dict[Tuple[str, str, int], Tuple[float, List["FlexusLInstance"]]] = {}
+# domain_id 缓存：账户 ID -> domain_id，账户更新或删除时由 forget_account 清除
+_DOMAIN_ID_CACHE_SIZE = 256
+_domain_id_cache: Dict[int, str] = {}
+_cache_lock = threading.Lock()
+
+
+def close_flexusl_session() -> None:
+    """关闭共享 HTTP 会话，释放连接（应用关闭时调用）"""
+    global _shared_session
+    with _session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
+
+def forget_account(account_id: int) -> None:
+    """清除账户的 domain_id 缓存（账户更新或删除时调用）"""
+    with _cache_lock:
+        _domain_id_cache.pop(account_id, None)
+
+
+@dataclass(slots=True)
 class FlexusLInstance:
     """Flexus L 实例信息"""
     id: str  # Flexus L 套餐 ID
@@ -53,7 +106,7 @@ class FlexusLInstance:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TrafficPackageInfo:
     """流量包使用信息"""
     resource_id: str
@@ -178,7 +231,8 @@ class FlexusLService:
         ak: str,
         sk: str,
         region: str = 'ap-southeast-1',
-        is_international: bool = True
+        is_international: bool = True,
+        account_id: Optional[int] = None
     ):
         """
         初始化 Flexus L 服务
@@ -188,14 +242,19 @@ class FlexusLService:
             sk: Secret Key
             region: 区域（用于 Config API）
             is_international: 是否国际站
+            account_id: 账户 ID，提供时 domain_id 按账户跨请求缓存
         """
         self.ak = ak
         self.sk = sk
+        self._sk_bytes = sk.encode('utf-8')
         self.region = region
         self.is_international = is_international
+        self.account_id = account_id
         
-        # 初始化 IAM 服务获取 domain_id
-        self.iam_service = IAMService(ak, sk)
+        self.session = _get_shared_session()
+        
+        # 初始化 IAM 服务获取 domain_id（共用同一会话）
+        self.iam_service = IAMService(ak, sk, session=self.session)
         
         # 初始化 BSS 客户端
         self.bss_client = HuaweiCloudBSSClient(ak, sk, is_international)
@@ -205,17 +264,33 @@ class FlexusLService:
             self.config_endpoint = self.CONFIG_ENDPOINT_INTL
         else:
             self.config_endpoint = self.CONFIG_ENDPOINT_CN
-        
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json'
-        })
+        self._config_host = urlsplit(self.config_endpoint).netloc
         
         # 缓存 domain_id
         self._domain_id: Optional[str] = None
         
         logger.info(f"初始化 Flexus L 服务: region={region}, config_endpoint={self.config_endpoint}")
     
+    @classmethod
+    def from_account(cls, account: Any) -> "FlexusLService":
+        """
+        用账户记录（AK/SK 为密文）创建 Flexus L 服务
+        
+        Args:
+            account: 账户，需包含 id、ak、sk、region、is_international
+            
+        Returns:
+            Flexus L 服务
+        """
+        ak, sk = encryption_service.decrypt_ak_sk(account.ak, account.sk)
+        return cls(
+            ak=ak,
+            sk=sk,
+            region=account.region,
+            is_international=getattr(account, 'is_international', True),
+            account_id=account.id
+        )
+    
     def _sign_request(
         self,
         method: str,
@@ -225,66 +300,15 @@ class FlexusLService:
         body: str = ""
     ) -> Dict[str, str]:
         """生成 AK/SK 签名"""
-        # 规范化 URI
-        canonical_uri = '/'.join(
-            quote(segment, safe='')
-            for segment in uri.split('/')
-        )
-        if not canonical_uri.endswith('/'):
-            canonical_uri += '/'
-        
-        # 规范化查询字符串
-        canonical_query_string = ""
-        if query_params:
-            sorted_params = sorted(query_params.items())
-            canonical_query_string = "&".join(
-                f"{quote(k, safe='')}={quote(str(v), safe='')}"
-                for k, v in sorted_params
-            )
-        
-        # 获取当前时间戳
-        timestamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-        
-        # 规范化请求头
-        signed_headers_str = "content-type;host;x-sdk-date"
-        canonical_headers = f"content-type:application/json\nhost:{host}\nx-sdk-date:{timestamp}\n"
-        
-        # 计算请求体哈希
-        hashed_request_payload = hashlib.sha256(body.encode('utf-8')).hexdigest()
-        
-        # 构建规范请求
-        canonical_request = (
-            f"{method}\n"
-            f"{canonical_uri}\n"
-            f"{canonical_query_string}\n"
-            f"{canonical_headers}\n"
-            f"{signed_headers_str}\n"
-            f"{hashed_request_payload}"
-        )
-        
-        # 计算签名
-        string_to_sign = (
-            f"SDK-HMAC-SHA256\n"
-            f"{timestamp}\n"
-            f"{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}"
+        return sign(
+            self.ak,
+            self._sk_bytes,
+            host,
+            method,
+            uri,
+            query_params=query_params,
+            body_bytes=body.encode('utf-8')
         )
-        
-        signature = hmac.new(
-            self.sk.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return {
-            'X-Sdk-Date': timestamp,
-            'Host': host,
-            'Authorization': (
-                f'SDK-HMAC-SHA256 '
-                f'Access={self.ak}, '
-                f'SignedHeaders={signed_headers_str}, '
-                f'Signature={signature}'
-            )
-        }
     
     def get_domain_id(self) -> str:
         """
@@ -295,6 +319,13 @@ class FlexusLService:
         if self._domain_id:
             return self._domain_id
         
+        if self.account_id is not None:
+            with _cache_lock:
+                domain_id = _domain_id_cache.get(self.account_id)
+            if domain_id:
+                self._domain_id = domain_id
+                return domain_id
+        
         logger.info("获取账户 domain_id...")
         projects = self.iam_service.list_projects()
         
@@ -303,6 +334,11 @@ class FlexusLService:
         
         # 从第一个项目中获取 domain_id
         self._domain_id = projects[0].domain_id
+        if self.account_id is not None:
+            with _cache_lock:
+                if self.account_id not in _domain_id_cache and len(_domain_id_cache) >= _DOMAIN_ID_CACHE_SIZE:
+                    _domain_id_cache.pop(next(iter(_domain_id_cache)))
+                _domain_id_cache[self.account_id] = self._domain_id
         logger.info(f"获取到 domain_id: {self._domain_id}")
         
         return self._domain_id
@@ -313,12 +349,21 @@ class FlexusLService:
         
         使用 Config 服务（配置审计）的"列举所有资源"接口
         
+        结果按账户缓存 _INSTANCES_CACHE_TTL 秒，缓存期内的重复查询不再签名和请求
+        
         Args:
             limit: 返回数量限制
             
         Returns:
             Flexus L 实例列表
         """
+        cache_key = (self.ak, self.config_endpoint, limit)
+        now = time.monotonic()
+        with _cache_lock:
+            cached = _instances_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            return list(cached[1])
+        
         domain_id = self.get_domain_id()
         
         uri = f"/v1/resource-manager/domains/{domain_id}/all-resources"
@@ -330,7 +375,7 @@ class FlexusLService:
         }
         
         url = f"{self.config_endpoint}{uri}"
-        host = self.config_endpoint.replace('https://', '').replace('http://', '')
+        host = self._config_host
         
         headers = self._sign_request(
             method='GET',
@@ -356,15 +401,24 @@ class FlexusLService:
             if response.status_code >= 400:
                 error_msg = f"Config API 请求失败: HTTP {response.status_code}"
                 try:
-                    error_detail = response.json()
+                    error_detail = orjson.loads(response.content)
                     error_msg += f", 详情: {error_detail}"
-                except:
+                except orjson.JSONDecodeError:
                     error_msg += f", 响应: {response.text}"
                 logger.error(error_msg)
                 raise FlexusLException(error_msg)
             
-            data = response.json()
-            return self._parse_instances(data)
+            # orjson 直接解析原始字节，不经过 requests 的编码探测
+            data = orjson.loads(response.content)
+            instances = self._parse_instances(data)
+            
+            with _cache_lock:
+                if cache_key not in _instances_cache and len(_instances_cache) >= _INSTANCES_CACHE_SIZE:
+                    # 淘汰最早写入的条目
+                    _instances_cache.pop(next(iter(_instances_cache)))
+                _instances_cache[cache_key] = (now + _INSTANCES_CACHE_TTL, instances)
+            
+            return list(instances)
             
         except FlexusLException:
             raise
@@ -372,6 +426,12 @@ class FlexusLService:
             logger.error(f"查询 Flexus L 实例失败: {e}")
             raise FlexusLException(f"查询实例失败: {e}")
     
+    def invalidate(self) -> None:
+        """清空当前账户的实例列表缓存（开关机等状态变更后调用）"""
+        with _cache_lock:
+            for key in [key for key in _instances_cache if key[0] == self.ak]:
+                del _instances_cache[key]
+    
     def _parse_instances(self, response: Dict[str, Any]) -> List[FlexusLInstance]:
         """解析实例列表响应"""
         instances = []
@@ -384,14 +444,15 @@ class FlexusLService:
                 # 提取基本信息
                 instance_id = resource.get('id', '')
                 name = resource.get('name', '')
-                region = resource.get('region_id', '')
+                # 区域代码取值有限，驻留后可复用同一字符串对象
+                region = sys.intern(resource.get('region_id') or '')
                 
                 # 解析 properties
                 properties = resource.get('properties', {})
                 if isinstance(properties, str):
                     try:
-                        properties = json.loads(properties)
-                    except:
+                        properties = orjson.loads(properties)
+                    except orjson.JSONDecodeError:
                         properties = {}
                 
                 # 从 properties 中获取状态和子资源列表
@@ -432,10 +493,10 @@ class FlexusLService:
                         for attr in resource_attrs:
                             if attr.get('key') == 'nics':
                                 try:
-                                    nics = json.loads(attr.get('value', '[]'))
+                                    nics = orjson.loads(attr.get('value', '[]'))
                                     if nics and isinstance(nics, list) and len(nics) > 0:
                                         private_ip = nics[0].get('ip_address')
-                                except:
+                                except (orjson.JSONDecodeError, AttributeError):
                                     pass
                                 break
                 
@@ -645,6 +706,18 @@ class FlexusLService:
         
         return summary
     
+    async def get_all_traffic_summary_async(self) -> Dict[str, Any]:
+        """
+        异步获取流量汇总信息
+        
+        在线程池中执行 get_all_traffic_summary，受 HUAWEI_MAX_CONCURRENCY 限制，
+        不阻塞事件循环
+        
+        Returns:
+            流量汇总信息
+        """
+        return await run_huawei_call(self.get_all_traffic_summary)
+    
     # ==================== 服务器操作 API ====================
     # 使用 ECS API 来操作 Flexus L 实例中的云主机
     # 文档: https://support.huaweicloud.com/api-ecs/ecs_02_0301.html
@@ -675,20 +748,20 @@ class FlexusLService:
         
         raise FlexusLException(f"未找到区域 {region} 的项目 ID")
     
-    def _get_ecs_endpoint(self, region: str) -> str:
+    def _get_ecs_host(self, region: str) -> str:
         """
-        获取 ECS 服务端点
+        获取 ECS 服务主机名（请求 URL 和签名共用，无需再从 URL 中截取）
         
         Args:
             region: 区域 ID
             
         Returns:
-            ECS 服务端点 URL
+            ECS 服务主机名
         """
         if self.is_international:
-            return f"https://ecs.{region}.myhuaweicloud.com"
+            return f"ecs.{region}.myhuaweicloud.com"
         else:
-            return f"https://ecs.{region}.myhuaweicloud.cn"
+            return f"ecs.{region}.myhuaweicloud.cn"
     
     def _send_server_action(
         self,
@@ -719,10 +792,9 @@ class FlexusLService:
                 message=str(e)
             )
         
-        endpoint = self._get_ecs_endpoint(region)
+        host = self._get_ecs_host(region)
         uri = f"/v1/{project_id}/cloudservers/action"
-        url = f"{endpoint}{uri}"
-        host = endpoint.replace('https://', '').replace('http://', '')
+        url = f"https://{host}{uri}"
         
         body_str = json.dumps(action_body)
         
@@ -751,9 +823,9 @@ class FlexusLService:
             if response.status_code >= 400:
                 error_msg = f"服务器操作失败: HTTP {response.status_code}"
                 try:
-                    error_detail = response.json()
+                    error_detail = orjson.loads(response.content)
                     error_msg += f", 详情: {error_detail}"
-                except:
+                except orjson.JSONDecodeError:
                     error_msg += f", 响应: {response.text}"
                 logger.error(error_msg)
                 return ServerActionResult(
@@ -763,12 +835,15 @@ class FlexusLService:
                 )
             
             # 解析响应
-            if response.text:
-                data = response.json()
+            if response.content:
+                data = orjson.loads(response.content)
                 job_id = data.get('job_id', '')
             else:
                 job_id = ''
             
+            # 请求受理后实例进入过渡状态，任务完成时 get_job_status 会再次清除缓存
+            self.invalidate()
+            
             return ServerActionResult(
                 job_id=job_id,
                 success=True,
@@ -974,10 +1049,9 @@ class FlexusLService:
         except FlexusLException as e:
             raise FlexusLException(f"获取 project_id 失败: {e}")
         
-        endpoint = self._get_ecs_endpoint(region)
+        host = self._get_ecs_host(region)
         uri = f"/v1/{project_id}/cloudservers/{server_id}"
-        url = f"{endpoint}{uri}"
-        host = endpoint.replace('https://', '').replace('http://', '')
+        url = f"https://{host}{uri}"
         
         headers = self._sign_request(
             method='GET',
@@ -1001,14 +1075,14 @@ class FlexusLService:
             if response.status_code >= 400:
                 error_msg = f"查询云主机状态失败: HTTP {response.status_code}"
                 try:
-                    error_detail = response.json()
+                    error_detail = orjson.loads(response.content)
                     error_msg += f", 详情: {error_detail}"
-                except:
+                except orjson.JSONDecodeError:
                     error_msg += f", 响应: {response.text}"
                 logger.error(error_msg)
                 raise FlexusLException(error_msg)
             
-            data = response.json()
+            data = orjson.loads(response.content)
             server = data.get('server', {})
             
             # 提取关键信息
@@ -1068,10 +1142,9 @@ class FlexusLService:
         except FlexusLException as e:
             raise FlexusLException(f"获取 project_id 失败: {e}")
         
-        endpoint = self._get_ecs_endpoint(region)
+        host = self._get_ecs_host(region)
         uri = f"/v1/{project_id}/jobs/{job_id}"
-        url = f"{endpoint}{uri}"
-        host = endpoint.replace('https://', '').replace('http://', '')
+        url = f"https://{host}{uri}"
         
         headers = self._sign_request(
             method='GET',
@@ -1095,14 +1168,14 @@ class FlexusLService:
             if response.status_code >= 400:
                 error_msg = f"查询 Job 状态失败: HTTP {response.status_code}"
                 try:
-                    error_detail = response.json()
+                    error_detail = orjson.loads(response.content)
                     error_msg += f", 详情: {error_detail}"
-                except:
+                except orjson.JSONDecodeError:
                     error_msg += f", 响应: {response.text}"
                 logger.error(error_msg)
                 raise FlexusLException(error_msg)
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # 解析响应
             job_status = JobStatus(
@@ -1121,6 +1194,10 @@ class FlexusLService:
                 f"type={job_status.job_type}, status={job_status.status}"
             )
             
+            if not job_status.is_running:
+                # 开关机任务结束，实例状态已变化，缓存中可能是受理期间的过渡状态
+                self.invalidate()
+            
             return job_status
             
         except FlexusLException:
@@ -1130,5 +1207,26 @@ class FlexusLService:
             raise FlexusLException(f"查询 Job 状态失败: {e}")
 
 
+async def get_traffic_summaries_concurrently(
+    services: Sequence[FlexusLService]
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """
+    并发获取多个账户的流量汇总
+    
+    单个账户内 IAM -> Config -> BSS 的调用前后依赖，只能依次进行；
+    多个账户之间互不依赖，同时查询后总耗时接近最慢的单个账户而不是逐个累加
+    
+    Args:
+        services: 各账户的 Flexus L 服务
+        
+    Returns:
+        与 services 顺序一致的流量汇总，查询失败的位置为对应异常
+    """
+    return await asyncio.gather(
+        *(service.get_all_traffic_summary_async() for service in services),
+        return_exceptions=True
+    )
+
+
 class FlexusLException(Exception):
     pass
@@ -12,12 +12,11 @@
 """
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
-from urllib.parse import quote
+from urllib.parse import urlsplit
 from loguru import logger
 import requests
-import hashlib
-import hmac
-from datetime import datetime
+
+from app.services.huawei_cloud._signer import sign
 
 
 # IAM 全局端点
@@ -48,21 +47,26 @@ class IAMService:
     用于获取项目列表，支持跨区域查询服务器
     """
     
-    def __init__(self, ak: str, sk: str):
+    def __init__(self, ak: str, sk: str, session: Optional[requests.Session] = None):
         """
         初始化 IAM 服务
         
         Args:
             ak: Access Key
             sk: Secret Key
+            session: 复用的 HTTP 会话，不提供时新建
         """
         self.ak = ak
         self.sk = sk
+        self._sk_bytes = sk.encode('utf-8')
         self.endpoint = IAM_GLOBAL_ENDPOINT
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json'
-        })
+        self._host = urlsplit(self.endpoint).netloc
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'Content-Type': 'application/json'
+            })
+        self.session = session
         logger.info("初始化 IAM 服务")
     
     def _sign_request(
@@ -77,69 +81,15 @@ class IAMService:
         
         使用华为云 SDK-HMAC-SHA256 签名算法
         """
-        # 规范化 URI
-        canonical_uri = '/'.join(
-            quote(segment, safe='')
-            for segment in uri.split('/')
-        )
-        if not canonical_uri.endswith('/'):
-            canonical_uri += '/'
-        
-        # 规范化查询字符串
-        canonical_query_string = ""
-        if query_params:
-            sorted_params = sorted(query_params.items())
-            canonical_query_string = "&".join(
-                f"{quote(k, safe='')}={quote(str(v), safe='')}"
-                for k, v in sorted_params
-            )
-        
-        # 获取当前时间戳
-        timestamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
-        
-        # 提取主机名
-        host = self.endpoint.replace('https://', '').replace('http://', '')
-        
-        # 规范化请求头
-        signed_headers_str = "content-type;host;x-sdk-date"
-        canonical_headers = f"content-type:application/json\nhost:{host}\nx-sdk-date:{timestamp}\n"
-        
-        # 计算请求体哈希
-        hashed_request_payload = hashlib.sha256(body.encode('utf-8')).hexdigest()
-        
-        # 构建规范请求
-        canonical_request = (
-            f"{method}\n"
-            f"{canonical_uri}\n"
-            f"{canonical_query_string}\n"
-            f"{canonical_headers}\n"
-            f"{signed_headers_str}\n"
-            f"{hashed_request_payload}"
-        )
-        
-        # 计算签名
-        string_to_sign = (
-            f"SDK-HMAC-SHA256\n"
-            f"{timestamp}\n"
-            f"{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}"
+        return sign(
+            self.ak,
+            self._sk_bytes,
+            self._host,
+            method,
+            uri,
+            query_params=query_params,
+            body_bytes=body.encode('utf-8')
         )
-        
-        signature = hmac.new(
-            self.sk.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return {
-            'X-Sdk-Date': timestamp,
-            'Host': host,
-            'Authorization': (
-                f'SDK-HMAC-SHA256 '
-                f'Access={self.ak}, '
-                f'SignedHeaders={signed_headers_str}, '
-                f'Signature={signature}'
-            )
-        }
     
     def list_projects(self) -> List[Project]:
         """
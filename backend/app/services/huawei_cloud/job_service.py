@@ -3,6 +3,7 @@
 
 API 文档: https://support.huaweicloud.com/api-ecs/ecs_03_0702.html
 """
+import time
 from typing import Dict, Any, Optional
 from enum import Enum
 from loguru import logger
@@ -170,8 +171,6 @@ class JobService:
             HuaweiCloudAPIException: API 调用失败
             TimeoutError: 等待超时
         """
-        import time
-        
         logger.info(
             f"等待 Job 完成: job_id={job_id}, "
             f"timeout={timeout}s, interval={poll_interval}s"
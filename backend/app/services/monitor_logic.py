@@ -79,6 +79,55 @@ class MonitorLogic:
         
         return True, "流量低于阈值且启用自动关机"
     
+    @staticmethod
+    def _build_log_message(check_result: str, error_message: Optional[str] = None) -> str:
+        """拼接监控日志消息，将详细错误附加到检查结果后，便于前端查看"""
+        final_message = check_result or ""
+        if error_message:
+            # 限制长度，避免字段溢出（message 字段长度 500）
+            em = str(error_message)
+            if len(em) > 400:
+                em = em[:400] + " ... (truncated)"
+            if final_message:
+                final_message = f"{final_message} - {em}"
+            else:
+                final_message = em
+        return final_message
+    
+    @staticmethod
+    def build_monitor_log_row(
+        account_id: int,
+        remaining_traffic: float,
+        threshold: float,
+        is_below_threshold: bool,
+        check_result: str,
+        traffic_total: Optional[float] = None,
+        traffic_used: Optional[float] = None,
+        usage_percentage: Optional[float] = None,
+        server_id: Optional[int] = None,
+        error_message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        构建一条监控日志的列值，供 bulk_create_monitor_logs 批量写入
+        
+        参数含义与 create_monitor_log 相同
+        
+        Returns:
+            监控日志列值字典
+        """
+        return {
+            'account_id': account_id,
+            'server_id': server_id or 0,  # 如果没有指定服务器，使用 0 表示账户级别监控
+            'traffic_remaining': remaining_traffic,
+            'traffic_total': traffic_total,
+            'traffic_used': traffic_used,
+            'usage_percentage': usage_percentage,
+            'threshold': threshold,
+            'is_below_threshold': is_below_threshold,
+            # check_time 不在这里赋值，由列默认值 func.now() 在数据库中生成（SQLite 为 UTC）
+            'message': MonitorLogic._build_log_message(check_result, error_message)
+        }
+    
     @staticmethod
     def create_monitor_log(
         db: Any,  # Session 实例
@@ -115,35 +164,21 @@ class MonitorLogic:
         try:
             from app.models.monitor_log import MonitorLog
 
-            # 如果存在错误信息，尽量将详细错误附加到 message 中，便于前端查看
-            final_message = check_result or ""
-            if error_message:
-                # 限制长度，避免字段溢出（message 字段长度 500）
-                em = str(error_message)
-                if len(em) > 400:
-                    em = em[:400] + " ... (truncated)"
-                if final_message:
-                    final_message = f"{final_message} - {em}"
-                else:
-                    final_message = em
-
-            log = MonitorLog(
+            log = MonitorLog(**MonitorLogic.build_monitor_log_row(
                 account_id=account_id,
-                server_id=server_id or 0,  # 如果没有指定服务器，使用 0 表示账户级别监控
-                traffic_remaining=remaining_traffic,
+                remaining_traffic=remaining_traffic,
+                threshold=threshold,
+                is_below_threshold=is_below_threshold,
+                check_result=check_result,
                 traffic_total=traffic_total,
                 traffic_used=traffic_used,
                 usage_percentage=usage_percentage,
-                threshold=threshold,
-                is_below_threshold=is_below_threshold,
-                # 统一使用 UTC 存储时间，避免本地/UTC 混用导致前端解析错误
-                check_time=datetime.utcnow(),
-                message=final_message
-            )
+                server_id=server_id,
+                error_message=error_message
+            ))
             
             db.add(log)
             db.commit()
-            db.refresh(log)
             
             logger.info(
                 f"监控日志已保存: log_id={log.id}, "
@@ -158,6 +193,42 @@ class MonitorLogic:
             logger.error(f"保存监控日志失败: {e}")
             raise
     
+    @staticmethod
+    def bulk_create_monitor_logs(
+        db: Any,  # Session 实例
+        rows: List[Dict[str, Any]]
+    ) -> int:
+        """
+        批量写入监控日志
+        
+        使用一条 INSERT 语句（executemany）写入所有行并只提交一次，
+        避免按实例逐条提交带来的多次事务开销
+        
+        Args:
+            db: 数据库会话
+            rows: 由 build_monitor_log_row 构建的列值列表
+            
+        Returns:
+            写入的日志条数
+        """
+        if not rows:
+            return 0
+        
+        try:
+            from app.models.monitor_log import MONITOR_LOG_INSERT
+            
+            db.execute(MONITOR_LOG_INSERT, rows)
+            db.commit()
+            
+            logger.info(f"批量保存监控日志: count={len(rows)}")
+            
+            return len(rows)
+            
+        except Exception as e:
+            db.rollback()
+            logger.error(f"批量保存监控日志失败: {e}")
+            raise
+    
     @staticmethod
     def get_monitor_logs(
         db: Any,  # Session 实例
@@ -174,10 +174,12 @@ def initialize_all_monitor_jobs(db: Session) -> dict:
         "failed": 0
     }
     
+    # 一次查询取出所有账户的有效配置
+    configs = config_service.list_effective_configs(db, [account.id for account in accounts])
+    
     for account in accounts:
         try:
-            # 获取账户的有效配置
-            config = config_service.get_effective_config(db, account.id)
+            config = configs[account.id]
             
             if not config:
                 logger.warning(f"账户 {account.name} 没有配置，跳过")
@@ -6,6 +6,7 @@
 from typing import Dict, Any, List, Optional, Callable, TypeVar
 from datetime import datetime
 import time
+from concurrent.futures import Future
 from functools import wraps
 from loguru import logger
 from sqlalchemy.orm import Session
@@ -13,6 +14,15 @@ from sqlalchemy.orm import Session
 T = TypeVar('T')
 
 
+def _log_notify_failure(description: str) -> Callable[[Future], None]:
+    """生成后台通知完成回调：发送失败时记录日志"""
+    def callback(future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error("发送{}失败: {}", description, error)
+    return callback
+
+
 def retry_on_failure(
     max_retries: int = 3,
     retry_delay: float = 1.0,
@@ -220,7 +230,7 @@ class MonitorWorkflowExecutor:
             'account_name': account_name,
             'region': region,
             'traffic_checked': False,
-            'notification_sent': False,
+            'notification_queued': False,
             'shutdown_executed': False,
             'error': None
         }
@@ -247,7 +257,8 @@ class MonitorWorkflowExecutor:
                 ak=ak,
                 sk=sk,
                 region=account.region,
-                is_international=is_intl
+                is_international=is_intl,
+                account_id=account.id
             )
             
             # 使用重试执行器查询流量（使用自动发现的汇总方法）
@@ -298,6 +309,10 @@ class MonitorWorkflowExecutor:
             packages = traffic_summary.get('packages', [])
             # 构建流量包 id -> 包信息 映射
             pkg_map = {p.get('resource_id'): p for p in (packages or [])}
+            # 各实例的监控日志在循环结束后一次性写入
+            monitor_log_rows = []
+            # 各实例的关机结果在循环结束后合并为批量通知发送
+            shutdown_items = []
 
             for inst in instances:
                 try:
@@ -316,9 +331,8 @@ class MonitorWorkflowExecutor:
                         threshold=traffic_threshold
                     )
 
-                    # 写入监控日志（按实例）
-                    monitor_logic.create_monitor_log(
-                        db=db,
+                    # 记录监控日志（按实例）
+                    monitor_log_rows.append(monitor_logic.build_monitor_log_row(
                         account_id=account_id,
                         remaining_traffic=inst_remaining,
                         threshold=traffic_threshold,
@@ -328,7 +342,7 @@ class MonitorWorkflowExecutor:
                         traffic_used=inst_used,
                         usage_percentage=inst_usage_pct,
                         server_id=server_id
-                    )
+                    ))
 
                     # 若低于阈值并启用自动关机，则对该实例执行关机（单机）
                     if is_below and auto_shutdown_enabled and self.enable_auto_shutdown and server_id:
@@ -367,30 +381,17 @@ class MonitorWorkflowExecutor:
                             # 发送通知（包含实例详情）
                             if self.enable_notifications:
                                 try:
-                                    server_info = {
+                                    shutdown_items.append({
                                         "name": inst.get("name") or inst.get("id") or "未命名",
                                         "ip": inst.get("public_ip") or inst.get("publicIp") or inst.get("ip") or "N/A",
                                         "remaining": inst_remaining,
-                                        "threshold": traffic_threshold
-                                    }
-                                    if shutdown_result.success:
-                                        self.notification_service.send_shutdown_success(
-                                            account_name=account_name,
-                                            server_count=1,
-                                            job_id=shutdown_result.job_id,
-                                            duration_seconds=0,
-                                            server=server_info
-                                        )
-                                    else:
-                                        self.notification_service.send_shutdown_failure(
-                                            account_name=account_name,
-                                            server_count=1,
-                                            job_id=shutdown_result.job_id,
-                                            error_message=shutdown_result.message or "未知错误",
-                                            server=server_info
-                                        )
+                                        "threshold": traffic_threshold,
+                                        "success": shutdown_result.success,
+                                        "job_id": shutdown_result.job_id,
+                                        "error_message": shutdown_result.message or "未知错误"
+                                    })
                                 except Exception as e:
-                                    logger.error(f"发送关机通知失败: {e}")
+                                    logger.error(f"构建关机通知失败: {e}")
 
                         except Exception as e:
                             logger.error(f"单实例关机失败: server_id={server_id}, error={e}")
@@ -403,6 +404,18 @@ class MonitorWorkflowExecutor:
                 except Exception as e:
                     logger.error(f"处理实例监控时出错: inst={inst}, error={e}")
             
+            try:
+                monitor_logic.bulk_create_monitor_logs(db=db, rows=monitor_log_rows)
+            except Exception as e:
+                logger.error(f"保存实例监控日志失败: {e}")
+            
+            if shutdown_items:
+                # 所有实例的关机结果合并为一张卡片（超过 20 台时分多张）发送
+                try:
+                    self.notification_service.send_shutdown_batch(account_name, shutdown_items)
+                except Exception as e:
+                    logger.error("发送关机通知失败: {}", e)
+            
             # 步骤 5: 发送流量告警通知（如果使用率超过70%）
             if self.enable_notifications and usage_percentage >= 70:
                 logger.info("步骤 5: 发送流量告警通知")
@@ -411,16 +424,19 @@ class MonitorWorkflowExecutor:
                     ecs_service = ECSService(client, project_id)
                     servers = ecs_service.list_servers()
                     
-                    self.notification_service.send_traffic_warning(
+                    # 提交到后台线程发送，不等待飞书响应，失败由回调记录
+                    self.notification_service.submit(
+                        'traffic_warning',
                         account_name=account_name,
                         remaining_traffic_gb=remaining_traffic,
                         threshold_gb=traffic_threshold,
                         usage_percentage=usage_percentage,
                         server_count=len(servers),
                         region=region
-                    )
-                    result['notification_sent'] = True
-                    logger.info("流量告警通知发送成功")
+                    ).add_done_callback(_log_notify_failure("流量告警通知"))
+                    # 只表示已提交后台发送，发送结果由回调记录
+                    result['notification_queued'] = True
+                    logger.info("流量告警通知已提交发送")
                 except Exception as e:
                     logger.error(f"发送流量告警通知失败: {e}")
             
@@ -438,13 +454,14 @@ class MonitorWorkflowExecutor:
                     # 发送延迟通知
                     if self.enable_notifications:
                         try:
-                            self.notification_service.send_shutdown_delay_notification(
+                            self.notification_service.submit(
+                                'shutdown_delay',
                                 account_name=account_name,
                                 delay_minutes=shutdown_delay,
                                 remaining_traffic_gb=remaining_traffic,
                                 threshold_gb=traffic_threshold,
                                 region=region
-                            )
+                            ).add_done_callback(_log_notify_failure("延迟通知"))
                         except Exception as e:
                             logger.error(f"发送延迟通知失败: {e}")
                     
@@ -74,7 +74,6 @@ class OperationLogService:
             
             db.add(log)
             db.commit()
-            db.refresh(log)
             
             logger.info(
                 f"操作日志已创建: log_id={log.id}, "
@@ -124,7 +123,6 @@ class OperationLogService:
                 log.end_time = datetime.now()
             
             db.commit()
-            db.refresh(log)
             
             logger.info(f"操作日志已更新: log_id={log_id}, status={status}")
             
@@ -54,7 +54,6 @@ class ShutdownLogService:
             
             db.add(log)
             db.commit()
-            db.refresh(log)
             
             logger.info(
                 f"关机日志已创建: log_id={log.id}, "
@@ -108,7 +107,6 @@ class ShutdownLogService:
                 log.shutdown_time = shutdown_time
             
             db.commit()
-            db.refresh(log)
             
             logger.info(f"关机日志已更新: log_id={log_id}, status={log.status}")
             
@@ -159,9 +157,6 @@ class ShutdownLogService:
             
             db.commit()
             
-            for log in logs:
-                db.refresh(log)
-            
             logger.info(
                 f"批量创建关机日志: count={len(logs)}, "
                 f"account_id={account_id}, job_id={job_id}"
@@ -8,10 +8,33 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 import base64
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, List, Optional
 from loguru import logger
 
 
+@lru_cache(maxsize=4)
+def _derive_fernet_key(password: bytes) -> bytes:
+    """
+    PBKDF2 派生 Fernet 密钥
+    
+    十万次迭代耗时数十毫秒，按密码缓存结果：同一密钥的多个服务实例
+    和未变更密钥的 reload 不再重复派生
+    """
+    # 使用固定的盐值（生产环境应该使用随机盐值并存储）
+    salt = b'huawei_cloud_monitor_salt_2024'
+    
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+        backend=default_backend()
+    )
+    
+    return base64.urlsafe_b64encode(kdf.derive(password))
+
+
 class EncryptionService:
     """加密服务"""
     
@@ -22,18 +45,9 @@ class EncryptionService:
         Args:
             key: 加密密钥，如果不提供则使用环境变量或生成新密钥
         """
-        if key:
-            # 去除可能的首尾空白并编码
-            self.key = key.strip().encode()
-        else:
-            # 从环境变量获取或生成新密钥
-            env_key = os.getenv("ENCRYPTION_KEY")
-            if env_key:
-                self.key = env_key.strip().encode()
-            else:
-                # 生成新密钥（开发环境）
-                self.key = Fernet.generate_key()
-                logger.warning("未配置 ENCRYPTION_KEY，使用临时密钥（不推荐用于生产环境）")
+        self.key = self._resolve_key(key)
+        # reload 后需要清除的解密结果缓存（由各服务注册）
+        self._reload_hooks: List[Callable[[], None]] = []
         
         # 创建 Fernet 实例
         try:
@@ -42,6 +56,60 @@ class EncryptionService:
             logger.error(f"加密服务初始化失败: {e}")
             raise
     
+    @staticmethod
+    def _resolve_key(key: Optional[str]) -> bytes:
+        """
+        确定加密密钥
+        
+        Args:
+            key: 加密密钥，如果不提供则使用环境变量或生成新密钥
+            
+        Returns:
+            密钥字节串
+        """
+        if key:
+            # 去除可能的首尾空白并编码
+            return key.strip().encode()
+        
+        # 从环境变量获取或生成新密钥
+        env_key = os.getenv("ENCRYPTION_KEY")
+        if env_key:
+            return env_key.strip().encode()
+        
+        # 生成新密钥（开发环境）
+        logger.warning("未配置 ENCRYPTION_KEY，使用临时密钥（不推荐用于生产环境）")
+        return Fernet.generate_key()
+    
+    def reload(self, key: Optional[str] = None) -> None:
+        """
+        重新加载加密密钥（密钥轮换时使用）
+        
+        先完成新密钥的派生，再一次性替换 cipher，
+        已持有本实例引用的模块无需重新获取服务实例
+        
+        Args:
+            key: 新的加密密钥，如果不提供则使用环境变量
+        """
+        new_key = self._resolve_key(key)
+        cipher = Fernet(self._derive_key(new_key))
+        self.key = new_key
+        self.cipher = cipher
+        
+        # 旧密钥下的解密结果不再可信，清空各服务的解密缓存
+        for hook in self._reload_hooks:
+            hook()
+        
+        logger.info("加密密钥已重新加载")
+    
+    def register_reload_hook(self, hook: Callable[[], None]) -> None:
+        """
+        注册密钥重新加载时的回调（用于清除解密结果缓存）
+        
+        Args:
+            hook: 无参回调
+        """
+        self._reload_hooks.append(hook)
+    
     def _derive_key(self, password: bytes) -> bytes:
         """
         从密码派生密钥
@@ -52,19 +120,7 @@ class EncryptionService:
         Returns:
             派生后的密钥
         """
-        # 使用固定的盐值（生产环境应该使用随机盐值并存储）
-        salt = b'huawei_cloud_monitor_salt_2024'
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        return key
+        return _derive_fernet_key(password)
     
     def encrypt(self, plaintext: str) -> str:
         """
@@ -162,20 +218,18 @@ class EncryptionService:
 
 
 # 延迟创建全局加密服务实例，确保 .env 文件已被加载
+@lru_cache(maxsize=1)
 def get_encryption_service() -> EncryptionService:
-    """获取加密服务实例"""
-    global _encryption_service_instance
-    if '_encryption_service_instance' not in globals():
-        # 从 settings 加载 ENCRYPTION_KEY
-        try:
-            from app.core.config import settings
-            key = settings.ENCRYPTION_KEY
-        except:
-            # 如果无法加载 settings，尝试直接从环境变量获取
-            key = os.getenv("ENCRYPTION_KEY")
-        
-        _encryption_service_instance = EncryptionService(key=key)
-    return _encryption_service_instance
+    """获取加密服务实例（进程内单例，密钥只派生一次）"""
+    # 从 settings 加载 ENCRYPTION_KEY
+    try:
+        from app.core.config import get_settings
+        key = get_settings().ENCRYPTION_KEY
+    except:
+        # 如果无法加载 settings，尝试直接从环境变量获取
+        key = os.getenv("ENCRYPTION_KEY")
+    
+    return EncryptionService(key=key)
 
 # 为了向后兼容，保留 encryption_service 名称
 encryption_service = get_encryption_service()
@@ -0,0 +1,103 @@
+"""
+数据库初始化测试
+"""
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+# 在独立进程中执行：数据库引擎在导入时按 DATABASE_URL 创建
+_INIT_TWICE = """
+from app.core.database import engine, init_db
+
+init_db()
+init_db()
+
+with engine.connect() as conn:
+    names = {row[0] for row in conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'configs'"
+    )}
+assert 'uq_configs_account_id' in names, names
+assert 'uq_configs_global' in names, names
+
+# 全局配置只能有一条
+from sqlalchemy.exc import IntegrityError
+from app.core.database import SessionLocal
+from app.models.config import Config
+
+db = SessionLocal()
+db.add(Config(account_id=None))
+db.commit()
+db.add(Config(account_id=None))
+try:
+    db.commit()
+except IntegrityError:
+    db.rollback()
+else:
+    raise AssertionError('duplicate global config accepted')
+finally:
+    db.close()
+print('OK')
+"""
+
+
+def _run_in_subprocess(script: str, tmp_path):
+    """在使用临时数据库的独立进程中执行脚本"""
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'monitor.db'}",
+        PYTHONPATH=os.path.abspath(BACKEND_DIR)
+    )
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+
+def test_init_db_idempotent(tmp_path):
+    """init_db 在全新数据库上可执行，重复执行（重启）也不报错，且全局配置唯一索引生效"""
+    result = _run_in_subprocess(_INIT_TWICE, tmp_path)
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip().endswith('OK')
+
+
+_DELETE_ACCOUNT = """
+from app.core.database import SessionLocal, init_db
+from app.models.account import Account
+from app.models.config import Config
+from app.models.monitor_log import MonitorLog
+from app.models.server import Server
+from app.models.shutdown_log import ShutdownLog
+from app.services.account_service import account_service
+
+init_db()
+db = SessionLocal()
+account = Account(name='test', ak='ak', sk='sk', region='ap-southeast-1')
+db.add(account)
+db.flush()
+server = Server(account_id=account.id, server_id='srv-1', name='srv')
+db.add(server)
+db.flush()
+db.add(Config(account_id=account.id))
+db.add(MonitorLog(account_id=account.id, server_id=server.id, traffic_remaining=1.0, threshold=2.0))
+db.add(ShutdownLog(account_id=account.id, server_id=server.id, reason='test', status='success'))
+db.commit()
+
+assert account_service.delete_account(db, account.id)
+for model in (Server, Config, MonitorLog, ShutdownLog):
+    assert db.query(model).count() == 0, model.__name__
+db.close()
+print('OK')
+"""
+
+
+def test_delete_account_removes_children(tmp_path):
+    """删除账户时服务器、配置和日志记录一并删除，不留孤儿行"""
+    result = _run_in_subprocess(_DELETE_ACCOUNT, tmp_path)
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip().endswith('OK')
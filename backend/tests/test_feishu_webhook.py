@@ -12,7 +12,63 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import orjson
+import pytest
+
 from app.services.feishu import FeishuWebhookClient, MessageType
+from app.services.feishu.webhook_client import FeishuException
+
+
+class _FakeRaw:
+    """模拟流式响应体"""
+    
+    def __init__(self, body: bytes):
+        self._body = body
+    
+    def read(self, amount=None, decode_content=True):
+        return self._body if amount is None else self._body[:amount]
+
+
+class _FakeResponse:
+    """模拟 requests 响应（支持 with 语句）"""
+    
+    def __init__(self, status_code: int, body: bytes = b""):
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(body))}
+        self.raw = _FakeRaw(body)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """按顺序返回预设响应，并记录请求次数"""
+    
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self.calls = 0
+    
+    def post(self, url, **kwargs):
+        self.calls += 1
+        return self._responses.pop(0)
+
+
+def _feishu_response(code: int, status_code: int = 200) -> _FakeResponse:
+    return _FakeResponse(status_code, orjson.dumps({"code": code, "msg": "test"}))
+
+
+def _mock_client(*responses) -> FeishuWebhookClient:
+    """创建使用模拟会话的客户端（不等待重试间隔）"""
+    client = FeishuWebhookClient(
+        webhook_url="https://open.feishu.cn/open-apis/bot/v2/hook/test-webhook",
+        retry_times=3,
+        retry_delay=0
+    )
+    client._session = _FakeSession(*responses)
+    return client
 
 
 def test_webhook_mock():
@@ -182,6 +238,45 @@ def test_retry_mechanism():
         print(f"  已执行 {client.retry_times} 次重试")
 
 
+@pytest.mark.parametrize("response", [
+    _feishu_response(11232),
+    _FakeResponse(429),
+    _FakeResponse(503, b"<html>Service Unavailable</html>"),
+])
+def test_retry_on_rate_limit_and_server_error(response):
+    """频率超限（11232）、HTTP 429 和 5xx 退避后重试"""
+    client = _mock_client(response, _feishu_response(0))
+    
+    assert client.send_text("测试消息")['code'] == 0
+    assert client._session.calls == 2
+
+
+@pytest.mark.parametrize("code", [9499, 19001, 19024])
+def test_no_retry_on_permanent_error(code):
+    """请求参数错误、Token 无效、关键词校验失败等错误不重试"""
+    client = _mock_client(_feishu_response(code))
+    
+    with pytest.raises(FeishuException):
+        client.send_text("测试消息")
+    assert client._session.calls == 1
+
+
+@pytest.mark.parametrize("response, healthy", [
+    (_feishu_response(0), True),
+    (_feishu_response(9499), True),
+    (_feishu_response(19001), False),
+    (_feishu_response(19002), False),
+    (_feishu_response(19021), False),
+    (_FakeResponse(502), False),
+])
+def test_health_check_classification(response, healthy):
+    """只有成功或消息体无效（9499）视为可用，Token/签名错误和 5xx 视为不可用"""
+    client = _mock_client(response)
+    
+    assert client.health_check() is healthy
+    assert client._session.calls == 1
+
+
 def test_health_check():
     """测试健康检查"""
     print("\n" + "="*60)
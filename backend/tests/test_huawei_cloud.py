@@ -4,6 +4,7 @@
 """
 import sys
 import os
+import subprocess
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -72,6 +73,40 @@ def test_sign_request():
     print("\n✅ 请求签名测试通过！\n")
 
 
+def test_sign_request_matches_baseline(monkeypatch):
+    """测试固定时间戳下签名结果与原 hmac.new 实现的计算结果一致"""
+    from app.services.huawei_cloud import _signer
+    
+    monkeypatch.setattr(_signer, "_sdk_timestamp", lambda: "20240101T000000Z")
+    
+    client = HuaweiCloudClient(
+        access_key="ABCDEFGHIJKLMNOPQRST",
+        secret_key="1234567890abcdefghijklmnopqrstuvwxyz",
+        region="cn-north-4"
+    )
+    
+    # 期望值由优化前的签名实现（datetime + hmac.new）在同一时间戳下算出
+    cases = [
+        (
+            dict(method="GET", uri="/v1/test", query_params={"offset": "0", "limit": "10"}),
+            "6f1f2352a1c5d78e4bbe5021fb8ad44f0156d128df92e457376aabcc4131fc65",
+        ),
+        (
+            dict(method="POST", uri="/v1/test/action", body_bytes=b'{"os-stop":{"type":"SOFT"}}'),
+            "ead10fe578e831bf09ee5408073435c5a59ef776e8dfef88fcfc513e54c7ae7a",
+        ),
+    ]
+    for kwargs, signature in cases:
+        headers = client._sign_request(**kwargs)
+        assert headers['X-Sdk-Date'] == "20240101T000000Z"
+        assert headers['Host'] == "ecs.cn-north-4.myhuaweicloud.com"
+        assert headers['Authorization'] == (
+            "SDK-HMAC-SHA256 Access=ABCDEFGHIJKLMNOPQRST, "
+            "SignedHeaders=content-type;host;x-sdk-date, "
+            f"Signature={signature}"
+        )
+
+
 def test_client_manager():
     """测试客户端管理器"""
     print("=" * 50)
@@ -155,6 +190,42 @@ def test_endpoints():
     print("\n✅ 端点配置测试通过！\n")
 
 
+# 在独立进程中检查包导入：当前进程已导入过客户端模块
+_IMPORT_ORDERS = {
+    "package_first": """
+import sys
+import app.services.huawei_cloud as package
+assert 'app.services.huawei_cloud._client_manager' not in sys.modules
+assert 'requests' not in sys.modules
+from app.services.huawei_cloud import client_manager, HuaweiCloudClientManager
+assert isinstance(client_manager, HuaweiCloudClientManager)
+assert package.client_manager is client_manager
+""",
+    "submodule_first": """
+import app.services.huawei_cloud._client_manager as module
+from app.services.huawei_cloud import client_manager, HuaweiCloudClientManager
+assert client_manager is module.client_manager
+assert isinstance(client_manager, HuaweiCloudClientManager)
+""",
+}
+
+
+def test_package_import_is_lazy():
+    """测试包导入不加载客户端依赖，且两种导入顺序下 client_manager 都是管理器实例"""
+    backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    env = dict(os.environ, PYTHONPATH=backend_dir)
+    for order, script in _IMPORT_ORDERS.items():
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=backend_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+        assert result.returncode == 0, f"{order}: {result.stderr[-2000:]}"
+
+
 if __name__ == "__main__":
     try:
         test_client_init()
@@ -6,6 +6,8 @@
 import os
 import sys
 import argparse
+import threading
+import time
 from pathlib import Path
 
 # 添加项目根目录到 Python 路径
@@ -211,6 +213,59 @@ def test_traffic_warning_levels():
     print("\n✅ 测试完成")
 
 
+class _SlowClient:
+    """模拟较慢的 Webhook 客户端，记录发送次数"""
+    
+    def __init__(self, webhook_url: str, fail: bool = False):
+        self.webhook_url = webhook_url
+        self.fail = fail
+        self.sent = 0
+        self._lock = threading.Lock()
+    
+    def send_card(self, card):
+        time.sleep(0.1)
+        with self._lock:
+            self.sent += 1
+        if self.fail:
+            raise RuntimeError("发送失败")
+        return {"code": 0, "msg": "success"}
+
+
+def _submit_warnings(service, count):
+    futures = [
+        service.submit(
+            'traffic_warning',
+            account_name="测试账户",
+            remaining_traffic_gb=100.0,
+            threshold_gb=1000.0,
+            usage_percentage=85
+        )
+        for _ in range(count)
+    ]
+    return [future.exception() for future in futures]
+
+
+def test_traffic_warning_dedupe_concurrent():
+    """同时提交的相同告警只发送一次"""
+    client = _SlowClient("https://example.com/hook/dedupe-concurrent")
+    service = FeishuNotificationService(client)
+    
+    assert _submit_warnings(service, 4) == [None] * 4
+    assert client.sent == 1
+
+
+def test_traffic_warning_dedupe_released_on_failure():
+    """发送失败后撤销占位，之后的相同告警仍会发送"""
+    client = _SlowClient("https://example.com/hook/dedupe-failure", fail=True)
+    service = FeishuNotificationService(client)
+    
+    assert isinstance(_submit_warnings(service, 1)[0], RuntimeError)
+    
+    client.fail = False
+    assert _submit_warnings(service, 1) == [None]
+    assert client.sent == 2
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="飞书通知服务测试")
@@ -49,6 +49,21 @@ def test_encryption():
     print("\n✅ 加密功能测试通过！\n")
 
 
+def test_encryption_reload_clears_decrypt_cache():
+    """测试密钥重新加载时清除解密缓存"""
+    from app.services.account_service import _decrypt_cached
+    
+    ak, sk = "TEST_AK_1234567890", "TEST_SK_ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    encrypted_ak, encrypted_sk = encryption_service.encrypt_ak_sk(ak, sk)
+    assert _decrypt_cached(encrypted_ak, encrypted_sk) == (ak, sk)
+    assert _decrypt_cached.cache_info().currsize > 0
+    
+    # 用当前密钥重新加载，不影响其它测试
+    encryption_service.reload(encryption_service.key.decode())
+    assert _decrypt_cached.cache_info().currsize == 0
+    print("✅ 重新加载密钥后解密缓存已清空")
+
+
 def test_validators():
     """测试验证功能"""
     print("=" * 50)